@@ -0,0 +1,126 @@
+"""
+The pycountrycodes benchmark suite.
+
+    python -m benchmarks                                 # runs every benchmark
+    python -m benchmarks --scales 1,10,100               # also measures a dataset with 100 times the subdivisions
+    python -m benchmarks --filter search                 # only runs the benchmarks with "search" in their name
+    python -m benchmarks --save baseline.json            # stores the results as a baseline
+    python -m benchmarks --compare baseline.json         # fails when a benchmark is more than 25% slower than the
+                                                         # baseline
+    python -m benchmarks --compare baseline.json --margin 0.5
+
+Each benchmark reports the best time of one call over a few repeats, so the noise of other processes only makes the
+results slower. Baselines are only comparable on the same machine and Python version.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+SLOW_BENCHMARK_TIME = 1.0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Runs the pycountrycodes benchmarks.")
+    parser.add_argument("--scales", default="1,10", help="the sizes of the subdivisions datasets (default: 1,10)")
+    parser.add_argument("--filter", default="", help="only run the benchmarks with this text in their name")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of measures of each benchmark (default: 5)")
+    parser.add_argument("--save", metavar="PATH", help="write the results to a baseline file")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results with a baseline file")
+    parser.add_argument(
+        "--margin", type=float, default=0.25, help="the tolerated slowdown over the baseline (default: 0.25)"
+    )
+    arguments = parser.parse_args(argv)
+
+    baseline = None
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf_8") as file:
+            baseline = json.load(file)["results"]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["PYCOUNTRYCODES_CACHE_DIR"] = cache_dir
+        results = run(
+            [int(scale) for scale in arguments.scales.split(",")], arguments.filter, arguments.repeat, baseline
+        )
+
+    if arguments.save:
+        with open(arguments.save, "w", encoding="utf_8") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results}, file)
+            file.write("\n")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, arguments.margin)
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks are more than {arguments.margin:.0%} slower than the baseline:")
+            for name in regressions:
+                print(f"  {name}")
+            return 1
+
+    return 0
+
+
+def run(scales: List[int], name_filter: str, repeat: int, baseline: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """
+    It runs the benchmarks whose names contain the filter, printing each result as soon as it is measured
+
+    Returns:
+      A dictionary of benchmark names to the best time of one call, in seconds.
+    """
+    from benchmarks.suite import get_benchmarks
+
+    results = {}
+    print(f"{'benchmark':<60} {'time':>12} {'baseline':>12} {'change':>8}")
+    for benchmark in get_benchmarks(scales, name_filter):
+        results[benchmark.name] = measure(benchmark.setup(), repeat, benchmark.per_process)
+        line = f"{benchmark.name:<60} {format_time(results[benchmark.name]):>12}"
+        if baseline is not None and benchmark.name in baseline:
+            change = results[benchmark.name] / baseline[benchmark.name] - 1
+            line += f" {format_time(baseline[benchmark.name]):>12} {change:>+8.0%}"
+        print(line, flush=True)
+
+    return results
+
+
+def measure(function, repeat: int, per_process: bool = False) -> float:
+    """
+    It returns the best time of one call of a function. Each measure calls the function enough times to take at least
+    0.2 seconds, except for benchmarks that start a process, which are called once per measure, and functions slower
+    than `SLOW_BENCHMARK_TIME`, which are only measured twice
+    """
+    timer = timeit.Timer(function)
+    if per_process:
+        return min(timer.repeat(repeat, 1))
+
+    number, elapsed = timer.autorange()
+    if elapsed / number > SLOW_BENCHMARK_TIME:
+        repeat = min(repeat, 2)
+
+    return min(timer.repeat(repeat, number)) / number
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], margin: float) -> List[str]:
+    """
+    It returns the names of the benchmarks that are slower than their baseline by more than the margin
+    """
+    return [name for name, seconds in results.items() if name in baseline and seconds > baseline[name] * (1 + margin)]
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
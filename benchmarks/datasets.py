@@ -0,0 +1,42 @@
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+from pycountrycodes.core.models import ISOCodes
+from pycountrycodes.subdivisions_3166_2.models import Subdivisions
+
+
+class ScaledSubdivisions(Subdivisions):
+    """
+    A synthetic subdivisions database with `factor` copies of every subdivision, used to show how the database scales
+    with its size. Each copy after the first gets a suffix in its code, name and parent, so codes stay unique, names
+    stay searchable and the copies keep their own hierarchy.
+
+    Args:
+      factor (int): The number of copies of the dataset.
+    """
+
+    def __init__(self, factor: int, **kwargs):
+        self.factor = factor
+        kwargs.setdefault("use_snapshot", False)
+        super().__init__(ISOCodes.i3166_2, **kwargs)
+
+    def _load_data_from_file(self) -> List[Dict[str, Any]]:
+        data = super()._load_data_from_file()
+        return [scale_item(item, copy) for copy in range(self.factor) for item in data]
+
+
+def scale_item(item: Dict[str, Any], copy: int) -> Dict[str, Any]:
+    """
+    It returns the given copy of a subdivision item of the dataset, the item itself for the first copy
+    """
+    if copy == 0:
+        return item
+
+    scaled_item = dict(item, code=f'{item["code"]}-{copy}', name=f'{item["name"]} {copy}')
+    if item.get("parent") is not None:
+        scaled_item["parent"] = f'{item["parent"]}-{copy}'
+
+    return scaled_item
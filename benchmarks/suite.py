@@ -0,0 +1,187 @@
+import functools
+import os
+import subprocess
+import sys
+from typing import (
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Type,
+)
+
+from benchmarks.datasets import ScaledSubdivisions
+from pycountrycodes.core.models import (
+    Database,
+    ISOCodes,
+)
+from pycountrycodes.core.snapshot import build_snapshot
+from pycountrycodes.countries_3166_1.models import Countries
+from pycountrycodes.currencies_4217.models import Currencies
+from pycountrycodes.subdivisions_3166_2.models import (
+    Subdivision,
+    Subdivisions,
+)
+
+SEARCH_CUTOFFS = [50, 75, 90]
+DATASETS = [(Countries, ISOCodes.i3166_1), (Subdivisions, ISOCodes.i3166_2), (Currencies, ISOCodes.i4217)]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    per_process: bool = False
+
+
+def get_benchmarks(scales: List[int], name_filter: str = "") -> Iterator[Benchmark]:
+    """
+    It yields the benchmarks of the suite whose names contain the filter. A benchmark only creates the databases,
+    synthetic datasets and snapshots it needs when its `setup` is called, and each of them is created once, so filtered
+    runs do not load what they do not measure
+
+    Args:
+      scales (List[int]): The sizes of the synthetic subdivisions datasets, as multiples of the real one. Scale 1 uses
+    the real datasets.
+      name_filter (str): The text the names of the benchmarks must contain. All of them are yielded by default.
+
+    Returns:
+      An iterator of benchmarks.
+    """
+    benchmarks = _get_all_benchmarks(scales)
+    return (benchmark for benchmark in benchmarks if name_filter in benchmark.name)
+
+
+def _get_all_benchmarks(scales: List[int]) -> Iterator[Benchmark]:
+    yield from _get_process_benchmarks()
+
+    for database_class, isocode in DATASETS:
+        name = database_class.__name__.lower()
+        for source, use_snapshot in [("json", False), ("snapshot", True)]:
+            yield Benchmark(
+                f"populate.{name}.{source}",
+                functools.partial(_get_populate, database_class, isocode, use_snapshot),
+            )
+
+    for field in Countries.dataclass.__fields__:
+        yield Benchmark(f"get.countries.{field}", lambda field=field: _get_countries_by(field))
+
+    yield Benchmark(
+        "get.currencies.name (one-to-many)", _on(Currencies, lambda currencies: currencies.get(name="US Dollar"))
+    )
+    for value in ["Brazil", "Bolivia, Plurinational State of", "BRA", "br"]:
+        yield Benchmark(
+            f"lookup.countries[{value}]", _on(Countries, lambda countries, value=value: countries.lookup(value))
+        )
+
+    yield Benchmark("lookup.countries[not found]", _on(Countries, lambda countries: countries.lookup("Narnia")))
+    for cutoff in SEARCH_CUTOFFS:
+        yield Benchmark(
+            f"search.countries.cutoff_{cutoff}",
+            _on(Countries, lambda countries, cutoff=cutoff: _search(countries, cutoff)),
+        )
+
+    for scale in scales:
+        name = f"subdivisions[x{scale}]"
+        if scale != 1:
+            yield Benchmark(f"populate.{name}.json", lambda scale=scale: _load_scaled(scale)._populate_database)
+
+        yield from _get_subdivisions_benchmarks(scale, name)
+
+
+@functools.lru_cache(maxsize=None)
+def _load(database_class: Type[Database], isocode: ISOCodes, use_snapshot: bool = True) -> Database:
+    return database_class(isocode, use_snapshot=use_snapshot)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_scaled(scale: int) -> ScaledSubdivisions:
+    return ScaledSubdivisions(scale)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_snapshots() -> None:
+    for database_class, isocode in DATASETS:
+        build_snapshot(_load(database_class, isocode))
+
+
+def _on(database_class: Type[Database], benchmark: Callable[[Database], object]) -> Callable[[], Callable[[], object]]:
+    """
+    It returns the setup of a benchmark that calls a function with the database of the class, loaded from its snapshot
+    """
+    isocode = dict(DATASETS)[database_class]
+    return lambda: functools.partial(benchmark, _load(database_class, isocode))
+
+
+def _get_populate(database_class: Type[Database], isocode: ISOCodes, use_snapshot: bool) -> Callable[[], object]:
+    return _load(database_class, isocode, use_snapshot)._populate_database
+
+
+def _get_countries_by(field: str) -> Callable[[], object]:
+    countries = _load(Countries, ISOCodes.i3166_1)
+    value = next(getattr(country, field) for country in countries if getattr(country, field) is not None)
+    return lambda: countries.get(**{field: value})
+
+
+def _get_process_benchmarks() -> Iterator[Benchmark]:
+    """
+    It yields the benchmarks that run a new Python process, to measure the import and the cold start of the package
+    with the snapshots already built
+    """
+    for name, code in [
+        ("python", "pass"),
+        ("import", "import pycountrycodes"),
+        ("cold_start.countries", "from pycountrycodes import *; countries.get(alpha_2='BR')"),
+        ("cold_start.subdivisions", "from pycountrycodes import *; subdivisions.get(code='US-NY')"),
+        ("cold_start.search", "from pycountrycodes import *; countries.search('Brasil')"),
+    ]:
+        yield Benchmark(f"process.{name}", lambda code=code: _prepare_process(code), per_process=True)
+
+
+def _prepare_process(code: str) -> Callable[[], object]:
+    _build_snapshots()
+    return lambda: _run_python(code)
+
+
+def _get_subdivisions_benchmarks(scale: int, name: str) -> Iterator[Benchmark]:
+    def setup(benchmark: Callable[[Subdivisions, Subdivision], object]) -> Callable[[], Callable[[], object]]:
+        def create() -> Callable[[], object]:
+            subdivisions = _load_scaled(scale)
+            department = next(subdivision for subdivision in subdivisions if subdivision.parent_code is not None)
+            return lambda: benchmark(subdivisions, department)
+
+        return create
+
+    yield Benchmark(f"get.{name}.code", setup(lambda subdivisions, department: subdivisions.get(code=department.code)))
+    yield Benchmark(
+        f"get.{name}.country_code (one-to-many)",
+        setup(lambda subdivisions, department: subdivisions.get(country_code="FR")),
+    )
+    yield Benchmark(
+        f"lookup.{name}.code", setup(lambda subdivisions, department: subdivisions.lookup(department.code.lower()))
+    )
+    yield Benchmark(
+        f"traversal.{name}.parent (all)",
+        setup(lambda subdivisions, department: [subdivision.parent for subdivision in subdivisions]),
+    )
+    yield Benchmark(
+        f"traversal.{name}.country (all)",
+        setup(lambda subdivisions, department: [subdivision.country for subdivision in subdivisions]),
+    )
+    for cutoff in SEARCH_CUTOFFS:
+        yield Benchmark(
+            f"search.{name}.cutoff_{cutoff}",
+            setup(lambda subdivisions, department, cutoff=cutoff: _search(subdivisions, cutoff)),
+        )
+
+    yield Benchmark(
+        f"search.{name}.limit_10", setup(lambda subdivisions, department: subdivisions.search("New York", limit=10))
+    )
+
+
+def _search(database: Database, cutoff: float):
+    query = "New York" if isinstance(database, Subdivisions) else "United Kingdom"
+    return database.search(query, match_score_cutoff=cutoff)
+
+
+def _run_python(code: str):
+    subprocess.run([sys.executable, "-c", code], check=True, env=os.environ.copy())
@@ -1,8 +1,67 @@
+import gc
+import threading
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Type,
+)
+
 from pycountrycodes.core import ISOCodes
+from pycountrycodes.core.models import Database
 from pycountrycodes.countries_3166_1 import Countries
 from pycountrycodes.subdivisions_3166_2 import Subdivisions
 from pycountrycodes.currencies_4217 import Currencies
 
-countries = Countries(ISOCodes.i3166_1)
-subdivisions = Subdivisions(ISOCodes.i3166_2)
-currencies = Currencies(ISOCodes.i4217)
+__all__ = ["Countries", "Subdivisions", "Currencies", "countries", "subdivisions", "currencies", "freeze"]
+
+_DATABASES: Dict[str, Tuple[Type[Database], ISOCodes]] = {
+    "countries": (Countries, ISOCodes.i3166_1),
+    "subdivisions": (Subdivisions, ISOCodes.i3166_2),
+    "currencies": (Currencies, ISOCodes.i4217),
+}
+_lock = threading.RLock()
+
+
+def __getattr__(name: str) -> Any:
+    """
+    It loads the `countries`, `subdivisions` and `currencies` databases the first time they are accessed, so importing
+    the package does not pay for loading datasets that are never used
+
+    Args:
+      name (str): The name of the attribute being accessed.
+
+    Returns:
+      The loaded database.
+    """
+    if name not in _DATABASES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with _lock:
+        if name not in globals():
+            database_class, isocode = _DATABASES[name]
+            globals()[name] = database_class(isocode)
+
+    return globals()[name]
+
+
+def freeze():
+    """
+    It prepares a process to fork workers that share its databases: it loads the `countries`, `subdivisions` and
+    `currencies` databases, builds everything they otherwise build on first use with `Database.warm()`, and moves every
+    object to the permanent generation of the garbage collector with `gc.freeze()`. The garbage collections of the
+    workers then skip these objects, instead of writing to the memory pages that hold them, so the pages stay shared
+
+    Call it in the parent process, after importing the application and before forking, like in the `on_starting` hook
+    of gunicorn with `preload_app`.
+    """
+    for name in _DATABASES:
+        __getattr__(name).warm()
+
+    gc.collect()
+    gc.freeze()
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_DATABASES))
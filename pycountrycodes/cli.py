@@ -0,0 +1,314 @@
+"""
+The pycountrycodes command-line tool. Run `python -m pycountrycodes --help` to see its commands.
+"""
+import argparse
+import csv
+import itertools
+import json
+import logging
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+import pycountrycodes
+
+DEFAULT_FIELDS = {"countries": "alpha_2", "subdivisions": "code", "currencies": "alpha_3"}
+DEFAULT_CHUNK_SIZE = 10000
+
+
+class InvalidRowError(ValueError):
+    """
+    A row of the input that cannot be read, like a JSONL line that is not a JSON object.
+    """
+
+
+class ColumnSpec(NamedTuple):
+    column: str
+    kind: str
+    field: str
+    output_column: str
+
+
+class ResolveOptions(NamedTuple):
+    fuzzy: bool
+    match_score_cutoff: float
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    It parses the command-line arguments and runs the requested command
+
+    Args:
+      argv (Optional[Sequence[str]]): The command-line arguments. Defaults to `sys.argv[1:]`
+
+    Returns:
+      The exit status of the command.
+    """
+    parser = _build_parser()
+    arguments = parser.parse_args(argv)
+    if arguments.command is None:
+        parser.print_help()
+        return 2
+
+    return arguments.handler(arguments.parser, arguments)
+
+
+def parse_column_spec(value: str) -> ColumnSpec:
+    """
+    It parses a `COLUMN:KIND[:FIELD]` column specification
+
+    Args:
+      value (str): The column specification, like `country:countries` or `state:subdivisions:name`.
+
+    Returns:
+      The column specification.
+
+    Examples:
+        >>> parse_column_spec('country:countries')
+        ColumnSpec(column='country', kind='countries', field='alpha_2', output_column='country_alpha_2')
+    """
+    parts = value.split(":")
+    if len(parts) not in (2, 3) or not parts[0] or parts[1] not in DEFAULT_FIELDS:
+        raise argparse.ArgumentTypeError(
+            f'invalid column "{value}", expected COLUMN:KIND[:FIELD] with KIND one of {", ".join(DEFAULT_FIELDS)}'
+        )
+
+    column, kind = parts[:2]
+    field = parts[2] if len(parts) == 3 else DEFAULT_FIELDS[kind]
+    database_class = pycountrycodes._DATABASES[kind][0]
+    if field not in database_class.dataclass.__fields__:
+        raise argparse.ArgumentTypeError(
+            f'invalid field "{field}" for {kind}, expected one of {", ".join(database_class.dataclass.__fields__)}'
+        )
+
+    return ColumnSpec(column, kind, field, f"{column}_{field}")
+
+
+def normalize_rows(
+    rows: List[Dict[str, Any]], columns: Sequence[ColumnSpec], options: ResolveOptions
+) -> List[Dict[str, Any]]:
+    """
+    It resolves the values of the given columns of a chunk of rows, and adds the resolved fields to the rows
+
+    Args:
+      rows (List[Dict[str, Any]]): The rows of the chunk.
+      columns (Sequence[ColumnSpec]): The columns to resolve.
+      options (ResolveOptions): How the values are resolved.
+
+    Returns:
+      The same rows, with one more column for each resolved column.
+    """
+    for spec in columns:
+        database = getattr(pycountrycodes, spec.kind)
+        positions = [position for position, row in enumerate(rows) if isinstance(row.get(spec.column), str)]
+        records = database.resolve_many(
+            [rows[position][spec.column] for position in positions],
+            fuzzy=options.fuzzy,
+            match_score_cutoff=options.match_score_cutoff,
+        )
+        for row in rows:
+            row[spec.output_column] = None
+
+        for position, record in zip(positions, records):
+            if record is not None:
+                rows[position][spec.output_column] = getattr(record, spec.field)
+
+    return rows
+
+
+def _normalize_command(parser: argparse.ArgumentParser, arguments: argparse.Namespace) -> int:
+    """
+    It streams the rows of the input file, resolves them in chunks, and writes the enriched rows to the output
+    """
+    input_format = arguments.format or ("jsonl" if arguments.input.endswith((".jsonl", ".ndjson")) else "csv")
+    options = ResolveOptions(fuzzy=arguments.fuzzy, match_score_cutoff=arguments.match_score_cutoff)
+
+    input_file = _open(arguments.input, "r", sys.stdin)
+    output_file = _open(arguments.output, "w", sys.stdout)
+    try:
+        if input_format == "csv":
+            reader = csv.DictReader(input_file)
+            fieldnames = list(reader.fieldnames or [])
+            missing_columns = [spec.column for spec in arguments.columns if spec.column not in fieldnames]
+            if missing_columns:
+                parser.error(f'columns not found in the input: {", ".join(missing_columns)}')
+
+            writer = csv.DictWriter(
+                output_file, fieldnames + [spec.output_column for spec in arguments.columns], extrasaction="ignore"
+            )
+            writer.writeheader()
+            rows: Iterator[Dict[str, Any]] = reader
+            write_row = writer.writerow
+        else:
+            rows = _read_jsonl(input_file)
+
+            def write_row(row: Dict[str, Any]):
+                output_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+        for chunk in _normalize_chunks(rows, arguments.columns, options, arguments.chunk_size, arguments.processes):
+            for row in chunk:
+                write_row(row)
+    except InvalidRowError as error:
+        sys.stderr.write(f"{parser.prog}: error: {error}\n")
+        return 1
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    return 0
+
+
+def _serve_command(parser: argparse.ArgumentParser, arguments: argparse.Namespace) -> int:
+    """
+    It serves the databases over HTTP until the process is interrupted
+    """
+    from pycountrycodes import server
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    server.serve(arguments.host, arguments.port, arguments.workers)
+    return 0
+
+
+def _normalize_chunks(
+    rows: Iterable[Dict[str, Any]],
+    columns: Sequence[ColumnSpec],
+    options: ResolveOptions,
+    chunk_size: int,
+    processes: int,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    It splits the rows in chunks and normalizes them, in this process or in a pool of processes, keeping at most two
+    chunks for each process in memory and yielding the chunks in the order of the rows
+    """
+    chunks = iter(lambda: list(itertools.islice(rows, chunk_size)), [])
+    if processes <= 1:
+        for chunk in chunks:
+            yield normalize_rows(chunk, columns, options)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(normalize_rows, chunk, columns, options))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def _read_jsonl(input_file: IO[str]) -> Iterator[Dict[str, Any]]:
+    """
+    It yields the objects of the lines of a JSONL file, skipping blank lines, and raises an InvalidRowError with the
+    line number of the first line that is not a JSON object
+    """
+    for line_number, line in enumerate(input_file, 1):
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise InvalidRowError(f"line {line_number}: invalid JSON: {error}") from error
+
+        if not isinstance(row, dict):
+            raise InvalidRowError(f"line {line_number}: expected a JSON object, got {type(row).__name__}")
+
+        yield row
+
+
+def _open(path: str, mode: str, standard_stream: IO[str]) -> IO[str]:
+    if path == "-":
+        return standard_stream
+
+    return open(path, mode, encoding="utf_8", newline="")
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} must be greater than zero")
+
+    return number
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pycountrycodes", description="Tools for the ISO 3166 and ISO 4217 datasets.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    normalize = subparsers.add_parser(
+        "normalize",
+        help="resolve columns of a CSV or JSONL file to countries, subdivisions or currencies",
+        description=(
+            "Streams the rows of a CSV or JSONL file, resolves the values of the given columns with lookup(), falling "
+            "back to the best search() result, and writes the rows with one more COLUMN_FIELD column for each one."
+        ),
+    )
+    normalize.add_argument("input", nargs="?", default="-", help="the input file, or - for stdin (default)")
+    normalize.add_argument(
+        "-c",
+        "--column",
+        dest="columns",
+        action="append",
+        type=parse_column_spec,
+        required=True,
+        metavar="COLUMN:KIND[:FIELD]",
+        help=(
+            "a column to resolve, where KIND is countries, subdivisions or currencies, and FIELD is the field written "
+            "to the output (alpha_2, code and alpha_3 by default). Can be repeated."
+        ),
+    )
+    normalize.add_argument("-o", "--output", default="-", help="the output file, or - for stdout (default)")
+    normalize.add_argument(
+        "-f", "--format", choices=["csv", "jsonl"], help="the input and output format (default: from the extension)"
+    )
+    normalize.add_argument(
+        "--no-fuzzy", dest="fuzzy", action="store_false", help="only resolve the values found by lookup()"
+    )
+    normalize.add_argument(
+        "--match-score-cutoff",
+        type=float,
+        default=80,
+        help="the minimum score of the best search result of a value (default: 80)",
+    )
+    normalize.add_argument(
+        "--chunk-size",
+        type=_positive_int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"the number of rows resolved at once (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    normalize.add_argument(
+        "-p", "--processes", type=_positive_int, default=1, help="the number of processes resolving chunks (default: 1)"
+    )
+    normalize.set_defaults(handler=_normalize_command, parser=normalize)
+
+    serve = subparsers.add_parser(
+        "serve",
+        help="serve get, lookup, search and batch endpoints as JSON over HTTP",
+        description="Serves the databases as JSON over HTTP. See pycountrycodes.server for the endpoints.",
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="the address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8080, help="the port to listen on (default: 8080)")
+    serve.add_argument(
+        "-w",
+        "--workers",
+        type=_positive_int,
+        default=4,
+        help="the number of threads running searches and batches (default: 4)",
+    )
+    serve.set_defaults(handler=_serve_command, parser=serve)
+
+    return parser
@@ -0,0 +1,78 @@
+from bisect import bisect_left
+from typing import (
+    Container,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+class PrefixIndex:
+    """
+    Sorted arrays of normalized values, searched with bisect to find the values that start with a prefix.
+
+    The whole values of each field are kept in their own array, in the order of the fields, followed by one array of
+    the values starting at each one of their inner words. So objects whose first field starts with the prefix are
+    returned first, and the ones where only an inner word does are returned last.
+    """
+
+    def __init__(self, values: Iterable[List[Optional[str]]]):
+        self.tiers: List[Tuple[List[str], List[int]]] = []
+        word_entries: List[Tuple[str, int]] = []
+        for field_values in values:
+            value_entries: List[Tuple[str, int]] = []
+            for position, value in enumerate(field_values):
+                if value is None:
+                    continue
+
+                value_entries.append((value, position))
+                word_entries.extend(
+                    (value[start + 1 :], position) for start, character in enumerate(value) if character == " "
+                )
+
+            self.tiers.append(_split_entries(sorted(value_entries)))
+
+        self.tiers.append(_split_entries(sorted(word_entries)))
+
+    def restrict(self, positions: Container[int]) -> "PrefixIndex":
+        """
+        It returns a new index with only the entries of the given object positions
+
+        Args:
+          positions (Container[int]): The positions of the objects to keep.
+
+        Returns:
+          The restricted index.
+        """
+        index = PrefixIndex([])
+        index.tiers = [
+            _split_entries([entry for entry in zip(keys, tier_positions) if entry[1] in positions])
+            for keys, tier_positions in self.tiers
+        ]
+        return index
+
+    def search(self, prefix: str, limit: int) -> List[int]:
+        """
+        It returns the positions of the objects with a value, or an inner word of a value, that starts with a prefix
+
+        Args:
+          prefix (str): The normalized prefix.
+          limit (int): The maximum number of positions to return.
+
+        Returns:
+          A list of object positions, sorted by value.
+        """
+        found: List[int] = []
+        for keys, positions in self.tiers:
+            for index in range(bisect_left(keys, prefix), len(keys)):
+                if len(found) >= limit or not keys[index].startswith(prefix):
+                    break
+                if positions[index] not in found:
+                    found.append(positions[index])
+
+        return found
+
+
+def _split_entries(entries: List[Tuple[str, int]]) -> Tuple[List[str], List[int]]:
+    return [key for key, _ in entries], [position for _, position in entries]
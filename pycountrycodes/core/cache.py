@@ -0,0 +1,275 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Sequence,
+)
+
+# The number of keys read with one query, below the default limit of SQLite on the number of query parameters.
+PERSISTENT_CACHE_BATCH_SIZE = 500
+PERSISTENT_CACHE_TIMEOUT = 10.0
+# The minimum age, in seconds, of the last use of an entry before a hit records a new one. Most hits are then plain
+# reads, which do not take the write lock of the file, at the cost of a coarser order of eviction.
+PERSISTENT_CACHE_REFRESH_INTERVAL = 60.0
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded cache that evicts the least recently used entry when it is full.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        It returns the value cached for a key, marking it as the most recently used
+
+        Args:
+          key (Hashable): The key to look for.
+          default (Any): The value to return if the key is not cached.
+
+        Returns:
+          The cached value, or the default if the key is not cached.
+        """
+        with self._lock:
+            if key not in self._data:
+                self._misses += 1
+                return default
+
+            self._hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any):
+        """
+        It caches a value for a key, evicting the least recently used entry if the cache is full
+
+        Args:
+          key (Hashable): The key to cache the value for.
+          value (Any): The value to cache.
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """
+        It removes every entry from the cache and resets its statistics
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        """
+        It returns the statistics of the cache
+
+        Returns:
+          The number of hits, misses and evictions, and the maximum and current size of the cache.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class PersistentCache:
+    """
+    Size-bounded cache stored in a SQLite file, shared by every thread and process that opens the same file. Entries
+    are grouped by kind, and each entry records the version of the data it was computed from: entries of other versions
+    are never returned, and are discarded by `discard_stale()`. When the cache grows past its size, the least recently
+    used entries are evicted. JSON-serializable values only.
+
+    Args:
+      path (Path): The path of the SQLite file, created if it does not exist.
+      maxsize (int): The maximum number of entries. The cache can hold up to 1% more between two evictions.
+    """
+
+    def __init__(self, path: Path, maxsize: int):
+        self.path = Path(path)
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._writes_since_eviction = 0
+
+    def get_many(self, kind: str, version: str, keys: Sequence[str]) -> Dict[str, Any]:
+        """
+        It returns the values cached for some keys, marking them as the most recently used. The time of their last use
+        is only written when it is older than `PERSISTENT_CACHE_REFRESH_INTERVAL`
+
+        Args:
+          kind (str): The kind of the entries, like the name of the database they belong to.
+          version (str): The version of the data the values must have been computed from.
+          keys (Sequence[str]): The keys to look for.
+
+        Returns:
+          A dictionary with the value of each key that is cached. Keys that are not cached are left out.
+        """
+        found: Dict[str, Any] = {}
+        stale_keys: List[str] = []
+        now = time.time()
+        try:
+            connection = self._connect()
+            for start in range(0, len(keys), PERSISTENT_CACHE_BATCH_SIZE):
+                batch = keys[start : start + PERSISTENT_CACHE_BATCH_SIZE]
+                rows = connection.execute(
+                    "SELECT key, value, used_at FROM entries "
+                    f"WHERE kind = ? AND version = ? AND key IN ({','.join('?' * len(batch))})",
+                    (kind, version, *batch),
+                )
+                for key, value, used_at in rows:
+                    found[key] = json.loads(value)
+                    if used_at < now - PERSISTENT_CACHE_REFRESH_INTERVAL:
+                        stale_keys.append(key)
+
+            if stale_keys:
+                with connection:
+                    connection.executemany(
+                        "UPDATE entries SET used_at = ? WHERE kind = ? AND key = ?",
+                        [(now, kind, key) for key in stale_keys],
+                    )
+        except (sqlite3.Error, OSError):
+            pass
+
+        with self._lock:
+            self._hits += len(found)
+            self._misses += len(set(keys)) - len(found)
+
+        return found
+
+    def set_many(self, kind: str, version: str, items: Dict[str, Any]):
+        """
+        It caches values for some keys, replacing the values they had, and evicts the least recently used entries when
+        the cache is full
+
+        Args:
+          kind (str): The kind of the entries.
+          version (str): The version of the data the values were computed from.
+          items (Dict[str, Any]): The values to cache, by key.
+        """
+        if self.maxsize <= 0 or not items:
+            return
+
+        now = time.time()
+        try:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO entries (kind, key, version, value, used_at) VALUES (?, ?, ?, ?, ?)",
+                    [(kind, key, version, json.dumps(value), now) for key, value in items.items()],
+                )
+
+            with self._lock:
+                self._writes_since_eviction += len(items)
+                evict = self._writes_since_eviction > self.maxsize // 100
+                if evict:
+                    self._writes_since_eviction = 0
+
+            if evict:
+                self._evict(connection)
+        except (sqlite3.Error, OSError):
+            pass
+
+    def discard_stale(self, kind: str, version: str):
+        """
+        It removes the entries of a kind that were computed from another version of the data. Unlike `get_many()` and
+        `set_many()`, it raises the sqlite3.Error or OSError of a cache file that cannot be opened or written, so it
+        also tells whether the cache is usable
+
+        Args:
+          kind (str): The kind of the entries.
+          version (str): The current version of the data.
+        """
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM entries WHERE kind = ? AND version != ?", (kind, version))
+
+    def clear(self):
+        """
+        It removes every entry from the cache file, and resets the statistics of this process
+        """
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM entries")
+
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        """
+        It returns the statistics of the cache. The hits, misses and evictions are counted by this process only
+
+        Returns:
+          The number of hits, misses and evictions, and the maximum and current size of the cache.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self))
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _evict(self, connection: sqlite3.Connection):
+        with connection:
+            cursor = connection.execute(
+                "DELETE FROM entries WHERE rowid IN "
+                "(SELECT rowid FROM entries ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+        with self._lock:
+            self._evictions += max(cursor.rowcount, 0)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        It returns the connection of the current thread, opening a new one in new threads and in forked processes,
+        since SQLite connections cannot be shared by them
+        """
+        if getattr(self._local, "pid", None) != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=PERSISTENT_CACHE_TIMEOUT)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "kind TEXT NOT NULL, key TEXT NOT NULL, version TEXT NOT NULL, value TEXT NOT NULL, "
+                    "used_at REAL NOT NULL, PRIMARY KEY (kind, key))"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS entries_used_at ON entries (used_at)")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+
+        return self._local.connection
@@ -0,0 +1,131 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Tuple,
+    Type,
+)
+
+from pydantic import BaseModel
+
+_compact_classes: Dict[Type[BaseModel], Type["CompactRecord"]] = {}
+
+
+class CompactRecord:
+    """
+    Immutable, hashable and slotted alternative to the pydantic dataclasses, with the same attributes, properties and
+    methods of the dataclass it was created from. Use `get_compact_class()` to create one.
+    """
+
+    __slots__ = ()
+    model: Type[BaseModel]
+    _fields: Tuple[str, ...] = ()
+    _private_attributes: Tuple[str, ...] = ()
+    _setters: Dict[str, Callable[[Any, Any], None]] = {}
+
+    def __init__(self, **kwargs):
+        for field in self._fields:
+            self._setters[field](self, kwargs.get(field))
+        self._init_private_attributes()
+
+    @classmethod
+    def from_values(cls, fields: Tuple[str, ...], values: Tuple[Any, ...]) -> "CompactRecord":
+        """
+        It creates an object from already validated values
+
+        Args:
+          fields (Tuple[str, ...]): The names of the fields.
+          values (Tuple[Any, ...]): The values of the fields, in the same order of the names.
+
+        Returns:
+          The created object.
+        """
+        obj = cls.__new__(cls)
+        setters = cls._setters
+        for field, value in zip(fields, values):
+            setters[field](obj, value)
+        obj._init_private_attributes()
+        return obj
+
+    def _init_private_attributes(self):
+        for name in self._private_attributes:
+            self._setters[name](self, self.model.__private_attributes__[name].get_default())
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, field) for field in self._fields)
+
+    def dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self._fields}
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CompactRecord):
+            return self.model is other.model and self._values() == other._values()
+
+        if isinstance(other, self.model):
+            return self.dict() == other.dict()
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        return f'{self.model.__name__}({", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)})'
+
+    def __reduce__(self):
+        return _restore_compact_record, (self.model, self._values())
+
+
+def get_compact_class(model: Type[BaseModel]) -> Type[CompactRecord]:
+    """
+    It takes a pydantic dataclass and returns a compact record class with the same fields, properties and methods
+
+    Args:
+      model (Type[BaseModel]): The pydantic dataclass.
+
+    Returns:
+      The compact record class, created only once for each dataclass.
+
+    Examples:
+        Create a compact country:
+
+        >>> CompactCountry = get_compact_class(Country)
+        >>> CompactCountry(name="Brazil", alpha_2="BR", alpha_3="BRA", flag="🇧🇷", numeric="076").alpha_2
+        'BR'
+    """
+    if model not in _compact_classes:
+        fields = tuple(model.__fields__)
+        private_attributes = tuple(model.__private_attributes__)
+        namespace: Dict[str, Any] = {
+            "__slots__": fields + private_attributes,
+            "__module__": model.__module__,
+            "__qualname__": f"Compact{model.__qualname__}",
+            "__doc__": f"Compact version of {model.__name__}.",
+            "model": model,
+            "_fields": fields,
+            "_private_attributes": private_attributes,
+        }
+        for cls in reversed(model.__mro__[: model.__mro__.index(BaseModel)]):
+            for name, attribute in vars(cls).items():
+                if name.startswith("__") or name in fields + private_attributes or hasattr(CompactRecord, name):
+                    continue
+                is_method = callable(attribute) and not isinstance(attribute, type)
+                if is_method or isinstance(attribute, (property, staticmethod)):
+                    namespace[name] = attribute
+
+        compact_class = type(f"Compact{model.__name__}", (CompactRecord,), namespace)
+        compact_class._setters = {name: vars(compact_class)[name].__set__ for name in fields + private_attributes}
+        _compact_classes[model] = compact_class
+
+    return _compact_classes[model]
+
+
+def _restore_compact_record(model: Type[BaseModel], values: Tuple[Any, ...]) -> CompactRecord:
+    compact_class = get_compact_class(model)
+    return compact_class.from_values(compact_class._fields, values)
@@ -1,3 +1,29 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+ISO_DIR = BASE_DIR / "iso"
+
+SNAPSHOTS_ENABLED = os.environ.get("PYCOUNTRYCODES_SNAPSHOTS", "1") != "0"
+COMPACT_RECORDS_ENABLED = os.environ.get("PYCOUNTRYCODES_COMPACT_RECORDS", "0") == "1"
+SEARCH_CACHE_SIZE = int(os.environ.get("PYCOUNTRYCODES_SEARCH_CACHE_SIZE", "0"))
+PERSISTENT_CACHE_SIZE = int(os.environ.get("PYCOUNTRYCODES_PERSISTENT_CACHE_SIZE", "0"))
+SHARED_ENABLED = os.environ.get("PYCOUNTRYCODES_SHARED", "0") == "1"
+METRICS_ENABLED = os.environ.get("PYCOUNTRYCODES_METRICS", "0") == "1"
+
+
+def get_cache_dir() -> Path:
+    """
+    It returns the directory where pycountrycodes stores its generated files, honouring the PYCOUNTRYCODES_CACHE_DIR
+    and XDG_CACHE_HOME environment variables
+
+    Returns:
+      The path of the cache directory.
+    """
+    if os.environ.get("PYCOUNTRYCODES_CACHE_DIR"):
+        return Path(os.environ["PYCOUNTRYCODES_CACHE_DIR"])
+
+    if os.environ.get("XDG_CACHE_HOME"):
+        return Path(os.environ["XDG_CACHE_HOME"]) / "pycountrycodes"
+
+    return Path.home() / ".cache" / "pycountrycodes"
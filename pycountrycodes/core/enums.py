@@ -0,0 +1,23 @@
+from enum import (
+    Enum,
+    EnumMeta,
+)
+
+
+class MetaEnum(EnumMeta):
+    def __contains__(cls, item):
+        try:
+            cls(item)
+        except ValueError:
+            return False
+        return True
+
+
+class BaseEnum(str, Enum, metaclass=MetaEnum):
+    ...
+
+
+class ISOCodes(BaseEnum):
+    i3166_1 = "3166-1"
+    i3166_2 = "3166-2"
+    i4217 = "4217"
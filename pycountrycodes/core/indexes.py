@@ -0,0 +1,209 @@
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from pydantic import BaseModel
+
+NUMERIC_CODE_WIDTH = 3
+NUMERIC_TABLE_SIZE = 10**NUMERIC_CODE_WIDTH
+ALPHA_CODE_FIELDS = {2: "alpha_2", 3: "alpha_3"}
+# Setting the 0x20 bit of each byte lowercases the ASCII letters, and does not turn any other byte into a letter.
+ALPHA_CODE_MASKS = {width: int.from_bytes(b" " * width, "big") for width in ALPHA_CODE_FIELDS}
+
+CodeValue = Union[int, str, bytes, bytearray, memoryview]
+
+
+def normalize_key(value: str) -> str:
+    """
+    It takes a value and returns the key used to store and look it up in an index
+
+    Args:
+      value (str): The value to normalize.
+
+    Returns:
+      The case-normalized value.
+    """
+    return value.lower()
+
+
+def build_unique_index(array: Iterable[BaseModel], field: str) -> Dict[str, BaseModel]:
+    """
+    It takes an array of objects and a field name, and returns a dictionary mapping the case-normalized value of that
+    field to the first object that has it
+
+    Args:
+      array (Iterable[BaseModel]): The objects to index.
+      field (str): The field to index on.
+
+    Returns:
+      A dictionary of normalized field values to objects.
+    """
+    index: Dict[str, BaseModel] = {}
+    for obj in array:
+        value = getattr(obj, field, None)
+        if value is not None:
+            index.setdefault(normalize_key(value), obj)
+
+    return index
+
+
+def build_unique_indexes(array: List[BaseModel], fields: Iterable[str]) -> Dict[str, Dict[str, BaseModel]]:
+    """
+    It builds one unique index for each one of the given fields
+
+    Args:
+      array (List[BaseModel]): The objects to index.
+      fields (Iterable[str]): The fields to index on.
+
+    Returns:
+      A dictionary of field names to their indexes.
+    """
+    return {field: build_unique_index(array, field) for field in fields}
+
+
+def build_multi_value_index(array: Iterable[BaseModel], field: str) -> Dict[str, Tuple[BaseModel, ...]]:
+    """
+    It takes an array of objects and a field name, and returns a dictionary mapping the normalized value of that field
+    to all the objects that have it, in the same order they appear in the array
+
+    Args:
+      array (Iterable[BaseModel]): The objects to index.
+      field (str): The field to index on.
+
+    Returns:
+      A dictionary of normalized field values to tuples of objects.
+    """
+    index: Dict[str, List[BaseModel]] = {}
+    for obj in array:
+        value = getattr(obj, field, None)
+        if value is not None:
+            index.setdefault(normalize_key(value.strip()), []).append(obj)
+
+    return {key: tuple(objs) for key, objs in index.items()}
+
+
+def build_multi_value_indexes(
+    array: List[BaseModel], fields: Iterable[str]
+) -> Dict[str, Dict[str, Tuple[BaseModel, ...]]]:
+    """
+    It builds one multi value index for each one of the given fields
+
+    Args:
+      array (List[BaseModel]): The objects to index.
+      fields (Iterable[str]): The fields to index on.
+
+    Returns:
+      A dictionary of field names to their indexes.
+    """
+    return {field: build_multi_value_index(array, field) for field in fields}
+
+
+def get_numeric_slot(value: CodeValue) -> int:
+    """
+    It takes a numeric code, as an integer, a string or ASCII digits in a bytes-like object, and returns its slot in a
+    numeric direct-address table. Bytes-like objects are read in place, without copying or decoding them
+
+    Args:
+      value (CodeValue): The numeric code, like 76, "076", b"076" or a memoryview of b"076".
+
+    Returns:
+      The integer value of the code, or -1 if it is not a valid numeric code.
+    """
+    if isinstance(value, int):
+        return value if 0 <= value < NUMERIC_TABLE_SIZE else -1
+
+    if isinstance(value, str):
+        value = value.strip()
+        if not 0 < len(value) <= NUMERIC_CODE_WIDTH or not value.isascii() or not value.isdigit():
+            return -1
+
+        return int(value)
+
+    if not 0 < len(value) <= NUMERIC_CODE_WIDTH:
+        return -1
+
+    if isinstance(value, (bytes, bytearray)):
+        return int(value) if value.isdigit() else -1
+
+    slot = 0
+    for byte in value:
+        if not 48 <= byte <= 57:
+            return -1
+        slot = slot * 10 + byte - 48
+
+    return slot
+
+
+def get_alpha_key(value: CodeValue) -> int:
+    """
+    It takes an alphabetic code, as a string or ASCII letters in a bytes-like object, and returns the key used to store
+    and look it up in an alphabetic code table: the big-endian integer of its lowercased ASCII bytes. Bytes-like objects
+    are read in place, without copying or decoding them
+
+    Args:
+      value (CodeValue): The alphabetic code, like "BR", b"br" or a memoryview of b"BRA".
+
+    Returns:
+      The key of the code, or -1 if it is not an ASCII code with a supported width.
+    """
+    if isinstance(value, str):
+        if not value.isascii():
+            return -1
+        value = value.encode("ascii")
+    elif isinstance(value, int):
+        return -1
+
+    lowercase_mask = ALPHA_CODE_MASKS.get(len(value))
+    if lowercase_mask is None:
+        return -1
+
+    return int.from_bytes(value, "big") | lowercase_mask
+
+
+def build_numeric_code_table(array: Iterable[BaseModel], field: str) -> List[Optional[BaseModel]]:
+    """
+    It takes an array of objects and a field with numeric codes, and returns a direct-address table where the first
+    object with each code is stored in the slot of the code
+
+    Args:
+      array (Iterable[BaseModel]): The objects to index.
+      field (str): The field with the codes.
+
+    Returns:
+      A list of `NUMERIC_TABLE_SIZE` objects, with None for the codes no object has.
+    """
+    table: List[Optional[BaseModel]] = [None] * NUMERIC_TABLE_SIZE
+    for obj in array:
+        value = getattr(obj, field, None)
+        slot = get_numeric_slot(value) if value is not None else -1
+        if slot >= 0 and table[slot] is None:
+            table[slot] = obj
+
+    return table
+
+
+def build_alpha_code_table(array: Iterable[BaseModel], field: str) -> Dict[int, BaseModel]:
+    """
+    It takes an array of objects and a field with alphabetic codes, and returns a table mapping the key of each code
+    to the first object that has it
+
+    Args:
+      array (Iterable[BaseModel]): The objects to index.
+      field (str): The field with the codes.
+
+    Returns:
+      A dictionary of code keys to objects.
+    """
+    table: Dict[int, BaseModel] = {}
+    for obj in array:
+        value = getattr(obj, field, None)
+        key = get_alpha_key(value) if value is not None else -1
+        if key >= 0:
+            table.setdefault(key, obj)
+
+    return table
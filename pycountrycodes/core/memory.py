@@ -0,0 +1,76 @@
+import sys
+from types import (
+    BuiltinFunctionType,
+    FunctionType,
+    MethodType,
+    ModuleType,
+)
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+_SKIPPED_TYPES = (type, ModuleType, FunctionType, MethodType, BuiltinFunctionType)
+
+
+class MemoryUsage(NamedTuple):
+    records: int
+    indexes: int
+    search: int
+    caches: int
+
+    @property
+    def total(self) -> int:
+        return self.records + self.indexes + self.search + self.caches
+
+
+def get_deep_size(objects: Iterable[Any], seen: Set[int], is_external: Optional[Callable[[Any], bool]] = None) -> int:
+    """
+    It returns the size in bytes of some objects and of everything they reference: the items of containers, and the
+    attributes and slots of other objects. Objects whose ids are in `seen` are not counted, and the ids of the counted
+    objects are added to it, so objects shared by many calls are only counted by the first one
+
+    Args:
+      objects (Iterable[Any]): The objects to measure.
+      seen (Set[int]): The ids of the objects already counted.
+      is_external (Optional[Callable[[Any], bool]]): A function that tells whether an object is owned by something else,
+    like records of another database, so it is not counted nor followed.
+
+    Returns:
+      The number of bytes.
+    """
+    size = 0
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIPPED_TYPES) or (is_external is not None and is_external(obj)):
+            continue
+
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+            continue
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if isinstance(getattr(obj, "__dict__", None), dict):
+                stack.append(obj.__dict__)
+            stack.extend(_get_slot_values(obj))
+
+    return size
+
+
+def _get_slot_values(obj: Any) -> Iterable[Any]:
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+                yield getattr(obj, name)
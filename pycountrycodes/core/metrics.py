@@ -0,0 +1,330 @@
+"""
+Opt-in instrumentation of the database methods. When it is enabled on a database, its lookup and search methods are
+wrapped to record their number of calls, hits, misses and errors, their latency and the size of their results in a
+`MetricsRegistry`. Databases without it enabled run their methods unwrapped, so it costs nothing when it is disabled.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+)
+
+LATENCY_BUCKETS = (
+    0.000001,
+    0.0000025,
+    0.000005,
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+RESULT_SIZE_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 10000)
+
+# The hits, misses and size of the result of a call, from its result and arguments.
+Counter = Callable[[Any, tuple, dict], Tuple[int, int, int]]
+
+
+class Histogram:
+    """
+    Counts of observed values in buckets with inclusive upper bounds, plus an overflow bucket, and their sum.
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        It returns the number and sum of the observed values, and the cumulative count of each bucket keyed by its
+        upper bound, like the buckets of a Prometheus histogram
+        """
+        buckets = {}
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            buckets[_format_bound(bound)] = total
+
+        return {"count": total, "sum": self.sum, "buckets": buckets}
+
+
+class MethodMetrics:
+    """
+    The metrics of one method of one database.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.result_size = Histogram(RESULT_SIZE_BUCKETS)
+
+    def observe(self, seconds: float, hits: int, misses: int, size: int):
+        with self.lock:
+            self.calls += 1
+            self.hits += hits
+            self.misses += misses
+            # Histogram.observe() inlined, as this runs on every call of an instrumented method.
+            latency, result_size = self.latency, self.result_size
+            latency.counts[bisect_left(latency.bounds, seconds)] += 1
+            latency.sum += seconds
+            result_size.counts[bisect_left(result_size.bounds, size)] += 1
+            result_size.sum += size
+
+    def observe_error(self, seconds: float):
+        with self.lock:
+            self.calls += 1
+            self.errors += 1
+            self.latency.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "latency_seconds": self.latency.snapshot(),
+                "result_size": self.result_size.snapshot(),
+            }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of the metrics of the instrumented databases, keyed by database and method name.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[Tuple[str, str], MethodMetrics] = {}
+        self._lock = threading.Lock()
+
+    def get_method_metrics(self, database: str, method: str) -> MethodMetrics:
+        """
+        It returns the metrics of a method of a database, creating them the first time they are asked for
+
+        Args:
+          database (str): The name of the database, like "countries".
+          method (str): The name of the method, like "search".
+
+        Returns:
+          The metrics of the method.
+        """
+        with self._lock:
+            return self._metrics.setdefault((database, method), MethodMetrics())
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        It returns a copy of the metrics as plain dictionaries and numbers, that can be serialized to JSON
+
+        Returns:
+          A dictionary of database names to dictionaries of method names to their metrics.
+
+        Examples:
+            >>> registry.snapshot()["countries"]["lookup"]["misses"]
+            12
+        """
+        with self._lock:
+            items = sorted(self._metrics.items())
+
+        snapshot: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (database, method), metrics in items:
+            snapshot.setdefault(database, {})[method] = metrics.snapshot()
+
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """
+        It returns the metrics in the Prometheus text exposition format, labeled by database and method
+
+        Returns:
+          The text to serve from a /metrics endpoint.
+        """
+        snapshot = self.snapshot()
+        samples = [
+            (database, method, metrics) for database, methods in snapshot.items() for method, metrics in methods.items()
+        ]
+        lines: List[str] = []
+        for name, key, description in [
+            ("calls_total", "calls", "The number of calls of each method."),
+            ("hits_total", "hits", "The number of values found by each method."),
+            ("misses_total", "misses", "The number of values not found by each method."),
+            ("errors_total", "errors", "The number of calls of each method that raised an error."),
+        ]:
+            lines.append(f"# HELP pycountrycodes_{name} {description}")
+            lines.append(f"# TYPE pycountrycodes_{name} counter")
+            for database, method, metrics in samples:
+                lines.append(f"pycountrycodes_{name}{_format_labels(database, method)} {metrics[key]}")
+
+        for name, key, description in [
+            ("call_duration_seconds", "latency_seconds", "The duration of the calls of each method."),
+            ("result_size", "result_size", "The number of results of single calls, or values of batch calls."),
+        ]:
+            lines.append(f"# HELP pycountrycodes_{name} {description}")
+            lines.append(f"# TYPE pycountrycodes_{name} histogram")
+            for database, method, metrics in samples:
+                histogram = metrics[key]
+                for bound, count in histogram["buckets"].items():
+                    lines.append(f"pycountrycodes_{name}_bucket{_format_labels(database, method, le=bound)} {count}")
+                lines.append(f"pycountrycodes_{name}_sum{_format_labels(database, method)} {histogram['sum']!r}")
+                lines.append(f"pycountrycodes_{name}_count{_format_labels(database, method)} {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """
+        It resets the metrics of every method to zero
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        for method_metrics in metrics:
+            with method_metrics.lock:
+                method_metrics.reset()
+
+
+registry = MetricsRegistry()
+
+
+def count_record(result: Any, args: tuple, kwargs: dict) -> Tuple[int, int, int]:
+    """
+    It counts the result of a method that returns an object, a list of objects or its default
+    """
+    default = kwargs.get("default", args[1] if len(args) > 1 else None)
+    if result is None or result is default:
+        return 0, 1, 0
+
+    return 1, 0, len(result) if isinstance(result, list) else 1
+
+
+def count_results(result: List[Any], args: tuple, kwargs: dict) -> Tuple[int, int, int]:
+    """
+    It counts the result of a method that returns a list of results, like `search()`
+    """
+    return (1, 0, len(result)) if result else (0, 1, 0)
+
+
+def count_batch(default_position: int) -> Counter:
+    """
+    It returns a function that counts the result of a batch method, which returns a list with a result for each value,
+    or its default for the values that are not found
+
+    Args:
+      default_position (int): The position of the `default` argument of the method, or -1 if it has none.
+    """
+
+    def count(result: List[Any], args: tuple, kwargs: dict) -> Tuple[int, int, int]:
+        if default_position >= 0 and len(args) > default_position:
+            default = args[default_position]
+        else:
+            default = kwargs.get("default")
+        hits = sum(1 for item in result if item is not None and item is not default)
+        return hits, len(result) - hits, len(result)
+
+    return count
+
+
+def count_batch_results(result: List[List[Any]], args: tuple, kwargs: dict) -> Tuple[int, int, int]:
+    """
+    It counts the result of a batch method that returns a list of results for each value, like `search_many()`
+    """
+    hits = sum(1 for results in result if results)
+    return hits, len(result) - hits, len(result)
+
+
+INSTRUMENTED_METHODS: Dict[str, Counter] = {
+    "get": count_record,
+    "get_by_numeric": count_record,
+    "get_by_alpha": count_record,
+    "lookup": count_record,
+    "search": count_results,
+    "autocomplete": count_results,
+    "get_many": count_batch(2),
+    "lookup_many": count_batch(1),
+    "search_many": count_batch_results,
+    "resolve_many": count_batch(-1),
+}
+
+
+def instrument(database: Any, name: str, metrics_registry: MetricsRegistry):
+    """
+    It replaces the lookup and search methods of a database instance with wrappers that record their metrics. Calls
+    made by one method to another, like `resolve_many()` falling back to `search_many()`, are recorded for both
+
+    Args:
+      database (Any): The database to instrument.
+      name (str): The name of the database in the metrics, like "countries".
+      metrics_registry (MetricsRegistry): The registry to record the metrics in.
+    """
+    uninstrument(database)
+    for method_name, count in INSTRUMENTED_METHODS.items():
+        method = getattr(database, method_name)
+        metrics = metrics_registry.get_method_metrics(name, method_name)
+        setattr(database, method_name, _wrap(method, metrics, count))
+
+
+def uninstrument(database: Any):
+    """
+    It removes the wrappers added by `instrument()` from a database instance
+    """
+    for method_name in INSTRUMENTED_METHODS:
+        vars(database).pop(method_name, None)
+
+
+def _wrap(method: Callable[..., Any], metrics: MethodMetrics, count: Counter) -> Callable[..., Any]:
+    perf_counter = time.perf_counter
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started = perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except Exception:
+            metrics.observe_error(perf_counter() - started)
+            raise
+
+        metrics.observe(perf_counter() - started, *count(result, args, kwargs))
+        return result
+
+    return wrapper
+
+
+def _format_bound(bound: float) -> str:
+    if bound == float("inf"):
+        return "+Inf"
+
+    return repr(float(bound))
+
+
+def _format_labels(database: str, method: str, **labels: str) -> str:
+    labels = {"database": database, "method": method, **labels}
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
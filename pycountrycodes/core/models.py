@@ -1,14 +1,15 @@
 import abc
-import copy
 import json
-from enum import (
-    Enum,
-    EnumMeta,
-)
+import sqlite3
+import sys
 from typing import (
     Any,
+    Dict,
+    Iterable,
     List,
     Optional,
+    Sequence,
+    Set,
     Tuple,
     Type,
     Union,
@@ -17,51 +18,88 @@ from typing import (
 from pydantic import (
     BaseModel,
     Extra,
-    PrivateAttr,
 )
-from rapidfuzz import fuzz
-
-from pycountrycodes.core import utils
-from pycountrycodes.core.binary_search import get_object_using_binary_search
-from pycountrycodes.core.config import BASE_DIR
-
-
-class MetaEnum(EnumMeta):
-    def __contains__(cls, item):
-        try:
-            cls(item)
-        except ValueError:
-            return False
-        return True
-
-
-class BaseEnum(str, Enum, metaclass=MetaEnum):
-    ...
-
 
-class ISOCodes(BaseEnum):
-    i3166_1 = "3166-1"
-    i3166_2 = "3166-2"
-    i4217 = "4217"
+from pycountrycodes.core import (
+    compact,
+    indexes,
+    memory,
+    metrics,
+    segments,
+    snapshot,
+    utils,
+)
+from pycountrycodes.core.autocomplete import PrefixIndex
+from pycountrycodes.core.cache import (
+    CacheInfo,
+    LRUCache,
+    PersistentCache,
+)
+from pycountrycodes.core.config import (
+    COMPACT_RECORDS_ENABLED,
+    METRICS_ENABLED,
+    PERSISTENT_CACHE_SIZE,
+    SEARCH_CACHE_SIZE,
+    SHARED_ENABLED,
+    SNAPSHOTS_ENABLED,
+    get_cache_dir,
+)
+from pycountrycodes.core.enums import (
+    BaseEnum,
+    ISOCodes,
+    MetaEnum,
+)
+from pycountrycodes.core.search import (
+    SearchCorpus,
+    SearchResult,
+)
 
 
 class BaseDataClass(abc.ABC, BaseModel):
-    _match_score: Optional[float] = PrivateAttr(None)
-
-    @property
-    def match_score(self) -> float:
-        return self._match_score
-
     @staticmethod
     @abc.abstractmethod
     def get_searchable_fields() -> List[str]:
         ...
 
-    def update_match_score(self, match_score: Optional[float]):
-        if match_score is None:
-            return
+    @classmethod
+    def from_values(cls, fields: Tuple[str, ...], values: Tuple[Any, ...]) -> "BaseDataClass":
+        """
+        It creates an object from already validated values without validating them again, which is faster than
+        `construct()` since every field value is given
 
-        self._match_score = match_score
+        Args:
+          fields (Tuple[str, ...]): The names of the fields.
+          values (Tuple[Any, ...]): The values of the fields, in the same order of the names.
+
+        Returns:
+          The created object.
+        """
+        obj = cls.__new__(cls)
+        object.__setattr__(obj, "__dict__", dict(zip(fields, values)))
+        object.__setattr__(obj, "__fields_set__", set(fields))
+        obj._init_private_attributes()
+        return obj
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Compact records with the same values are equal, as pydantic only compares models to other models and to
+        dictionaries.
+        """
+        if isinstance(other, compact.CompactRecord):
+            return other.__eq__(self)
+
+        return super().__eq__(other)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        The private attributes hold references to other objects, precomputed by the database, so they are pickled with
+        their defaults instead of pickling every referenced object too.
+        """
+        state = super().__getstate__()
+        state["__private_attribute_values__"] = {
+            name: attribute.get_default() for name, attribute in self.__private_attributes__.items()
+        }
+        return state
 
     class Config:
         extra = Extra.forbid
@@ -69,10 +107,94 @@ class BaseDataClass(abc.ABC, BaseModel):
 
 class Database(abc.ABC):
     database: List["dataclass"]
-
-    def __init__(self, isocode: ISOCodes):
+    multiple_results_lookup_fields: List[str] = []
+    lookup_fields: List[str] = []
+    interned_fields: List[str] = []
+    memory_usage_attributes: Dict[str, List[str]] = {
+        "records": ["database"],
+        "indexes": ["_indexes", "_multi_value_indexes", "_numeric_code_table", "_alpha_code_table"],
+        "search": ["_search_corpus", "_prefix_indexes"],
+        "caches": ["search_cache"],
+    }
+
+    def __init__(
+        self,
+        isocode: ISOCodes,
+        *,
+        use_snapshot: Optional[bool] = None,
+        compact: Optional[bool] = None,
+        search_cache_size: Optional[int] = None,
+        metrics_enabled: Optional[bool] = None,
+        shared: Optional[bool] = None,
+        persistent_cache_size: Optional[int] = None,
+    ):
         self.__isocode = isocode
-        self.database = self._populate_database()
+        self.use_snapshot = SNAPSHOTS_ENABLED if use_snapshot is None else use_snapshot
+        self.compact = COMPACT_RECORDS_ENABLED if compact is None else compact
+        self.shared = SHARED_ENABLED if shared is None else shared
+        unique_fields = [
+            field for field in self.dataclass.__fields__ if field not in self.multiple_results_lookup_fields
+        ]
+        segment = segments.open_segment(isocode, tuple(self.dataclass.__fields__)) if self.shared else None
+        if segment is not None:
+            records = segments.SharedRecords(segment, segments.get_view_class(self.dataclass))
+            self.database: Sequence[BaseDataClass] = records
+            self._indexes = {field: segments.SharedIndex(records, field, unique=True) for field in unique_fields}
+            self._multi_value_indexes = {
+                field: segments.SharedIndex(records, field, unique=False)
+                for field in self.multiple_results_lookup_fields
+            }
+        else:
+            self.database = self._populate_database()
+            self._indexes = indexes.build_unique_indexes(self.database, unique_fields)
+            self._multi_value_indexes = indexes.build_multi_value_indexes(
+                self.database, self.multiple_results_lookup_fields
+            )
+        self._search_corpus: Optional[SearchCorpus] = None
+        self._prefix_indexes: Dict[Optional[Tuple[str, str]], PrefixIndex] = {}
+        self.search_cache = LRUCache(SEARCH_CACHE_SIZE if search_cache_size is None else search_cache_size)
+        if persistent_cache_size is None:
+            persistent_cache_size = PERSISTENT_CACHE_SIZE
+        self.persistent_cache: Optional[PersistentCache] = None
+        if persistent_cache_size > 0:
+            self.persistent_cache = PersistentCache(get_cache_dir() / "resolutions.sqlite3", persistent_cache_size)
+            try:
+                self.persistent_cache.discard_stale(self._persistent_cache_kind, snapshot.get_dataset_hash(isocode))
+            except (sqlite3.Error, OSError):
+                self.persistent_cache = None
+        self._numeric_code_table: Optional[List[Optional[BaseDataClass]]] = None
+        self._alpha_code_table: Optional[Dict[int, BaseDataClass]] = None
+        self.metrics_registry: Optional[metrics.MetricsRegistry] = None
+        self._link_objects()
+        if self.shared and segment is None:
+            try:
+                segments.export_segment(self)
+            except OSError:
+                pass
+        if METRICS_ENABLED if metrics_enabled is None else metrics_enabled:
+            self.enable_metrics()
+
+    @property
+    def record_class(self) -> Type[Union[BaseDataClass, compact.CompactRecord]]:
+        """
+        The class of the objects held by the database: the dataclass itself, or its compact version when the database
+        was created with `compact=True`.
+        """
+        return compact.get_compact_class(self.dataclass) if self.compact else self.dataclass
+
+    @property
+    def search_corpus(self) -> SearchCorpus:
+        """
+        The normalized values of the searchable fields, built on the first search and reused by the next ones.
+        """
+        if self._search_corpus is None:
+            self._search_corpus = SearchCorpus(self.database, self.dataclass.get_searchable_fields())
+
+        return self._search_corpus
+
+    @property
+    def isocode(self) -> ISOCodes:
+        return self.__isocode
 
     def __iter__(self):
         return iter(self.database)
@@ -81,90 +203,458 @@ class Database(abc.ABC):
         return len(self.database)
 
     @abc.abstractmethod
-    def get(
-        self, *, multiple_results_lookup_fields: Optional[List[str]] = None, **kwargs
-    ) -> Optional[Union[BaseDataClass, List[BaseDataClass]]]:
+    def get(self, **kwargs) -> Optional[Union[BaseDataClass, List[BaseDataClass]]]:
         """
         > If the field is in the list of fields that can have multiple results, return a list of all objects that match
         the value. Otherwise, return the first object that matches the value
 
-        Args:
-          multiple_results_lookup_fields (Optional[List[str]]): This is a list of fields that can have multiple results.
+        The fields that can have multiple results are defined by the `multiple_results_lookup_fields` class attribute.
         For example, if you have a list of people, and you want to search for people with the same last name, you would
-        pass in ["last_name"] as the value for this parameter.
+        set it to ["last_name"].
 
         Returns:
           The object that matches the field and value, or the default if no match is found.
         """
-        if multiple_results_lookup_fields is None:
-            multiple_results_lookup_fields = []
-
         field, value, default = self._get_field_value_and_default_from_kwargs(kwargs)
-        if field in multiple_results_lookup_fields:
-            options = list(filter(lambda obj: getattr(obj, field, "").strip().lower() == value.lower(), self.database))
-            return options if options else default
+        if field in self._multi_value_indexes:
+            options = self._multi_value_indexes[field].get(indexes.normalize_key(value), ())
+            return list(options) if options else default
 
         else:
-            obj = get_object_using_binary_search(self.database, field, value)
+            obj = self._indexes[field].get(indexes.normalize_key(value))
             return obj if obj is not None else default
 
-    def search(self, query: str, *, match_score_cutoff: float = 50) -> List[BaseDataClass]:
+    def get_many(self, field: str, values: Iterable[str], default: Any = None) -> List[Any]:
         """
-        It takes a query string, and returns a list of objects that match the query
+        It takes a field and many values, and returns what `get()` would return for each one of them. Each distinct
+        value is validated and normalized only once, so resolving large columns with repeated values is about as fast
+        as a dictionary lookup
+
+        Args:
+          field (str): The name of the field to get the objects by.
+          values (Iterable[str]): The values to look for.
+          default (Any): The value returned for the values that are not found. Defaults to None
+
+        Returns:
+          A list with the result of each value, in the same order of the values.
+
+        Examples:
+            Get the countries of a column of alpha_2 codes:
+
+            >>> [country.name for country in countries.get_many('alpha_2', ['BR', 'US', 'BR'])]
+            ['Brazil', 'United States', 'Brazil']
+        """
+        self._validate_field(field)
+        values = list(values)
+        if field in self._multi_value_indexes:
+            multi_value_index = self._multi_value_indexes[field]
+            options = {}
+            for value in dict.fromkeys(values):
+                self._validate_value(value)
+                options[value] = multi_value_index.get(indexes.normalize_key(value.strip()), ())
+
+            return [list(options[value]) if options[value] else default for value in values]
+
+        index = self._indexes[field]
+        results = {}
+        for value in dict.fromkeys(values):
+            self._validate_value(value)
+            obj = index.get(indexes.normalize_key(value.strip()))
+            results[value] = obj if obj is not None else default
+
+        return [results[value] for value in values]
+
+    def get_by_numeric(self, value: indexes.CodeValue, default: Any = None) -> Optional[BaseDataClass]:
+        """
+        It returns the object with a given numeric code, read from a 1,000-slot direct-address table. The code can be an
+        integer, a string, or ASCII digits in bytes, a bytearray or a memoryview, which are read in place
+
+        Args:
+          value (CodeValue): The numeric code, like 76, "076" or b"076".
+          default (Any): The value returned when no object has the code. Defaults to None
+
+        Returns:
+          The object with the numeric code, or the default.
+
+        Examples:
+            Get a country from a numeric code in a binary message:
+
+            >>> countries.get_by_numeric(memoryview(b"076")).name
+            'Brazil'
+        """
+        if self._numeric_code_table is None:
+            if "numeric" not in self.dataclass.__fields__:
+                raise AttributeError(f"Method not available for class {self.dataclass.__name__}")
+            self._numeric_code_table = indexes.build_numeric_code_table(self.database, "numeric")
+
+        slot = indexes.get_numeric_slot(value)
+        obj = self._numeric_code_table[slot] if slot >= 0 else None
+        return obj if obj is not None else default
+
+    def get_by_alpha(self, value: indexes.CodeValue, default: Any = None) -> Optional[BaseDataClass]:
+        """
+        It returns the object with a given alpha-2 or alpha-3 code. The code can be a string, or ASCII letters in bytes,
+        a bytearray or a memoryview, which are read in place. Case is ignored
+
+        Args:
+          value (CodeValue): The alpha-2 or alpha-3 code, like "BR", b"br" or b"BRA".
+          default (Any): The value returned when no object has the code. Defaults to None
+
+        Returns:
+          The object with the code, or the default.
+        """
+        if self._alpha_code_table is None:
+            alpha_fields = [field for field in indexes.ALPHA_CODE_FIELDS.values() if field in self.dataclass.__fields__]
+            if not alpha_fields:
+                raise AttributeError(f"Method not available for class {self.dataclass.__name__}")
+
+            table: Dict[int, BaseDataClass] = {}
+            for field in alpha_fields:
+                table.update(indexes.build_alpha_code_table(self.database, field))
+            self._alpha_code_table = table
+
+        obj = self._alpha_code_table.get(indexes.get_alpha_key(value))
+        return obj if obj is not None else default
+
+    def search(
+        self,
+        query: str,
+        *,
+        match_score_cutoff: float = 50,
+        limit: Optional[int] = None,
+        workers: int = 1,
+        with_field_scores: bool = False,
+        prune_candidates: bool = False,
+    ) -> List[SearchResult]:
+        """
+        It takes a query string, and returns a list of results with the objects that match the query and their scores.
+        The objects in the database are not changed, so searches can safely run in parallel threads
 
         Args:
           query (str): The query string to search for.
           match_score_cutoff (float): The minimum score a match must have to be returned. Defaults to 50
+          limit (Optional[int]): The maximum number of results to return, keeping the best ones. Defaults to no limit
+          workers (int): The number of threads used to score the objects when numpy is installed. -1 uses all cores.
+          with_field_scores (bool): Whether the results should include the score of each searchable field.
+          prune_candidates (bool): Whether only the objects that share enough trigrams with the query should be scored.
+        It makes searches on large databases much faster, but objects that only match the query fuzzily, without
+        sharing trigrams with it, are not returned. Queries shorter than 3 characters always score every object.
+
+        When the database has a search cache, the results of repeated searches are served from it. When it has a
+        persistent cache, the scores of searches without field scores are also read from and stored in it, so they are
+        reused by other processes and later runs.
 
         Returns:
-          A list of specified dataclass objects.
+          A list of search results, sorted by their match score.
         """
         searchable_fields = self.dataclass.get_searchable_fields()
         if not searchable_fields:
             raise AttributeError(f"Method not available for class {self.dataclass.__name__}")
 
+        self._validate_limit(limit)
         query = utils.remove_accents(query.strip().lower())
-        options = self.get_options(query, searchable_fields, match_score_cutoff)
-        return options
+        cache_key = (query, match_score_cutoff, limit, with_field_scores, prune_candidates)
+        options = self.search_cache.get(cache_key) if self.search_cache.maxsize > 0 else None
+        if options is None:
+            options = self.get_options(
+                query,
+                searchable_fields,
+                match_score_cutoff,
+                workers=workers,
+                with_field_scores=with_field_scores,
+                limit=limit,
+                prune_candidates=prune_candidates,
+            )
+            self.search_cache.set(cache_key, tuple(options))
 
-    def get_options(self, query: str, searchable_fields: List[str], score_cutoff: float) -> List[BaseDataClass]:
+        return list(options)
+
+    def search_many(
+        self, queries: Iterable[str], *, match_score_cutoff: float = 50, limit: Optional[int] = None, workers: int = 1
+    ) -> List[List[SearchResult]]:
         """
-        It takes a query string, a list of fields that are searchable, and a score cutoff, and returns a list of objects
-        that match the query string in the specified fields with a score greater than or equal to the score cutoff
+        It takes many query strings, and returns what `search()` would return for each one of them. The queries are
+        normalized and deduplicated, and every distinct query is scored against every object in one batch when numpy is
+        installed, so bulk fuzzy matching is much faster than calling `search()` for each query
+
+        Args:
+          queries (Iterable[str]): The query strings to search for.
+          match_score_cutoff (float): The minimum score a match must have to be returned. Defaults to 50
+          limit (Optional[int]): The maximum number of results to return for each query. Defaults to no limit
+          workers (int): The number of threads used to score the objects when numpy is installed. -1 uses all cores.
+
+        Returns:
+          A list with the search results of each query, in the same order of the queries. When the database has a
+        persistent cache, only the queries that are not stored in it are scored.
+
+        Examples:
+            Find the best match of a column of free-text country names:
+
+            >>> [results[0].alpha_2 for results in countries.search_many(['Brasil', 'germany'], limit=1)]
+            ['BR', 'DE']
+        """
+        searchable_fields = self.dataclass.get_searchable_fields()
+        if not searchable_fields:
+            raise AttributeError(f"Method not available for class {self.dataclass.__name__}")
+
+        self._validate_limit(limit)
+        queries = [utils.remove_accents(query.strip().lower()) for query in queries]
+        distinct_queries = list(dict.fromkeys(queries))
+        all_scores: Dict[str, Dict[int, float]] = {}
+        persisted_keys = {query: f"search_many:{match_score_cutoff!r}:{limit!r}:{query}" for query in distinct_queries}
+        if self.persistent_cache is not None:
+            persisted = self._get_persisted_scores(list(persisted_keys.values()))
+            all_scores = {query: persisted[key] for query, key in persisted_keys.items() if key in persisted}
+
+        missing_queries = [query for query in distinct_queries if query not in all_scores]
+        if missing_queries:
+            computed = self.search_corpus.score_many(missing_queries, match_score_cutoff, workers, limit)
+            all_scores.update(zip(missing_queries, computed))
+            if self.persistent_cache is not None:
+                self._persist_scores({persisted_keys[query]: all_scores[query] for query in missing_queries})
+
+        results = {}
+        for query, scores in all_scores.items():
+            results[query] = [
+                SearchResult(self.database[position], scores[position])
+                for position in sorted(scores, key=lambda position: (-scores[position], position))
+            ]
+
+        return [list(results[query]) for query in queries]
+
+    @property
+    def _persistent_cache_kind(self) -> str:
+        return f"{type(self).__module__}.{type(self).__qualname__}"
+
+    def _get_persisted_scores(self, keys: List[str]) -> Dict[str, Dict[int, float]]:
+        """
+        It returns the scores stored in the persistent cache for some search keys, computed from the current dataset
+        """
+        persisted = self.persistent_cache.get_many(
+            self._persistent_cache_kind, snapshot.get_dataset_hash(self.isocode), keys
+        )
+        return {key: {position: score for position, score in pairs} for key, pairs in persisted.items()}
+
+    def _persist_scores(self, all_scores: Dict[str, Dict[int, float]]):
+        """
+        It stores the scores of some search keys in the persistent cache, as lists of positions and scores
+        """
+        self.persistent_cache.set_many(
+            self._persistent_cache_kind,
+            snapshot.get_dataset_hash(self.isocode),
+            {key: list(scores.items()) for key, scores in all_scores.items()},
+        )
+
+    def cache_info(self) -> CacheInfo:
+        """
+        It returns the statistics of the search cache
+
+        Returns:
+          The number of hits, misses and evictions, and the maximum and current size of the search cache.
+        """
+        return self.search_cache.info()
+
+    def cache_clear(self):
+        """
+        It removes every result from the search cache and resets its statistics
+        """
+        self.search_cache.clear()
+
+    def memory_usage(self) -> memory.MemoryUsage:
+        """
+        It measures the memory held by the database: its records with their field values, the indexes of `get()` and
+        `lookup()`, the search corpus and autocomplete indexes once they are built, and the search cache. Objects shared
+        by many of them, like the records held by the indexes, are only counted once, in the first one that holds them
+
+        The attributes measured in each part are defined by the `memory_usage_attributes` class attribute.
+
+        Returns:
+          The number of bytes of each part, and their total.
+
+        Examples:
+            >>> subdivisions.memory_usage().total
+            6135342
+        """
+        if isinstance(self.database, segments.SharedRecords):
+            owned_records = {id(obj) for obj in self.database.views if obj is not None}
+        else:
+            owned_records = {id(obj) for obj in self.database}
+
+        def is_external(obj: Any) -> bool:
+            return isinstance(obj, (BaseDataClass, compact.CompactRecord)) and id(obj) not in owned_records
+
+        seen: Set[int] = set()
+        sizes = {}
+        for part, attributes in self.memory_usage_attributes.items():
+            objects = [
+                getattr(self, attribute) for attribute in attributes if getattr(self, attribute, None) is not None
+            ]
+            sizes[part] = memory.get_deep_size(objects, seen, is_external)
+
+        return memory.MemoryUsage(**sizes)
+
+    def warm(self):
+        """
+        It builds everything the database otherwise builds on first use: the search corpus and its n-gram index, the
+        prefix index of `autocomplete()` and the tables of `get_by_numeric()` and `get_by_alpha()`. Processes that
+        fork workers call it, through `pycountrycodes.freeze()`, so the workers share these structures instead of
+        building their own copies
+        """
+        if self.dataclass.get_searchable_fields():
+            self.search_corpus.ngram_index
+            self._get_prefix_index()
+
+        if "numeric" in self.dataclass.__fields__:
+            self.get_by_numeric(0)
+
+        if set(indexes.ALPHA_CODE_FIELDS.values()) & set(self.dataclass.__fields__):
+            self.get_by_alpha("")
+
+    def enable_metrics(self, registry: Optional[metrics.MetricsRegistry] = None, name: Optional[str] = None):
+        """
+        It starts recording the calls, hits, misses, errors, latency and result sizes of the lookup and search methods
+        of the database. Until it is called, the methods run without any instrumentation
+
+        Args:
+          registry (Optional[MetricsRegistry]): The registry to record the metrics in. Defaults to
+        `pycountrycodes.core.metrics.registry`
+          name (Optional[str]): The name of the database in the metrics. Defaults to the lowercase class name, like
+        "countries"
+
+        Examples:
+            >>> countries.enable_metrics()
+            >>> countries.lookup('Narnia')
+            >>> metrics.registry.snapshot()['countries']['lookup']['misses']
+            1
+        """
+        self.metrics_registry = metrics.registry if registry is None else registry
+        metrics.instrument(self, name or type(self).__name__.lower(), self.metrics_registry)
+
+    def disable_metrics(self):
+        """
+        It stops recording metrics, removing the instrumentation from the methods of the database
+        """
+        metrics.uninstrument(self)
+        self.metrics_registry = None
+
+    def get_options(
+        self,
+        query: str,
+        searchable_fields: List[str],
+        score_cutoff: float,
+        workers: int = 1,
+        with_field_scores: bool = False,
+        limit: Optional[int] = None,
+        prune_candidates: bool = False,
+    ) -> List[SearchResult]:
+        """
+        It takes a query string, a list of fields that are searchable, and a score cutoff, and returns a list of results
+        with the objects that match the query string in the specified fields with a score greater than or equal to the
+        score cutoff
 
         Args:
           query (str): The string that you want to search for.
           searchable_fields (List[str]): A list of strings that are the names of the fields that search is available.
           score_cutoff (float): The minimum score that an option must have to be returned.
+          workers (int): The number of threads used to score the objects when numpy is installed.
+          with_field_scores (bool): Whether the results should include the score of each searchable field.
+          limit (Optional[int]): The maximum number of results to return, keeping the best ones.
+          prune_candidates (bool): Whether only the objects that share enough trigrams with the query should be scored.
 
         Returns:
-          A list of the specified dataclass objects.
+          A list of search results, sorted by their match score.
         """
-        options = copy.copy(self.database)
-        for item in options:
-            total_score = 0
-            fields_used = 0
-            for field in searchable_fields:
-                field_value = getattr(item, field, None)
-                if field_value is not None:
-                    ratio_score = fuzz.ratio(query, utils.remove_accents(field_value.strip().lower()))
-                    partial_score = fuzz.partial_ratio(query, field_value.strip().lower())
-                    average_score = (ratio_score + partial_score) / 2
+        corpus = self.search_corpus
+        persisted_key = f"search:{score_cutoff!r}:{limit!r}:{prune_candidates:d}:{query}"
+        scores = None
+        if self.persistent_cache is not None and not with_field_scores:
+            scores = self._get_persisted_scores([persisted_key]).get(persisted_key)
+
+        if scores is None:
+            candidates = corpus.ngram_index.get_candidates(query) if prune_candidates else None
+            scores = corpus.score(query, score_cutoff, workers, limit, candidates)
+            if self.persistent_cache is not None and not with_field_scores:
+                self._persist_scores({persisted_key: scores})
+
+        return [
+            SearchResult(
+                self.database[position],
+                scores[position],
+                corpus.score_fields(query, position) if with_field_scores else None,
+            )
+            for position in sorted(scores, key=lambda position: (-scores[position], position))
+        ]
 
-                    total_score += average_score
-                    fields_used += 1
+    def autocomplete(self, prefix: str, *, limit: int = 10) -> List[BaseDataClass]:
+        """
+        It takes a prefix, and returns the objects with a searchable field, or a word of a searchable field, that starts
+        with it. Accents and case are ignored
 
-                else:
-                    continue
+        Args:
+          prefix (str): The prefix typed so far.
+          limit (int): The maximum number of objects to return. Defaults to 10
 
-            try:
-                match_score = total_score / fields_used
-                item.update_match_score(match_score=match_score)
-            except ZeroDivisionError:
-                item.update_match_score(match_score=0)
+        Returns:
+          A list of specified dataclass objects, the ones where the whole field starts with the prefix first.
+        """
+        return self._autocomplete(prefix, limit)
+
+    def _autocomplete(
+        self, prefix: str, limit: int, scope_field: Optional[str] = None, scope_value: Optional[str] = None
+    ) -> List[BaseDataClass]:
+        """
+        It looks up a prefix in the prefix index of the objects where `scope_field` is equal to `scope_value`, or of
+        every object when no scope is given
+
+        Args:
+          prefix (str): The prefix typed so far.
+          limit (int): The maximum number of objects to return.
+          scope_field (Optional[str]): The field used to restrict the objects, one of the
+        `multiple_results_lookup_fields`.
+          scope_value (Optional[str]): The value the field must be equal to. Values that no object has return no
+        objects, without building an index for them.
+
+        Returns:
+          A list of specified dataclass objects.
+        """
+        if not self.dataclass.get_searchable_fields():
+            raise AttributeError(f"Method not available for class {self.dataclass.__name__}")
+
+        prefix = utils.remove_accents(prefix.strip().lower())
+        scope = None
+        if scope_field is not None and scope_value is not None:
+            scope = (scope_field, indexes.normalize_key(scope_value.strip()))
+            if scope not in self._prefix_indexes and not self._multi_value_indexes[scope_field].get(scope[1]):
+                return []
+
+        return [self.database[position] for position in self._get_prefix_index(scope).search(prefix, limit)]
+
+    def _get_prefix_index(self, scope: Optional[Tuple[str, str]] = None) -> PrefixIndex:
+        """
+        It returns the prefix index of the objects where the field of the scope is equal to its normalized value, or of
+        every object when no scope is given, building it on its first use. The field of the scope must be one of the
+        `multiple_results_lookup_fields`, and its value must be in their index
+        """
+        if scope not in self._prefix_indexes:
+            if None not in self._prefix_indexes:
+                self._prefix_indexes[None] = PrefixIndex(self.search_corpus.folded.values())
+
+            if scope is not None:
+                records = self._multi_value_indexes[scope[0]].get(scope[1], ())
+                self._prefix_indexes[scope] = self._prefix_indexes[None].restrict(self._get_positions(records))
+
+        return self._prefix_indexes[scope]
+
+    def _get_positions(self, records: Sequence[BaseDataClass]) -> Set[int]:
+        """
+        It returns the positions of some objects of the database. The views of shared databases know their position,
+        and the other objects are found by their identity
+        """
+        if isinstance(self.database, segments.SharedRecords):
+            return {record._position for record in records}
 
-        options.sort(key=lambda obj: obj.match_score, reverse=True)
-        return list(filter(lambda obj: obj.match_score >= score_cutoff, options))
+        ids = {id(record) for record in records}
+        return {position for position, obj in enumerate(self.database) if id(obj) in ids}
 
     @abc.abstractmethod
     def lookup(self, value: str, fields_to_lookup: List[str], default: Any = None) -> Optional[BaseDataClass]:
@@ -187,21 +677,146 @@ class Database(abc.ABC):
 
         obj = None
         for field in fields_to_lookup:
-            obj = get_object_using_binary_search(self.database, field, value)
+            obj = self._indexes[field].get(value)
             if obj is not None:
                 break
 
         return obj if obj is not None else default
 
+    def lookup_many(self, values: Iterable[str], default: Any = None) -> List[Any]:
+        """
+        It takes many values, and returns what `lookup()` would return for each one of them. Each distinct value is
+        normalized and looked up only once
+
+        The fields looked up are defined by the `lookup_fields` class attribute.
+
+        Args:
+          values (Iterable[str]): The values to look for.
+          default (Any): The value returned for the values that are not found. Defaults to None
+
+        Returns:
+          A list with the object of each value, or the default, in the same order of the values.
+
+        Examples:
+            Lookup a column of country names and codes:
+
+            >>> [country.alpha_2 for country in countries.lookup_many(['Brazil', 'usa', 'Brazil'])]
+            ['BR', 'US', 'BR']
+        """
+        searchable_fields = self.dataclass.get_searchable_fields()
+        if not searchable_fields:
+            raise AttributeError(f"Method not available for class {self.dataclass.__name__}")
+
+        field_indexes = [self._indexes[field] for field in self.lookup_fields]
+        values = list(values)
+        results = {}
+        for value in dict.fromkeys(values):
+            normalized_value = utils.remove_accents(value.strip().lower())
+            obj = None
+            for index in field_indexes:
+                obj = index.get(normalized_value)
+                if obj is not None:
+                    break
+
+            results[value] = obj if obj is not None else default
+
+        return [results[value] for value in values]
+
+    def resolve_many(
+        self, values: Iterable[str], *, fuzzy: bool = True, match_score_cutoff: float = 80, workers: int = 1
+    ) -> List[Optional[BaseDataClass]]:
+        """
+        It takes many values, and returns the object each one of them refers to: the one found by `lookup_many()`, or
+        else the best result of `search_many()`
+
+        Args:
+          values (Iterable[str]): The values to resolve.
+          fuzzy (bool): Whether the values not found by `lookup_many()` should be resolved by their best search result.
+          match_score_cutoff (float): The minimum score of the best search result of a value. Defaults to 80
+          workers (int): The number of threads used to search the values when numpy is installed. -1 uses all cores.
+
+        Returns:
+          A list with the object of each value, or None, in the same order of the values.
+        """
+        values = list(values)
+        records = self.lookup_many(values)
+        if fuzzy:
+            missing = [position for position, record in enumerate(records) if record is None]
+            all_results = self.search_many(
+                [values[position] for position in missing],
+                match_score_cutoff=match_score_cutoff,
+                limit=1,
+                workers=workers,
+            )
+            for position, results in zip(missing, all_results):
+                if results:
+                    records[position] = results[0].record
+
+        return records
+
     def _populate_database(self) -> List[BaseDataClass]:
         """
-        > It loads data from a file, and then creates a list of objects from that data
+        > It loads data from the snapshot of the dataset when there is a valid one, otherwise from the dataset file, and
+        then creates a list of objects from that data. Objects loaded from a snapshot are not validated again
 
         Returns:
-          A list of specified dataclass objects
+          A list of specified dataclass objects, or of their compact version when `compact` is set
         """
-        data = self._load_data_from_file()
-        return [self.dataclass(**item) for item in data]
+        fields = tuple(self.dataclass.__fields__)
+        record_class = self.record_class
+        interned_positions = [position for position, field in enumerate(fields) if field in self.interned_fields]
+        if self.use_snapshot:
+            rows = snapshot.read_snapshot(self.__isocode, fields)
+            if rows is not None:
+                if interned_positions:
+                    rows = [_intern_values(row, interned_positions) for row in rows]
+                return [record_class.from_values(fields, row) for row in rows]
+
+        data = [self._parse_item(item) for item in self._load_data_from_file()]
+        for item in data:
+            for field in self.interned_fields:
+                if isinstance(item.get(field), str):
+                    item[field] = sys.intern(item[field])
+
+        database = [self.dataclass(**item) for item in data]
+        if self.compact:
+            database = [record_class.from_values(fields, tuple(obj.dict().values())) for obj in database]
+
+        if self.use_snapshot:
+            try:
+                snapshot.write_snapshot(
+                    self.__isocode, fields, [tuple(getattr(obj, field) for field in fields) for obj in database]
+                )
+            except OSError:
+                pass
+
+        return database
+
+    def _parse_item(self, item: dict) -> dict:
+        """
+        It takes an item from the dataset file, and returns the keyword arguments used to create the dataclass object
+
+        Args:
+          item (dict): The item loaded from the dataset file.
+
+        Returns:
+          A dictionary of field names to values.
+        """
+        return item
+
+    def _link_objects(self):
+        """
+        It is called once the database and its indexes are loaded, to precompute the references between its objects.
+        The base database has no references to precompute
+        """
+        return None
+
+    def _get_shared_indexes(self) -> Dict[str, Dict[str, Tuple[BaseDataClass, ...]]]:
+        """
+        It returns the indexes, besides the ones of the fields, that are written to the segment of the database, like
+        the references computed by `_link_objects()`. The base database has no other indexes
+        """
+        return {}
 
     def _load_data_from_file(self) -> List:
         """
@@ -210,7 +825,7 @@ class Database(abc.ABC):
         Returns:
           A list of dictionaries.
         """
-        with open(BASE_DIR / "iso" / f"{self.__isocode}.json", mode="r", encoding="utf_8") as file:
+        with open(snapshot.get_dataset_path(self.__isocode), mode="r", encoding="utf_8") as file:
             data = json.load(file)
 
         return data[self.__isocode]
@@ -237,6 +852,22 @@ class Database(abc.ABC):
         if not isinstance(value, str):
             raise TypeError(f'The value "{value}" must be a string.')
 
+    def _validate_limit(self, limit: Optional[int]):
+        """
+        If the limit is not None or a non-negative integer, raise a TypeError or a ValueError.
+
+        Args:
+          limit (Optional[int]): The limit to validate.
+        """
+        if limit is None:
+            return
+
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            raise TypeError(f'The limit "{limit}" must be an integer.')
+
+        if limit < 0:
+            raise ValueError(f'The limit "{limit}" must not be negative.')
+
     def _get_field_value_and_default_from_kwargs(self, kwargs: dict) -> Tuple[str, str, Optional[Any]]:
         """
         It takes a dictionary of keyword arguments, and returns a tuple of three values: the field name,
@@ -265,3 +896,15 @@ class Database(abc.ABC):
     @abc.abstractmethod
     def dataclass(self) -> Type[BaseDataClass]:
         ...
+
+
+def _intern_values(values: Tuple[Any, ...], positions: List[int]) -> Tuple[Any, ...]:
+    """
+    It returns the values with the strings at the given positions replaced by their interned version
+    """
+    values = list(values)
+    for position in positions:
+        if isinstance(values[position], str):
+            values[position] = sys.intern(values[position])
+
+    return tuple(values)
@@ -0,0 +1,72 @@
+import math
+from collections import Counter
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+NGRAM_SIZE = 3
+MIN_SHARED_NGRAMS_RATIO = 0.25
+
+
+def get_ngrams(value: str, size: int = NGRAM_SIZE) -> Set[str]:
+    """
+    It takes a string and returns the set of its n-grams, padding the string with a space on each side so the start and
+    the end of each word also produce n-grams
+
+    Args:
+      value (str): The string to split into n-grams.
+      size (int): The number of characters of each n-gram. Defaults to 3
+
+    Returns:
+      A set of n-grams.
+    """
+    padded_value = f" {value} "
+    return {padded_value[start : start + size] for start in range(len(padded_value) - size + 1)}
+
+
+class NGramIndex:
+    """
+    Inverted index of the n-grams of normalized values to the positions of the objects that have them.
+    """
+
+    def __init__(self, values: Iterable[List[Optional[str]]], size: int = NGRAM_SIZE):
+        self.size = size
+        postings: Dict[str, Set[int]] = {}
+        for field_values in values:
+            for position, value in enumerate(field_values):
+                if value is None:
+                    continue
+                for ngram in get_ngrams(value, size):
+                    postings.setdefault(ngram, set()).add(position)
+
+        self.postings: Dict[str, Tuple[int, ...]] = {
+            ngram: tuple(sorted(positions)) for ngram, positions in postings.items()
+        }
+
+    def get_candidates(self, query: str, min_shared_ratio: float = MIN_SHARED_NGRAMS_RATIO) -> Optional[List[int]]:
+        """
+        It returns the positions of the objects that share enough n-grams with a normalized query
+
+        Args:
+          query (str): The normalized query.
+          min_shared_ratio (float): The minimum ratio of the n-grams of the query an object must have.
+
+        Returns:
+          A sorted list of object positions, or None when the query is too short to be split into n-grams and all
+          the objects must be considered.
+        """
+        if len(query) < self.size:
+            return None
+
+        ngrams = get_ngrams(query, self.size)
+        shared_ngrams: Counter = Counter()
+        for ngram in ngrams:
+            shared_ngrams.update(self.postings.get(ngram, ()))
+
+        min_shared = max(1, math.ceil(len(ngrams) * min_shared_ratio))
+        return sorted(position for position, count in shared_ngrams.items() if count >= min_shared)
@@ -0,0 +1,378 @@
+import heapq
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from pydantic import BaseModel
+
+from pycountrycodes.core import utils
+from pycountrycodes.core.ngrams import NGramIndex
+
+LIMITED_SEARCH_CHUNK_SIZE = 256
+SCORE_MATRIX_CHUNK_SIZE = 512
+
+
+class SearchResult:
+    """
+    An object found by a search, with its match score and, optionally, the score of each one of its searchable fields.
+    The attributes of the object can also be read directly from the result.
+    """
+
+    __slots__ = ("record", "match_score", "field_scores")
+
+    def __init__(self, record: BaseModel, match_score: float, field_scores: Optional[Dict[str, float]] = None):
+        self.record = record
+        self.match_score = match_score
+        self.field_scores = field_scores
+
+    def __getattr__(self, name: str) -> Any:
+        if name in SearchResult.__slots__:
+            raise AttributeError(name)
+
+        return getattr(self.record, name)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, SearchResult):
+            return NotImplemented
+
+        return (self.record, self.match_score, self.field_scores) == (
+            other.record,
+            other.match_score,
+            other.field_scores,
+        )
+
+    def __repr__(self) -> str:
+        return f"SearchResult(record={self.record!r}, match_score={self.match_score!r})"
+
+    def __reduce__(self):
+        return SearchResult, (self.record, self.match_score, self.field_scores)
+
+
+class SearchCorpus:
+    """
+    The normalized values of the searchable fields of a database, computed once and reused by every search.
+
+    For each field, `folded` holds the stripped, lowercased and accent-free values, and `lowered` holds the stripped and
+    lowercased values. Objects without a value for a field have None in its position.
+    """
+
+    def __init__(self, array: Sequence[BaseModel], fields: Sequence[str]):
+        self.size = len(array)
+        self.fields = list(fields)
+        self.lowered: Dict[str, List[Optional[str]]] = {}
+        self.folded: Dict[str, List[Optional[str]]] = {}
+        self.positions: Dict[str, List[int]] = {}
+
+        for field in self.fields:
+            lowered = [_lower(getattr(obj, field, None)) for obj in array]
+            self.lowered[field] = lowered
+            self.folded[field] = [utils.remove_accents(value) if value is not None else None for value in lowered]
+            self.positions[field] = [position for position, value in enumerate(lowered) if value is not None]
+
+        self._ngram_index: Optional[NGramIndex] = None
+
+    @property
+    def ngram_index(self) -> NGramIndex:
+        """
+        The n-gram index of the folded values, built on the first search that prunes candidates.
+        """
+        if self._ngram_index is None:
+            self._ngram_index = NGramIndex(self.folded.values())
+
+        return self._ngram_index
+
+    def score(
+        self,
+        query: str,
+        score_cutoff: float,
+        workers: int = 1,
+        limit: Optional[int] = None,
+        candidates: Optional[List[int]] = None,
+    ) -> Dict[int, float]:
+        """
+        It scores every object against a normalized query, and returns the scores that are greater than or equal to the
+        score cutoff.
+
+        The score of each field is the average of the ratio between the query and the folded value and the partial ratio
+        between the query and the lowered value, and the score of an object is the average of the scores of the fields
+        it has a value for. The ratios are computed first, in one batch for each field, and the more expensive partial
+        ratios are only computed for the objects that can still reach the score cutoff.
+
+        When a limit is given, the candidates are scored in chunks, from the highest to the lowest upper bound, and the
+        scoring stops as soon as no remaining candidate can beat the worst of the best scores found so far.
+
+        Args:
+          query (str): The normalized query.
+          score_cutoff (float): The minimum score an object must have to be returned.
+          workers (int): The number of threads used to compute the scores when numpy is installed. -1 uses all cores.
+          limit (Optional[int]): The maximum number of scores to return, keeping the best ones.
+          candidates (Optional[List[int]]): The sorted positions of the only objects to score. Defaults to all objects.
+
+        Returns:
+          A dictionary of object positions to their scores.
+        """
+        from rapidfuzz import fuzz
+
+        ratios = {}
+        for field in self.fields:
+            positions = self.positions[field]
+            if candidates is not None:
+                positions = [position for position in candidates if self.lowered[field][position] is not None]
+            ratios[field] = self._score_field(query, self.folded[field], positions, fuzz.ratio, workers)
+
+        upper_bounds = self._get_upper_bounds(ratios, score_cutoff, candidates)
+        if limit is None:
+            return self._score_candidates(query, list(upper_bounds), ratios, score_cutoff, workers)
+
+        best_scores: List[Tuple[float, int]] = []
+        candidates = [position for position, _ in sorted(upper_bounds.items(), key=itemgetter(1), reverse=True)]
+        for start in range(0, len(candidates) if limit > 0 else 0, LIMITED_SEARCH_CHUNK_SIZE):
+            chunk = candidates[start : start + LIMITED_SEARCH_CHUNK_SIZE]
+            if len(best_scores) == limit and upper_bounds[chunk[0]] < best_scores[0][0]:
+                break
+
+            for position, score in self._score_candidates(query, chunk, ratios, score_cutoff, workers).items():
+                if len(best_scores) < limit:
+                    heapq.heappush(best_scores, (score, -position))
+                elif (score, -position) > best_scores[0]:
+                    heapq.heapreplace(best_scores, (score, -position))
+
+        return {-negative_position: score for score, negative_position in best_scores}
+
+    def score_many(
+        self, queries: Sequence[str], score_cutoff: float, workers: int = 1, limit: Optional[int] = None
+    ) -> List[Dict[int, float]]:
+        """
+        It scores every object against many normalized queries, and returns the scores that are greater than or equal
+        to the score cutoff for each query.
+
+        When numpy is installed, the ratios and partial ratios of every query and value are computed in one batch for
+        each field, as query-by-object score matrices, and combined into the scores of the objects with array
+        operations. The queries are scored in chunks of `SCORE_MATRIX_CHUNK_SIZE` to bound the memory used by the
+        matrices. Otherwise, each query is scored with `score()`.
+
+        Args:
+          queries (Sequence[str]): The normalized queries.
+          score_cutoff (float): The minimum score an object must have to be returned.
+          workers (int): The number of threads used to compute the scores when numpy is installed. -1 uses all cores.
+          limit (Optional[int]): The maximum number of scores to return for each query, keeping the best ones.
+
+        Returns:
+          A list with a dictionary of object positions to their scores for each query, in the same order of the
+          queries, each one sorted from the best to the worst score.
+        """
+        numpy = _import_numpy()
+        if numpy is None:
+            return [self.score(query, score_cutoff, workers, limit) for query in queries]
+
+        all_scores = []
+        for start in range(0, len(queries), SCORE_MATRIX_CHUNK_SIZE):
+            matrix = self._score_matrix(queries[start : start + SCORE_MATRIX_CHUNK_SIZE], workers)
+            for row in matrix:
+                positions = numpy.flatnonzero(row >= score_cutoff)
+                scores = row[positions]
+                order = numpy.lexsort((positions, -scores))[:limit]
+                all_scores.append(dict(zip(positions[order].tolist(), scores[order].tolist())))
+
+        return all_scores
+
+    def score_fields(self, query: str, position: int) -> Dict[str, float]:
+        """
+        It scores each searchable field of one object against a normalized query
+
+        Args:
+          query (str): The normalized query.
+          position (int): The position of the object.
+
+        Returns:
+          A dictionary of field names to their scores, for the fields the object has a value for.
+        """
+        from rapidfuzz import fuzz
+
+        field_scores = {}
+        for field in self.fields:
+            if self.folded[field][position] is not None:
+                ratio_score = fuzz.ratio(query, self.folded[field][position])
+                partial_score = fuzz.partial_ratio(query, self.lowered[field][position])
+                field_scores[field] = (ratio_score + partial_score) / 2
+
+        return field_scores
+
+    def _get_upper_bounds(
+        self, ratios: Dict[str, Dict[int, float]], score_cutoff: float, candidates: Optional[List[int]] = None
+    ) -> Dict[int, float]:
+        """
+        It returns the scores the objects would have if their partial ratios were 100, for the objects that can still
+        reach the score cutoff
+
+        Args:
+          ratios (Dict[str, Dict[int, float]]): The ratios of each field, by object position.
+          score_cutoff (float): The minimum score an object must have to be returned.
+          candidates (Optional[List[int]]): The sorted positions of the only objects to score. Defaults to all objects.
+
+        Returns:
+          A dictionary of object positions to their upper bound scores, sorted by position.
+        """
+        if len(self.fields) == 1 and len(self.positions[self.fields[0]]) == self.size:
+            upper_bounds = ((position, (ratio + 100) / 2) for position, ratio in ratios[self.fields[0]].items())
+            return {position: bound for position, bound in upper_bounds if bound >= score_cutoff}
+
+        totals = [0.0] * self.size
+        counts = [0] * self.size
+        for field_ratios in ratios.values():
+            for position, ratio in field_ratios.items():
+                totals[position] += (ratio + 100) / 2
+                counts[position] += 1
+
+        upper_bounds = (
+            (position, totals[position] / counts[position] if counts[position] else 0)
+            for position in (range(self.size) if candidates is None else candidates)
+        )
+        return {position: bound for position, bound in upper_bounds if bound >= score_cutoff}
+
+    def _score_candidates(
+        self,
+        query: str,
+        candidates: List[int],
+        ratios: Dict[str, Dict[int, float]],
+        score_cutoff: float,
+        workers: int,
+    ) -> Dict[int, float]:
+        """
+        It computes the partial ratios of the candidates, in one batch for each field, and combines them with their
+        ratios into the scores of the candidates
+
+        Args:
+          query (str): The normalized query.
+          candidates (List[int]): The positions of the objects to score.
+          ratios (Dict[str, Dict[int, float]]): The ratios of each field, by object position.
+          score_cutoff (float): The minimum score an object must have to be returned.
+          workers (int): The number of threads used to compute the scores when numpy is installed.
+
+        Returns:
+          A dictionary of object positions to their scores.
+        """
+        from rapidfuzz import fuzz
+
+        partial_ratios = {
+            field: self._score_field(
+                query,
+                self.lowered[field],
+                [position for position in candidates if position in ratios[field]],
+                fuzz.partial_ratio,
+                workers,
+            )
+            for field in self.fields
+        }
+
+        if len(self.fields) == 1:
+            field_ratios, field_partial_ratios = ratios[self.fields[0]], partial_ratios[self.fields[0]]
+            match_scores = {
+                position: (field_ratios[position] + partial_ratio) / 2
+                for position, partial_ratio in field_partial_ratios.items()
+            }
+        else:
+            match_scores = {}
+            for position in candidates:
+                total_score = 0
+                fields_used = 0
+                for field in self.fields:
+                    partial_ratio = partial_ratios[field].get(position)
+                    if partial_ratio is not None:
+                        total_score += (ratios[field][position] + partial_ratio) / 2
+                        fields_used += 1
+
+                if fields_used:
+                    match_scores[position] = total_score / fields_used
+
+        if score_cutoff <= 0:
+            for position in candidates:
+                match_scores.setdefault(position, 0)
+
+        return {position: score for position, score in match_scores.items() if score >= score_cutoff}
+
+    def _score_matrix(self, queries: Sequence[str], workers: int):
+        """
+        It computes the scores of every object against every query in one batch for each field
+
+        Returns:
+          A numpy matrix with one row for each query and one column for each object.
+        """
+        from rapidfuzz import (
+            fuzz,
+            process,
+        )
+
+        numpy = _import_numpy()
+        totals = numpy.zeros((len(queries), self.size), dtype=numpy.float64)
+        counts = numpy.zeros(self.size, dtype=numpy.float64)
+        for field in self.fields:
+            positions = self.positions[field]
+            ratios, partial_ratios = (
+                process.cdist(
+                    queries,
+                    [values[position] for position in positions],
+                    scorer=scorer,
+                    processor=None,
+                    dtype=numpy.float64,
+                    workers=workers,
+                )
+                for values, scorer in [(self.folded[field], fuzz.ratio), (self.lowered[field], fuzz.partial_ratio)]
+            )
+            totals[:, positions] += (ratios + partial_ratios) / 2
+            counts[positions] += 1
+
+        return numpy.divide(totals, counts, out=numpy.zeros_like(totals), where=counts > 0)
+
+    def _score_field(
+        self,
+        query: str,
+        values: List[Optional[str]],
+        positions: List[int],
+        scorer: Callable[..., float],
+        workers: int,
+    ) -> Dict[int, float]:
+        """
+        It scores the query against the values in the given positions in one batch
+
+        Returns:
+          A dictionary of object positions to their scores.
+        """
+        from rapidfuzz import process
+
+        numpy = _import_numpy()
+        choices = [values[position] for position in positions]
+        if numpy is not None:
+            scores = process.cdist(
+                [query], choices, scorer=scorer, processor=None, dtype=numpy.float64, workers=workers
+            )[0].tolist()
+        else:
+            scores = [score for _, score, _ in process.extract_iter(query, choices, scorer=scorer, processor=None)]
+
+        return dict(zip(positions, scores))
+
+
+def _import_numpy():
+    """
+    It imports numpy only when it is installed, since it is an optional dependency that makes batch scoring faster
+
+    Returns:
+      The numpy module, or None if it is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+
+    return numpy
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    return value.strip().lower() if value is not None else None
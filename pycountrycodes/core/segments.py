@@ -0,0 +1,471 @@
+"""
+Read-only database segments shared by many processes. A segment is a file with the field values of every record of a
+dataset and hash tables of its lookup indexes, laid out to be used in place. Processes map it in memory instead of
+loading the dataset, so every worker of a host shares the same physical pages, and the records are lightweight views
+that read their field values from the segment when they are accessed.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from pydantic import BaseModel
+
+from pycountrycodes.core import compact
+from pycountrycodes.core.config import get_cache_dir
+from pycountrycodes.core.enums import ISOCodes
+from pycountrycodes.core.snapshot import (
+    get_dataset_hash,
+    get_models_hash,
+)
+
+if TYPE_CHECKING:
+    from pycountrycodes.core.models import Database
+
+SEGMENT_FORMAT_VERSION = 1
+
+_MAGIC = b"PCCSEG\x00\x00"
+_HEADER_LENGTH = struct.Struct("<I")
+_ALIGNMENT = 8
+_NO_VALUE = 0xFFFFFFFF
+
+_view_classes: Dict[Type[BaseModel], Type["RecordView"]] = {}
+
+
+class RecordView(compact.CompactRecord):
+    """
+    Record of a shared database. It has the attributes, properties and methods of a compact record, but reads its field
+    values from the segment on each access instead of holding them. Use `get_view_class()` to create one.
+    """
+
+    __slots__ = ()
+
+    def _link(self):
+        """
+        It asks the database of the view to precompute the references of the view, like the parent and children of a
+        subdivision, which shared databases only do for the views that need them
+        """
+        self._records.link(self)
+
+
+class SharedSegment:
+    """
+    A segment file mapped in memory, read only.
+
+    Args:
+      path (Path): The path of the segment file.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[: len(_MAGIC)] != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a pycountrycodes segment")
+
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._mmap, len(_MAGIC))
+        header_start = len(_MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(self._mmap[header_start : header_start + header_length])
+        self.path = path
+        self.key: str = header["key"]
+        self.fields: Tuple[str, ...] = tuple(header["fields"])
+        self.size: int = header["size"]
+        self.byteorder: str = header["byteorder"]
+        self._sections = header["sections"]
+        self._values = self._get_section("values")
+        self._indexes = {
+            name: (self._get_section(f"{name}.slots"), self._get_section(f"{name}.entries"))
+            for name in header["indexes"]
+        }
+        self._postings = self._get_section("postings")
+        self._strings = self._sections["strings"][0]
+
+    def read_value(self, position: int, field_position: int) -> Optional[str]:
+        """
+        It returns the value of a field of a record, decoded from the segment
+
+        Args:
+          position (int): The position of the record.
+          field_position (int): The position of the field in `fields`.
+
+        Returns:
+          The value of the field.
+        """
+        slot = 2 * (position * len(self.fields) + field_position)
+        offset = self._values[slot]
+        if offset == _NO_VALUE:
+            return None
+
+        offset += self._strings
+        return self._mmap[offset : offset + self._values[slot + 1]].decode()
+
+    def find(self, index: str, key: str) -> List[int]:
+        """
+        It looks a key up in one of the indexes of the segment
+
+        Args:
+          index (str): The name of the index, usually a field name.
+          key (str): The normalized key.
+
+        Returns:
+          The positions of the records indexed under the key, in the order they were indexed.
+        """
+        slots, entries = self._indexes[index]
+        encoded_key = key.encode()
+        mask = len(slots) - 1
+        slot = zlib.crc32(encoded_key) & mask
+        while True:
+            entry = slots[slot]
+            if entry == 0:
+                return []
+
+            key_offset, key_length, postings_start, postings_count = entries[4 * (entry - 1) : 4 * entry]
+            key_offset += self._strings
+            if key_length == len(encoded_key) and self._mmap[key_offset : key_offset + key_length] == encoded_key:
+                return self._postings[postings_start : postings_start + postings_count].tolist()
+
+            slot = (slot + 1) & mask
+
+    def close(self):
+        for name in list(self._indexes):
+            for section in self._indexes.pop(name):
+                section.release()
+        self._values.release()
+        self._postings.release()
+        self._mmap.close()
+
+    def _get_section(self, name: str) -> memoryview:
+        start, length = self._sections[name]
+        return memoryview(self._mmap)[start : start + length].cast("I")
+
+
+class SharedRecords(Sequence):
+    """
+    The records of a shared database, as a sequence of views over its segment. Each view is created on its first
+    access, and the same view is returned by the next ones.
+
+    Args:
+      segment (SharedSegment): The segment of the database.
+      view_class (Type[RecordView]): The class of the views, from `get_view_class()`.
+    """
+
+    def __init__(self, segment: SharedSegment, view_class: Type[RecordView]):
+        self.segment = segment
+        self.read_value = segment.read_value
+        self.view_class = view_class
+        self.views: List[Optional[RecordView]] = [None] * segment.size
+        self.link: Callable[[RecordView], None] = lambda view: None
+        self._set_records = vars(view_class)["_records"].__set__
+        self._set_position = vars(view_class)["_position"].__set__
+
+    def __len__(self) -> int:
+        return self.segment.size
+
+    def __getitem__(self, position: Any) -> Any:
+        if isinstance(position, slice):
+            return [self[index] for index in range(*position.indices(len(self)))]
+
+        view = self.views[position]
+        if view is None:
+            if position < 0:
+                position += len(self)
+            view = self.view_class.__new__(self.view_class)
+            self._set_records(view, self)
+            self._set_position(view, position)
+            view._init_private_attributes()
+            self.views[position] = view
+
+        return view
+
+    def __iter__(self) -> Iterator[RecordView]:
+        for position in range(len(self)):
+            yield self[position]
+
+
+class SharedIndex:
+    """
+    An index of a segment, with the same `get()` interface of the dictionaries used as indexes by the databases.
+
+    Args:
+      records (SharedRecords): The records of the segment.
+      name (str): The name of the index.
+      unique (bool): Whether the index returns one record for each key, instead of a tuple of records.
+    """
+
+    def __init__(self, records: SharedRecords, name: str, unique: bool):
+        self.records = records
+        self.name = name
+        self.unique = unique
+
+    def get(self, key: str, default: Any = None) -> Any:
+        positions = self.records.segment.find(self.name, key)
+        if not positions:
+            return default
+
+        if self.unique:
+            return self.records[positions[0]]
+
+        return tuple(self.records[position] for position in positions)
+
+
+def get_view_class(model: Type[BaseModel]) -> Type[RecordView]:
+    """
+    It takes a pydantic dataclass and returns a record view class with the same fields, properties and methods
+
+    Args:
+      model (Type[BaseModel]): The pydantic dataclass.
+
+    Returns:
+      The record view class, created only once for each dataclass.
+    """
+    if model not in _view_classes:
+        compact_class = compact.get_compact_class(model)
+        namespace: Dict[str, Any] = {
+            "__slots__": ("_records", "_position"),
+            "__module__": model.__module__,
+            "__qualname__": f"Shared{model.__qualname__}",
+            "__doc__": f"Shared version of {model.__name__}.",
+        }
+        for field_position, field in enumerate(compact_class._fields):
+            namespace[field] = _FieldView(field, field_position)
+
+        _view_classes[model] = type(f"Shared{model.__name__}", (compact_class, RecordView), namespace)
+
+    return _view_classes[model]
+
+
+def get_segment_path(isocode: ISOCodes, directory: Optional[Path] = None) -> Path:
+    """
+    It returns the path where the segment for the current version of a dataset is stored
+
+    Args:
+      isocode (ISOCodes): The ISO code of the dataset.
+      directory (Optional[Path]): The directory of the segments. Defaults to the pycountrycodes cache directory.
+
+    Returns:
+      The path of the segment file.
+    """
+    if directory is None:
+        directory = get_cache_dir()
+
+    return Path(directory) / f"{ISOCodes(isocode).value}-{_get_segment_key(isocode)[:16]}.segment"
+
+
+def write_segment(
+    isocode: ISOCodes,
+    fields: Sequence[str],
+    records: Sequence[Any],
+    unique_indexes: Dict[str, Dict[str, Any]],
+    multi_value_indexes: Dict[str, Dict[str, Tuple[Any, ...]]],
+    directory: Optional[Path] = None,
+) -> Path:
+    """
+    It writes the records of a dataset and their indexes to its segment file, replacing it atomically
+
+    Args:
+      isocode (ISOCodes): The ISO code of the dataset.
+      fields (Sequence[str]): The names of the fields of the records. Their values must be strings or None.
+      records (Sequence[Any]): The records.
+      unique_indexes (Dict[str, Dict[str, Any]]): Indexes of normalized keys to one record, by name.
+      multi_value_indexes (Dict[str, Dict[str, Tuple[Any, ...]]]): Indexes of normalized keys to many records, by name.
+      directory (Optional[Path]): The directory of the segments. Defaults to the pycountrycodes cache directory.
+
+    Returns:
+      The path of the written segment.
+    """
+    strings = bytearray()
+    string_offsets: Dict[str, int] = {}
+
+    def add_string(value: str) -> Tuple[int, int]:
+        encoded = value.encode()
+        if value not in string_offsets:
+            string_offsets[value] = len(strings)
+            strings.extend(encoded)
+        return string_offsets[value], len(encoded)
+
+    values = array("I")
+    for record in records:
+        for field in fields:
+            value = getattr(record, field)
+            if value is None:
+                values.extend((_NO_VALUE, 0))
+            elif isinstance(value, str):
+                values.extend(add_string(value))
+            else:
+                raise TypeError(f"segments can only store strings, {field} is {type(value).__name__}")
+
+    positions = {id(record): position for position, record in enumerate(records)}
+    postings = array("I")
+    sections: Dict[str, Any] = {"values": values}
+    all_indexes = {
+        **{name: {key: (record,) for key, record in index.items()} for name, index in unique_indexes.items()},
+        **multi_value_indexes,
+    }
+    for name, index in all_indexes.items():
+        slots = array("I", [0]) * _get_table_size(len(index))
+        entries = array("I")
+        mask = len(slots) - 1
+        for entry, (key, indexed_records) in enumerate(index.items(), 1):
+            key_offset, key_length = add_string(key)
+            entries.extend((key_offset, key_length, len(postings), len(indexed_records)))
+            postings.extend(positions[id(record)] for record in indexed_records)
+            slot = zlib.crc32(key.encode()) & mask
+            while slots[slot]:
+                slot = (slot + 1) & mask
+            slots[slot] = entry
+
+        sections[f"{name}.slots"] = slots
+        sections[f"{name}.entries"] = entries
+
+    sections["postings"] = postings
+    sections["strings"] = strings
+    header: Dict[str, Any] = {
+        "key": _get_segment_key(isocode),
+        "fields": list(fields),
+        "size": len(records),
+        "byteorder": sys.byteorder,
+        "indexes": list(all_indexes),
+    }
+
+    # The header holds the offsets of the sections that follow it, so room is reserved for it until it fits.
+    reserved = 1024
+    while True:
+        offset = _align(len(_MAGIC) + _HEADER_LENGTH.size + reserved)
+        header["sections"] = {}
+        for name, section in sections.items():
+            length = len(section) * section.itemsize if isinstance(section, array) else len(section)
+            header["sections"][name] = [offset, length]
+            offset = _align(offset + length)
+
+        encoded_header = json.dumps(header).encode()
+        if len(encoded_header) <= reserved:
+            break
+        reserved = 2 * len(encoded_header)
+
+    content = bytearray(offset)
+    content[: len(_MAGIC)] = _MAGIC
+    _HEADER_LENGTH.pack_into(content, len(_MAGIC), len(encoded_header))
+    header_start = len(_MAGIC) + _HEADER_LENGTH.size
+    content[header_start : header_start + len(encoded_header)] = encoded_header
+    for name, section in sections.items():
+        start, length = header["sections"][name]
+        content[start : start + length] = bytes(section)
+
+    path = get_segment_path(isocode, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(content)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+    return path
+
+
+def open_segment(isocode: ISOCodes, fields: Sequence[str], directory: Optional[Path] = None) -> Optional[SharedSegment]:
+    """
+    It maps the segment of a dataset in memory
+
+    Args:
+      isocode (ISOCodes): The ISO code of the dataset.
+      fields (Sequence[str]): The names of the fields expected in the records.
+      directory (Optional[Path]): The directory of the segments. Defaults to the pycountrycodes cache directory.
+
+    Returns:
+      The segment, or None if there is no valid segment for the current dataset.
+    """
+    try:
+        segment = SharedSegment(get_segment_path(isocode, directory))
+    except (OSError, ValueError):
+        return None
+
+    expected = (_get_segment_key(isocode), tuple(fields), sys.byteorder)
+    if (segment.key, segment.fields, segment.byteorder) != expected:
+        segment.close()
+        return None
+
+    return segment
+
+
+def export_segment(database: "Database", directory: Optional[Path] = None) -> Path:
+    """
+    It writes the segment of a database, so the processes that create the database with `shared=True` attach to it
+    instead of loading the dataset. Run it at deploy time, or in the parent process before starting the workers
+
+    Args:
+      database (Database): A database created without `shared=True`.
+      directory (Optional[Path]): The directory of the segments. Defaults to the pycountrycodes cache directory.
+
+    Returns:
+      The path of the segment.
+    """
+    if isinstance(database.database, SharedRecords):
+        return database.database.segment.path
+
+    return write_segment(
+        database.isocode,
+        tuple(database.dataclass.__fields__),
+        database.database,
+        database._indexes,
+        {**database._multi_value_indexes, **database._get_shared_indexes()},
+        directory,
+    )
+
+
+class _FieldView:
+    """
+    Descriptor of a field of a record view, which reads the value from the segment of the view.
+    """
+
+    def __init__(self, name: str, field_position: int):
+        self.name = name
+        self.field_position = field_position
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self
+
+        return obj._records.read_value(obj._position, self.field_position)
+
+    def __set__(self, obj: Any, value: Any):
+        raise AttributeError(f"{type(obj).__name__} objects are immutable")
+
+
+def _get_segment_key(isocode: ISOCodes) -> str:
+    return f"{get_dataset_hash(isocode)}:{get_models_hash()}:{SEGMENT_FORMAT_VERSION}"
+
+
+def _get_table_size(entries: int) -> int:
+    """
+    It returns the number of slots of a hash table, a power of two with at most half of the slots used
+    """
+    size = 8
+    while size < 2 * entries:
+        size *= 2
+
+    return size
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
@@ -0,0 +1,217 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from pycountrycodes.core.config import (
+    ISO_DIR,
+    get_cache_dir,
+)
+from pycountrycodes.core.enums import ISOCodes
+
+if TYPE_CHECKING:
+    from pycountrycodes.core.models import Database
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_dataset_hashes: Dict[ISOCodes, str] = {}
+_models_hash: Optional[str] = None
+
+
+def get_dataset_path(isocode: ISOCodes) -> Path:
+    """
+    It returns the path of the JSON file that holds the dataset of a given ISO code
+
+    Args:
+      isocode (ISOCodes): The ISO code of the dataset.
+
+    Returns:
+      The path of the dataset file.
+    """
+    return ISO_DIR / f"{ISOCodes(isocode).value}.json"
+
+
+def get_dataset_hash(isocode: ISOCodes) -> str:
+    """
+    It returns the SHA-256 hash of the JSON file that holds the dataset of a given ISO code
+
+    Args:
+      isocode (ISOCodes): The ISO code of the dataset.
+
+    Returns:
+      The hexadecimal digest of the dataset file.
+    """
+    isocode = ISOCodes(isocode)
+    if isocode not in _dataset_hashes:
+        _dataset_hashes[isocode] = hashlib.sha256(get_dataset_path(isocode).read_bytes()).hexdigest()
+
+    return _dataset_hashes[isocode]
+
+
+def get_models_hash() -> str:
+    """
+    It returns the SHA-256 hash of the source of the models modules of the package, which parse and validate the
+    datasets, so files made from the parsed values are rebuilt when an upgrade changes how they are parsed, even if the
+    datasets did not change
+
+    Returns:
+      The hexadecimal digest of the models modules.
+    """
+    global _models_hash
+    if _models_hash is None:
+        digest = hashlib.sha256()
+        package_dir = Path(__file__).resolve().parent.parent
+        for path in sorted(package_dir.glob("**/models.py")):
+            digest.update(path.relative_to(package_dir).as_posix().encode())
+            digest.update(path.read_bytes())
+        _models_hash = digest.hexdigest()
+
+    return _models_hash
+
+
+def get_snapshot_path(isocode: ISOCodes, directory: Optional[Path] = None) -> Path:
+    """
+    It returns the path where the snapshot for the current version of a dataset is stored
+
+    Args:
+      isocode (ISOCodes): The ISO code of the dataset.
+      directory (Optional[Path]): The directory of the snapshots. Defaults to the pycountrycodes cache directory.
+
+    Returns:
+      The path of the snapshot file.
+    """
+    if directory is None:
+        directory = get_cache_dir()
+
+    return Path(directory) / f"{ISOCodes(isocode).value}-{_get_snapshot_key(isocode)[:16]}.snapshot"
+
+
+def write_snapshot(
+    isocode: ISOCodes, fields: Sequence[str], rows: List[Tuple[Any, ...]], directory: Optional[Path] = None
+) -> Path:
+    """
+    It writes the field values of a dataset to its snapshot file, replacing it atomically
+
+    Args:
+      isocode (ISOCodes): The ISO code of the dataset.
+      fields (Sequence[str]): The names of the fields, in the same order of the values in each row.
+      rows (List[Tuple[Any, ...]]): The field values of each object.
+      directory (Optional[Path]): The directory of the snapshots. Defaults to the pycountrycodes cache directory.
+
+    Returns:
+      The path of the written snapshot.
+    """
+    path = get_snapshot_path(isocode, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    content = marshal.dumps({"key": _get_snapshot_key(isocode), "fields": tuple(fields), "rows": rows})
+
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(content)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+    return path
+
+
+def read_snapshot(
+    isocode: ISOCodes, fields: Sequence[str], directory: Optional[Path] = None
+) -> Optional[List[Tuple[Any, ...]]]:
+    """
+    It reads the field values of a dataset from its snapshot file
+
+    Args:
+      isocode (ISOCodes): The ISO code of the dataset.
+      fields (Sequence[str]): The names of the fields expected in each row.
+      directory (Optional[Path]): The directory of the snapshots. Defaults to the pycountrycodes cache directory.
+
+    Returns:
+      The field values of each object, or None if there is no valid snapshot for the current dataset.
+    """
+    try:
+        content = marshal.loads(get_snapshot_path(isocode, directory).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(content, dict):
+        return None
+
+    if content.get("key") != _get_snapshot_key(isocode) or content.get("fields") != tuple(fields):
+        return None
+
+    return content["rows"]
+
+
+def build_snapshot(database: "Database", directory: Optional[Path] = None) -> Path:
+    """
+    It writes the snapshot of an already loaded database, holding the parsed and validated field values of each one of
+    its objects, so the next processes can load it without parsing and validating the JSON dataset again
+
+    Args:
+      database (Database): The database to take the snapshot from.
+      directory (Optional[Path]): The directory of the snapshots. Defaults to the pycountrycodes cache directory.
+
+    Returns:
+      The path of the written snapshot.
+
+    Examples:
+        Build the snapshot of the subdivisions database at deploy time:
+
+        >>> from pycountrycodes import subdivisions
+        >>> build_snapshot(subdivisions)
+    """
+    fields = tuple(database.dataclass.__fields__)
+    rows = [tuple(getattr(obj, field) for field in fields) for obj in database]
+    return write_snapshot(database.isocode, fields, rows, directory)
+
+
+def verify_snapshot(database: "Database", directory: Optional[Path] = None) -> bool:
+    """
+    It checks if there is a snapshot for the current version of a database dataset and if it holds the same objects
+    that are currently loaded
+
+    Args:
+      database (Database): The database to verify the snapshot of.
+      directory (Optional[Path]): The directory of the snapshots. Defaults to the pycountrycodes cache directory.
+
+    Returns:
+      True if the snapshot is valid, False otherwise.
+    """
+    fields = tuple(database.dataclass.__fields__)
+    rows = read_snapshot(database.isocode, fields, directory)
+    if rows is None:
+        return False
+
+    return rows == [tuple(getattr(obj, field) for field in fields) for obj in database]
+
+
+def _get_snapshot_key(isocode: ISOCodes) -> str:
+    """
+    It returns the key that identifies a snapshot made from the current dataset, models code, snapshot format and
+    Python version
+
+    Args:
+      isocode (ISOCodes): The ISO code of the dataset.
+
+    Returns:
+      The key of the snapshot.
+    """
+    key = (
+        f"{get_dataset_hash(isocode)}:{get_models_hash()}:{SNAPSHOT_FORMAT_VERSION}:"
+        f"{sys.version_info[0]}.{sys.version_info[1]}"
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
@@ -1,14 +1,21 @@
 from typing import (
+    TYPE_CHECKING,
     Any,
     List,
     Optional,
+    Tuple,
 )
 
+from pydantic import PrivateAttr
+
 from pycountrycodes.core.models import (
     BaseDataClass,
     Database,
 )
 
+if TYPE_CHECKING:
+    from pycountrycodes.subdivisions_3166_2.models import Subdivision
+
 
 class Country(BaseDataClass):
     name: str
@@ -19,6 +26,21 @@ class Country(BaseDataClass):
     official_name: Optional[str]
     common_name: Optional[str]
 
+    _subdivisions: Optional[Tuple["Subdivision", ...]] = PrivateAttr(default=None)
+
+    @property
+    def subdivisions(self) -> List["Subdivision"]:
+        """
+        The subdivisions of the country, from the `subdivisions` database. They are looked up on the first access only,
+        so loading the countries does not load the subdivisions.
+        """
+        if self._subdivisions is None:
+            from pycountrycodes import subdivisions
+
+            object.__setattr__(self, "_subdivisions", tuple(subdivisions.get(country_code=self.alpha_2, default=[])))
+
+        return list(self._subdivisions)
+
     @staticmethod
     def get_searchable_fields() -> List[str]:
         return ["name", "official_name", "common_name"]
@@ -26,6 +48,7 @@ class Country(BaseDataClass):
 
 class Countries(Database):
     database: List[Country]
+    lookup_fields = ["name", "official_name", "alpha_3", "alpha_2"]
     dataclass = Country
 
     def get(self, **kwargs) -> Optional[Country]:
@@ -63,5 +86,4 @@ class Countries(Database):
             >>> print(country.alpha_2)
             'BR'
         """
-        fields_to_lookup = ["name", "official_name", "alpha_3", "alpha_2"]
-        return super(Countries, self).lookup(value, fields_to_lookup, default)
+        return super(Countries, self).lookup(value, self.lookup_fields, default)
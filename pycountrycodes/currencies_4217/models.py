@@ -22,6 +22,8 @@ class Currency(BaseDataClass):
 
 
 class Currencies(Database):
+    multiple_results_lookup_fields = ["name"]
+    lookup_fields = ["alpha_3"]
     dataclass = Currency
 
     def get(self, **kwargs) -> Optional[Union[List[Currency], Currency]]:
@@ -38,8 +40,7 @@ class Currencies(Database):
             >>> print(currency.name)
             'US Dollar'
         """
-        multiple_results_lookup_fields = ["name"]
-        return super(Currencies, self).get(multiple_results_lookup_fields=multiple_results_lookup_fields, **kwargs)
+        return super(Currencies, self).get(**kwargs)
 
     def lookup(self, value: str, default: Any = None, **kwargs) -> Optional[Currency]:
         """
@@ -60,5 +61,4 @@ class Currencies(Database):
             >>> print(currency.name)
             'US Dollar'
         """
-        fields_to_lookup = ["alpha_3"]
-        return super(Currencies, self).lookup(value, fields_to_lookup, default)
+        return super(Currencies, self).lookup(value, self.lookup_fields, default)
@@ -0,0 +1,361 @@
+"""
+A local JSON over HTTP service for the countries, subdivisions and currencies databases, built only on the standard
+library. Run it with `python -m pycountrycodes serve`.
+
+Endpoints, where KIND is countries, subdivisions or currencies:
+
+  GET  /KIND/get?FIELD=VALUE             The object with the given field value, like /countries/get?alpha_2=BR.
+  GET  /KIND/lookup?value=VALUE          The object found by lookup().
+  GET  /KIND/search?query=QUERY          The search results, with optional limit and match_score_cutoff parameters.
+  POST /KIND/batch                       Many values at once, with a JSON body like
+                                         {"operation": "lookup", "values": ["Brazil", "DE"]}, where the operation is
+                                         get (with a "field"), lookup or search (with optional "limit" and
+                                         "match_score_cutoff"), answered with {"results": [...]} aligned to the values.
+  GET  /stats                            The number of requests and their latency, by endpoint.
+"""
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import (
+    parse_qsl,
+    urlsplit,
+)
+
+import pycountrycodes
+from pycountrycodes.core.models import Database
+from pycountrycodes.core.search import SearchResult
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_SIZE = 16 * 1024 * 1024
+LATENCY_WINDOW_SIZE = 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class LatencyRecorder:
+    """
+    The number of requests of each endpoint, and the latencies of the most recent ones.
+    """
+
+    def __init__(self, window_size: int = LATENCY_WINDOW_SIZE):
+        self.window_size = window_size
+        self.counts: Dict[str, int] = {}
+        self.latencies: Dict[str, Deque[float]] = {}
+
+    def record(self, endpoint: str, seconds: float):
+        self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+        self.latencies.setdefault(endpoint, deque(maxlen=self.window_size)).append(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        It returns the number of requests of each endpoint, and the mean, median, 99th percentile and maximum latency
+        of its most recent requests, in milliseconds
+        """
+        stats = {}
+        for endpoint, latencies in sorted(self.latencies.items()):
+            ordered = sorted(latencies)
+            stats[endpoint] = {
+                "count": self.counts[endpoint],
+                "mean_ms": sum(ordered) / len(ordered) * 1000,
+                "p50_ms": ordered[(len(ordered) - 1) // 2] * 1000,
+                "p99_ms": ordered[math.ceil(len(ordered) * 0.99) - 1] * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+
+        return stats
+
+
+class LookupServer:
+    """
+    It answers the HTTP requests of the service. The databases and their indexes are loaded before the server starts,
+    and fuzzy searches and batches run in a pool of threads so they never block the event loop.
+
+    Args:
+      workers (int): The number of threads used to run searches and batches. Defaults to 4
+      databases (Optional[Dict[str, Database]]): The databases by kind. Defaults to the pycountrycodes databases.
+    """
+
+    def __init__(self, workers: int = 4, databases: Optional[Dict[str, Database]] = None):
+        if databases is None:
+            databases = {kind: getattr(pycountrycodes, kind) for kind in pycountrycodes._DATABASES}
+
+        self.databases = databases
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pycountrycodes-search")
+        self.latency = LatencyRecorder()
+        for database in self.databases.values():
+            # Builds the search corpus now, so the first search does not pay for it.
+            database.search_corpus
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        It reads the requests of one connection, and writes their responses, until the client closes it or asks to
+        close it
+        """
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+
+                method, target, headers, body = request
+                started = time.perf_counter()
+                endpoint = target
+                try:
+                    endpoint, payload = await self.handle_request(method, target, body)
+                    status = 200
+                except HTTPError as error:
+                    status, payload = error.status, {"error": str(error)}
+                except Exception:
+                    logger.exception("Unexpected error handling %s %s", method, target)
+                    status, payload = 500, {"error": "internal server error"}
+
+                elapsed = time.perf_counter() - started
+                self.latency.record(endpoint if status == 200 else f"error {status}", elapsed)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                _write_response(writer, status, payload, elapsed, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HTTPError as error:
+            _write_response(writer, error.status, {"error": str(error)}, 0, keep_alive=False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, method: str, target: str, body: bytes) -> Tuple[str, Any]:
+        """
+        It routes a request to its endpoint
+
+        Args:
+          method (str): The HTTP method.
+          target (str): The path and query string.
+          body (bytes): The request body.
+
+        Returns:
+          A tuple of the name of the endpoint and the JSON payload of the response.
+        """
+        url = urlsplit(target)
+        parameters = dict(parse_qsl(url.query))
+        parts = url.path.strip("/").split("/")
+        if parts == ["stats"]:
+            _check_method(method, "GET")
+            return "stats", self.latency.snapshot()
+
+        if len(parts) != 2 or parts[0] not in self.databases:
+            raise HTTPError(404, f"unknown endpoint {url.path}")
+
+        kind, operation = parts
+        database = self.databases[kind]
+        endpoint = f"{kind}/{operation}"
+        if operation == "get":
+            _check_method(method, "GET")
+            field, value = _get_field_parameter(database, parameters)
+            return endpoint, _serialize(database.get(**{field: value}))
+
+        if operation == "lookup":
+            _check_method(method, "GET")
+            return endpoint, _serialize(database.lookup(_require(parameters, "value")))
+
+        if operation == "search":
+            _check_method(method, "GET")
+            query = _require(parameters, "query")
+            options = _get_search_options(parameters)
+            results = await self._run_in_executor(lambda: database.search(query, **options))
+            return endpoint, _serialize(results)
+
+        if operation == "batch":
+            _check_method(method, "POST")
+            # A batch body can hold millions of values, so it is parsed, resolved and serialized in the pool of threads.
+            return endpoint, {"results": await self._run_in_executor(lambda: self._batch(database, body))}
+
+        raise HTTPError(404, f"unknown endpoint {url.path}")
+
+    def _batch(self, database: Database, body: bytes) -> List[Any]:
+        request = _parse_json(body)
+        values = request.get("values") if isinstance(request, dict) else None
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise HTTPError(400, 'the body must be a JSON object with a "values" list of strings')
+
+        operation = request.get("operation")
+        if operation == "get":
+            field = _require(request, "field")
+            if not isinstance(field, str) or field not in database.dataclass.__fields__:
+                raise HTTPError(400, f'the field must be one of {", ".join(database.dataclass.__fields__)}')
+
+            return _serialize(database.get_many(field, values))
+
+        if operation == "lookup":
+            return _serialize(database.lookup_many(values))
+
+        if operation == "search":
+            options = _get_search_options(request)
+            return _serialize(database.search_many(values, **options))
+
+        raise HTTPError(400, 'the operation must be "get", "lookup" or "search"')
+
+    async def _run_in_executor(self, function: Callable[[], Any]) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8080, workers: int = 4):
+    """
+    It loads the databases and serves them until the process is interrupted
+
+    Args:
+      host (str): The address to listen on. Defaults to 127.0.0.1
+      port (int): The port to listen on. Defaults to 8080
+      workers (int): The number of threads used to run searches and batches. Defaults to 4
+    """
+
+    async def run():
+        server = await lookup_server.start(host, port)
+        logger.info("Serving pycountrycodes on %s", ", ".join(str(s.getsockname()) for s in server.sockets))
+        async with server:
+            await server.serve_forever()
+
+    lookup_server = LookupServer(workers)
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lookup_server.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+
+    try:
+        method, target, _ = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        content_length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(400, "malformed Content-Length header")
+
+    if content_length > MAX_BODY_SIZE:
+        raise HTTPError(413, f"the body must have at most {MAX_BODY_SIZE} bytes")
+
+    body = await reader.readexactly(content_length) if content_length else b""
+    return method.upper(), target, headers, body
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, payload: Any, elapsed: float, keep_alive: bool):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Server-Timing: app;dur={elapsed * 1000:.3f}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+def _check_method(method: str, expected: str):
+    if method != expected:
+        raise HTTPError(405, f"use {expected} for this endpoint")
+
+
+def _require(parameters: Dict[str, Any], name: str) -> Any:
+    if name not in parameters:
+        raise HTTPError(400, f'the "{name}" parameter is required')
+
+    return parameters[name]
+
+
+def _get_field_parameter(database: Database, parameters: Dict[str, str]) -> Tuple[str, str]:
+    """
+    It returns the only parameter of a get request, which must be a field of the objects of the database
+    """
+    fields = database.dataclass.__fields__
+    if len(parameters) != 1 or next(iter(parameters)) not in fields:
+        raise HTTPError(400, f'give exactly one parameter, one of {", ".join(fields)}')
+
+    return next(iter(parameters.items()))
+
+
+def _get_search_options(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    options = {}
+    try:
+        if parameters.get("limit") is not None:
+            options["limit"] = int(parameters["limit"])
+        if parameters.get("match_score_cutoff") is not None:
+            options["match_score_cutoff"] = float(parameters["match_score_cutoff"])
+    except (TypeError, ValueError):
+        raise HTTPError(400, "limit must be an integer and match_score_cutoff a number")
+
+    if options.get("limit", 0) < 0:
+        raise HTTPError(400, "limit must not be negative")
+
+    return options
+
+
+def _parse_json(body: bytes) -> Any:
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise HTTPError(400, "the body must be valid JSON")
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_serialize(item) for item in value]
+
+    if isinstance(value, SearchResult):
+        return {"record": value.record.dict(), "match_score": value.match_score}
+
+    if hasattr(value, "dict"):
+        return value.dict()
+
+    return value
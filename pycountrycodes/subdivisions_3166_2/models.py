@@ -1,11 +1,20 @@
 from typing import (
     Any,
+    Dict,
     List,
     Optional,
+    Sequence,
+    Tuple,
     Union,
 )
 
-from pycountrycodes.core import models
+from pydantic import PrivateAttr
+
+from pycountrycodes.core import (
+    indexes,
+    models,
+    segments,
+)
 from pycountrycodes.countries_3166_1.models import Country
 
 
@@ -16,19 +25,94 @@ class Subdivision(models.BaseDataClass):
     country_code: str
     parent_code: Optional[str]
 
+    _country: Optional[Country] = PrivateAttr(default=None)
+    _parent: Optional["Subdivision"] = PrivateAttr(default=None)
+    _children: Optional[Tuple["Subdivision", ...]] = PrivateAttr(default=None)
+
     @property
     def country(self) -> Optional[Country]:
-        from pycountrycodes import countries
+        """
+        The country of the subdivision, from the `countries` database. It is looked up on the first access only, so
+        loading the subdivisions does not load the countries.
+        """
+        if self._country is None:
+            from pycountrycodes import countries
 
-        return countries.get(alpha_2=self.country_code)
+            object.__setattr__(self, "_country", countries.get(alpha_2=self.country_code))
+
+        return self._country
 
     @property
     def parent(self) -> Optional["Subdivision"]:
         if self.parent_code is None:
             return None
+
+        linked = self._get_linked()
+        if linked is None:
+            from pycountrycodes import subdivisions
+
+            return subdivisions.get(code=self.parent_code)
+
+        return linked._parent
+
+    @property
+    def children(self) -> List["Subdivision"]:
+        """
+        The subdivisions whose parent is this subdivision.
+        """
+        return list(self._get_children())
+
+    def ancestors(self) -> List["Subdivision"]:
+        """
+        It returns the parent of the subdivision, the parent of its parent, and so on
+
+        Returns:
+          A list of Subdivision objects, from the parent to the top-level subdivision.
+        """
+        ancestors = []
+        parent = self.parent
+        while parent is not None:
+            ancestors.append(parent)
+            parent = parent.parent
+
+        return ancestors
+
+    def descendants(self) -> List["Subdivision"]:
+        """
+        It returns the children of the subdivision, the children of its children, and so on
+
+        Returns:
+          A list of Subdivision objects, each one followed by its own descendants.
+        """
+        descendants = []
+        stack = list(reversed(self._get_children()))
+        while stack:
+            subdivision = stack.pop()
+            descendants.append(subdivision)
+            stack.extend(reversed(subdivision._get_children()))
+
+        return descendants
+
+    def _get_children(self) -> Sequence["Subdivision"]:
+        linked = self._get_linked()
+        return linked._children if linked is not None else ()
+
+    def _get_linked(self) -> Optional["Subdivision"]:
+        """
+        It returns this subdivision when its parent and children were linked by the database it was loaded from, or
+        else the same subdivision from the `subdivisions` database, like for subdivisions created or unpickled by hand,
+        or None when that database does not have it. Subdivisions of shared databases are linked on their first use
+        """
+        if self._children is not None:
+            return self
+
+        if isinstance(self, segments.RecordView):
+            self._link()
+            return self
+
         from pycountrycodes import subdivisions
 
-        return subdivisions.get(code=self.parent_code)
+        return subdivisions.get(code=self.code)
 
     @staticmethod
     def get_searchable_fields() -> List[str]:
@@ -36,6 +120,13 @@ class Subdivision(models.BaseDataClass):
 
 
 class Subdivisions(models.Database):
+    multiple_results_lookup_fields = ["name", "type", "country_code"]
+    lookup_fields = ["code"]
+    interned_fields = ["type", "country_code", "parent_code"]
+    memory_usage_attributes = {
+        **models.Database.memory_usage_attributes,
+        "indexes": models.Database.memory_usage_attributes["indexes"] + ["_top_level"],
+    }
     dataclass = Subdivision
 
     def get(self, **kwargs) -> Optional[Union[List[Subdivision], Subdivision]]:
@@ -58,12 +149,9 @@ class Subdivisions(models.Database):
             >>> len(all_subdivisions)
             57
         """
-        multiple_results_lookup_fields = ["name", "type", "country_code"]
-        return super(Subdivisions, self).get(multiple_results_lookup_fields=multiple_results_lookup_fields, **kwargs)
-
-    def _populate_database(self) -> List[Subdivision]:
-        data = self._load_data_from_file()
+        return super(Subdivisions, self).get(**kwargs)
 
+    def _parse_item(self, item: dict) -> dict:
         def _get_country_code(code: str) -> str:
             return code.split("-")[0]
 
@@ -73,16 +161,113 @@ class Subdivisions(models.Database):
 
             return f"{_get_country_code(code)}-{parent}"
 
-        return [
-            self.dataclass(
-                name=item["name"],
-                code=item["code"],
-                type=item["type"],
-                country_code=_get_country_code(item["code"]),
-                parent_code=_get_parent_code(parent=item.get("parent"), code=item["code"]),
-            )
-            for item in data
-        ]
+        return dict(
+            name=item["name"],
+            code=item["code"],
+            type=item["type"],
+            country_code=_get_country_code(item["code"]),
+            parent_code=_get_parent_code(parent=item.get("parent"), code=item["code"]),
+        )
+
+    def top_level(self, country_code: str) -> List[Subdivision]:
+        """
+        It returns the subdivisions of a country that have no parent
+
+        Args:
+          country_code (str): The alpha_2 code of the country.
+
+        Returns:
+          A list of Subdivision objects.
+
+        Examples:
+            Get the regions of France, without their departments:
+
+            >>> [subdivision.code for subdivision in subdivisions.top_level('FR')][:3]
+            ['FR-20R', 'FR-ARA', 'FR-BFC']
+        """
+        return list(self._top_level.get(indexes.normalize_key(country_code.strip()), ()))
+
+    def _link_objects(self):
+        """
+        It links each subdivision to its parent and children, and groups the top-level subdivisions by country, so
+        walking the hierarchy never looks subdivisions up. Shared databases read the top-level subdivisions and the
+        children from their segment instead, and link each subdivision on its first use
+        """
+        if isinstance(self.database, segments.SharedRecords):
+            self._top_level = segments.SharedIndex(self.database, "top_level", unique=False)
+            self._children_index = segments.SharedIndex(self.database, "children", unique=False)
+            self.database.link = self._link_view
+            return
+
+        children: Dict[str, List[Subdivision]] = {}
+        top_level: Dict[str, List[Subdivision]] = {}
+        by_code = {subdivision.code: subdivision for subdivision in self.database}
+        set_parent = vars(self.record_class)["_parent"].__set__
+        for subdivision in self.database:
+            parent_code = subdivision.parent_code
+            if parent_code is None:
+                top_level.setdefault(subdivision.country_code, []).append(subdivision)
+            else:
+                children.setdefault(parent_code, []).append(subdivision)
+                set_parent(subdivision, by_code.get(parent_code))
+
+        set_children = vars(self.record_class)["_children"].__set__
+        for subdivision in self.database:
+            set_children(subdivision, tuple(children.get(subdivision.code, ())))
+
+        self._top_level = {
+            indexes.normalize_key(country_code): tuple(objects) for country_code, objects in top_level.items()
+        }
+
+    def warm(self):
+        """
+        It builds everything the database otherwise builds on first use, and looks up the country of every
+        subdivision, which also loads the `countries` database
+        """
+        super().warm()
+        for subdivision in self.database:
+            subdivision._get_linked()
+            subdivision.country
+
+    def _link_view(self, subdivision: Subdivision):
+        """
+        It links a subdivision of a shared database to its parent and children
+        """
+        parent_code = subdivision.parent_code
+        parent = self._indexes["code"].get(indexes.normalize_key(parent_code)) if parent_code is not None else None
+        object.__setattr__(subdivision, "_parent", parent)
+        object.__setattr__(
+            subdivision, "_children", self._children_index.get(indexes.normalize_key(subdivision.code), ())
+        )
+
+    def _get_shared_indexes(self) -> Dict[str, Dict[str, Tuple[Subdivision, ...]]]:
+        children = {
+            indexes.normalize_key(subdivision.code): subdivision._children
+            for subdivision in self.database
+            if subdivision._children
+        }
+        return {"top_level": self._top_level, "children": children}
+
+    def autocomplete(self, prefix: str, *, limit: int = 10, country_code: Optional[str] = None) -> List[Subdivision]:
+        """
+        It takes a prefix, and returns the subdivisions with a name, or a word of a name, that starts with it,
+        optionally only from one country. Accents and case are ignored
+
+        Args:
+          prefix (str): The prefix typed so far.
+          limit (int): The maximum number of subdivisions to return. Defaults to 10
+          country_code (Optional[str]): The alpha_2 code of the country of the subdivisions.
+
+        Returns:
+          A list of Subdivision objects, the ones where the whole name starts with the prefix first.
+
+        Examples:
+            Autocomplete the subdivisions of the United States starting with 'new':
+
+            >>> [subdivision.code for subdivision in subdivisions.autocomplete('new', country_code='US')]
+            ['US-NH', 'US-NJ', 'US-NM', 'US-NY']
+        """
+        return self._autocomplete(prefix, limit, "country_code", country_code)
 
     def lookup(self, value: str, default: Any = None, **kwargs) -> Optional[Subdivision]:
         """
@@ -103,5 +288,4 @@ class Subdivisions(models.Database):
             >>> print(subdivision.name)
             'New York'
         """
-        fields_to_lookup = ["code"]
-        return super(Subdivisions, self).lookup(value, fields_to_lookup, default)
+        return super(Subdivisions, self).lookup(value, self.lookup_fields, default)
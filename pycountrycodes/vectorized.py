@@ -0,0 +1,215 @@
+"""
+Helpers to normalize whole columns of country, subdivision and currency values at once. They need numpy, and return
+pandas Series when they are given pandas Series. Both are imported only when the helpers are called.
+"""
+from typing import (
+    Any,
+    List,
+    Optional,
+    Tuple,
+)
+
+import pycountrycodes
+from pycountrycodes.core.models import Database
+
+
+def normalize_countries(
+    values: Any,
+    to: str = "alpha_2",
+    *,
+    fuzzy: bool = True,
+    match_score_cutoff: float = 80,
+    workers: int = 1,
+    database: Optional[Database] = None,
+) -> Any:
+    """
+    It takes an array or a pandas Series of country names and codes, and returns the value of the `to` field of the
+    country each one of them refers to
+
+    Args:
+      values (Any): A numpy array, a pandas Series or any other sequence of values.
+      to (str): The field of the countries to return. Defaults to "alpha_2"
+      fuzzy (bool): Whether the values not found by `lookup()` should be resolved by their best search result.
+      match_score_cutoff (float): The minimum score of the best search result of a value. Defaults to 80
+      workers (int): The number of threads used to search the values when numpy is installed. -1 uses all cores.
+      database (Optional[Database]): The countries database to use. Defaults to `pycountrycodes.countries`
+
+    Returns:
+      A numpy array of objects, or a pandas Series with the same index when a Series is given, with None for the
+      values that are not found.
+
+    Examples:
+        Normalize a column of country names:
+
+        >>> normalize_countries(pandas.Series(['Brazil', 'Untied States', 'USA', None]))
+        0      BR
+        1      US
+        2      US
+        3    None
+        dtype: object
+    """
+    if database is None:
+        database = pycountrycodes.countries
+
+    return _normalize(database, values, to, fuzzy, match_score_cutoff, workers)
+
+
+def normalize_subdivisions(
+    values: Any,
+    to: str = "code",
+    *,
+    fuzzy: bool = True,
+    match_score_cutoff: float = 80,
+    workers: int = 1,
+    database: Optional[Database] = None,
+) -> Any:
+    """
+    It takes an array or a pandas Series of subdivision codes and names, and returns the value of the `to` field of
+    the subdivision each one of them refers to
+
+    Args:
+      values (Any): A numpy array, a pandas Series or any other sequence of values.
+      to (str): The field of the subdivisions to return. Defaults to "code"
+      fuzzy (bool): Whether the values not found by `lookup()` should be resolved by their best search result.
+      match_score_cutoff (float): The minimum score of the best search result of a value. Defaults to 80
+      workers (int): The number of threads used to search the values when numpy is installed. -1 uses all cores.
+      database (Optional[Database]): The subdivisions database to use. Defaults to `pycountrycodes.subdivisions`
+
+    Returns:
+      A numpy array of objects, or a pandas Series with the same index when a Series is given, with None for the
+      values that are not found.
+    """
+    if database is None:
+        database = pycountrycodes.subdivisions
+
+    return _normalize(database, values, to, fuzzy, match_score_cutoff, workers)
+
+
+def normalize_currencies(
+    values: Any,
+    to: str = "alpha_3",
+    *,
+    fuzzy: bool = True,
+    match_score_cutoff: float = 80,
+    workers: int = 1,
+    database: Optional[Database] = None,
+) -> Any:
+    """
+    It takes an array or a pandas Series of currency codes and names, and returns the value of the `to` field of the
+    currency each one of them refers to
+
+    Args:
+      values (Any): A numpy array, a pandas Series or any other sequence of values.
+      to (str): The field of the currencies to return. Defaults to "alpha_3"
+      fuzzy (bool): Whether the values not found by `lookup()` should be resolved by their best search result.
+      match_score_cutoff (float): The minimum score of the best search result of a value. Defaults to 80
+      workers (int): The number of threads used to search the values when numpy is installed. -1 uses all cores.
+      database (Optional[Database]): The currencies database to use. Defaults to `pycountrycodes.currencies`
+
+    Returns:
+      A numpy array of objects, or a pandas Series with the same index when a Series is given, with None for the
+      values that are not found.
+    """
+    if database is None:
+        database = pycountrycodes.currencies
+
+    return _normalize(database, values, to, fuzzy, match_score_cutoff, workers)
+
+
+def _normalize(database: Database, values: Any, to: str, fuzzy: bool, match_score_cutoff: float, workers: int) -> Any:
+    """
+    It factorizes the values into their distinct strings, resolves each distinct string once with `resolve_many()`,
+    and broadcasts the results back to the values
+
+    Returns:
+      A numpy array of objects, or a pandas Series with the same index when a Series is given.
+    """
+    if to not in database.dataclass.__fields__:
+        raise AttributeError(f'{database.dataclass.__name__} has only {", ".join(database.dataclass.__fields__)}.')
+
+    numpy = _import_numpy()
+    series_class = _get_series_class(values)
+    codes, uniques = _factorize(values)
+
+    records = database.resolve_many(uniques, fuzzy=fuzzy, match_score_cutoff=match_score_cutoff, workers=workers)
+
+    resolved = numpy.empty(len(uniques) + 1, dtype=object)
+    resolved[:-1] = [getattr(record, to) if record is not None else None for record in records]
+    normalized = resolved[codes]
+
+    if series_class is not None:
+        return series_class(normalized, index=values.index, name=values.name, dtype=object)
+
+    return normalized
+
+
+def _factorize(values: Any) -> Tuple[Any, List[str]]:
+    """
+    It takes the values, and returns the position of the distinct string of each value, and the distinct strings.
+    Values that are not strings, like None and NaN, get the position -1. The values are factorized by the hash table of
+    `pandas.factorize()`, or by `numpy.unique()` when pandas is not installed, so they are not hashed one by one by the
+    interpreter
+
+    Returns:
+      A tuple of a numpy array of the positions and a list of the distinct strings.
+    """
+    numpy = _import_numpy()
+    pandas = _import_pandas()
+    if pandas is None:
+        return _factorize_with_numpy(numpy, values)
+
+    if not isinstance(values, (pandas.Series, numpy.ndarray)):
+        values = numpy.asarray(values, dtype=object)
+
+    codes, uniques = pandas.factorize(values)
+    is_string = numpy.array([isinstance(unique, str) for unique in uniques], dtype=bool)
+    positions = numpy.full(len(uniques) + 1, -1, dtype=numpy.intp)
+    positions[:-1][is_string] = numpy.arange(numpy.count_nonzero(is_string))
+    return positions[codes], [unique for unique, string in zip(uniques, is_string) if string]
+
+
+def _factorize_with_numpy(numpy: Any, values: Any) -> Tuple[Any, List[str]]:
+    """
+    It factorizes the values like `_factorize()`, sorting the strings with `numpy.unique()`
+    """
+    if isinstance(values, numpy.ndarray) and values.dtype.kind == "U":
+        array = values
+        is_string = numpy.ones(len(array), dtype=bool)
+    else:
+        array = numpy.asarray(values, dtype=object)
+        is_string = numpy.fromiter((isinstance(value, str) for value in array), dtype=bool, count=len(array))
+
+    codes = numpy.full(len(array), -1, dtype=numpy.intp)
+    uniques, inverse = numpy.unique(array[is_string], return_inverse=True)
+    codes[is_string] = inverse.reshape(-1)
+    return codes, uniques.tolist()
+
+
+def _get_series_class(values: Any) -> Optional[type]:
+    """
+    It returns the pandas Series class when the values are a pandas Series, without importing pandas otherwise
+    """
+    if type(values).__module__.split(".")[0] != "pandas":
+        return None
+
+    import pandas
+
+    return pandas.Series if isinstance(values, pandas.Series) else None
+
+
+def _import_pandas():
+    try:
+        import pandas
+    except ImportError:
+        return None
+
+    return pandas
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as error:  # pragma: no cover
+        raise ImportError("pycountrycodes.vectorized needs numpy, install it with `pip install numpy`") from error
+
+    return numpy
@@ -0,0 +1,17 @@
+import os
+import shutil
+import tempfile
+
+
+def pytest_configure(config):
+    """
+    It points the cache directory of pycountrycodes to a temporary directory before the test modules are collected,
+    since some of them load the databases when they are imported, so the snapshots, segments and persistent caches
+    written by the tests never reach the cache of the user nor leak between runs
+    """
+    config.pycountrycodes_cache_dir = tempfile.mkdtemp(prefix="pycountrycodes-tests-")
+    os.environ["PYCOUNTRYCODES_CACHE_DIR"] = config.pycountrycodes_cache_dir
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(config.pycountrycodes_cache_dir, ignore_errors=True)
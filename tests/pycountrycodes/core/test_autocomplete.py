@@ -0,0 +1,73 @@
+import pytest
+
+from pycountrycodes.core.autocomplete import PrefixIndex
+from pycountrycodes.core.models import ISOCodes
+from pycountrycodes.countries_3166_1.models import Countries
+from pycountrycodes.currencies_4217.models import Currencies
+from pycountrycodes.subdivisions_3166_2.models import Subdivisions
+
+
+@pytest.fixture(scope="module")
+def subdivisions():
+    return Subdivisions(ISOCodes.i3166_2)
+
+
+class TestPrefixIndex:
+    index = PrefixIndex([["new york", "york", "oxford", None], [None, None, "university of oxford", "yorba"]])
+
+    def test_search_returns_whole_values_first_in_field_order(self):
+        assert self.index.search("yor", 10) == [1, 3, 0]
+        assert self.index.search("ox", 10) == [2]
+
+    def test_search_respects_limit(self):
+        assert self.index.search("yor", 2) == [1, 3]
+
+    def test_search_without_matches(self):
+        assert self.index.search("paris", 10) == []
+
+    def test_restrict_keeps_only_the_given_positions(self):
+        assert self.index.restrict({0, 3}).search("yor", 10) == [3, 0]
+
+
+class TestAutocomplete:
+    def test_autocomplete_countries(self):
+        countries = Countries(ISOCodes.i3166_1)
+        assert [country.alpha_2 for country in countries.autocomplete("united", limit=3)] == ["AE", "GB", "US"]
+        assert [country.alpha_2 for country in countries.autocomplete(" REU")] == ["RE"]
+
+    def test_autocomplete_subdivisions_of_a_country(self, subdivisions):
+        assert [subdivision.code for subdivision in subdivisions.autocomplete("new", country_code="us")] == [
+            "US-NH",
+            "US-NJ",
+            "US-NM",
+            "US-NY",
+        ]
+        assert subdivisions.autocomplete("new", country_code="ZZ") == []
+
+    def test_autocomplete_only_keeps_indexes_of_existing_scopes(self):
+        subdivisions = Subdivisions(ISOCodes.i3166_2)
+        subdivisions.autocomplete("new", country_code=" us")
+        for country_code in ["ZZ", "XX", "not a code"]:
+            assert subdivisions.autocomplete("new", country_code=country_code) == []
+
+        assert [scope for scope in subdivisions._prefix_indexes if scope is not None] == [("country_code", "us")]
+
+    def test_autocomplete_subdivisions_of_a_country_of_a_shared_database(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PYCOUNTRYCODES_CACHE_DIR", str(tmp_path))
+        Subdivisions(ISOCodes.i3166_2, shared=True)
+        shared_subdivisions = Subdivisions(ISOCodes.i3166_2, shared=True)
+        assert [subdivision.code for subdivision in shared_subdivisions.autocomplete("new", country_code="us")] == [
+            "US-NH",
+            "US-NJ",
+            "US-NM",
+            "US-NY",
+        ]
+
+    def test_autocomplete_subdivisions_ignores_accents(self, subdivisions):
+        assert "São Paulo" in [subdivision.name for subdivision in subdivisions.autocomplete("sao p", limit=50)]
+
+    def test_autocomplete_raises_when_no_searchable_fields(self, mocker):
+        currencies = Currencies(ISOCodes.i4217)
+        mocker.patch.object(currencies.dataclass, "get_searchable_fields", return_value=[])
+        with pytest.raises(AttributeError):
+            currencies.autocomplete("dol")
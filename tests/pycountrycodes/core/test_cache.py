@@ -0,0 +1,186 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pycountrycodes.core.cache import (
+    CacheInfo,
+    LRUCache,
+    PersistentCache,
+)
+from pycountrycodes.core.models import ISOCodes
+from pycountrycodes.countries_3166_1.models import Countries
+
+
+class TestLRUCache:
+    def test_get_counts_hits_and_misses(self):
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("b", "default") == "default"
+        assert cache.info() == CacheInfo(hits=1, misses=1, evictions=0, maxsize=2, currsize=1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.info().evictions == 1
+        assert len(cache) == 2
+
+    def test_clear_removes_entries_and_statistics(self):
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.clear()
+        assert cache.info() == CacheInfo(hits=0, misses=0, evictions=0, maxsize=2, currsize=0)
+
+    def test_cache_with_no_size_keeps_nothing(self):
+        cache = LRUCache(0)
+        cache.set("a", 1)
+        assert len(cache) == 0
+
+
+class TestSearchCache:
+    @pytest.fixture
+    def countries(self):
+        return Countries(ISOCodes.i3166_1, search_cache_size=2)
+
+    def test_search_cache_is_disabled_by_default(self):
+        countries = Countries(ISOCodes.i3166_1)
+        countries.search("United")
+        assert countries.cache_info() == CacheInfo(hits=0, misses=0, evictions=0, maxsize=0, currsize=0)
+
+    def test_repeated_searches_are_served_from_the_cache(self, countries):
+        results = countries.search("United")
+        assert countries.search("  UNITED ") == results
+        assert countries.search("United", limit=1) == results[:1]
+        assert countries.cache_info() == CacheInfo(hits=1, misses=2, evictions=0, maxsize=2, currsize=2)
+
+    def test_search_cache_returns_new_lists(self, countries):
+        results = countries.search("United")
+        results.clear()
+        assert countries.search("United") != []
+
+    def test_search_cache_clear(self, countries):
+        countries.search("United")
+        countries.cache_clear()
+        assert countries.cache_info().currsize == 0
+
+    def test_search_cache_is_safe_under_concurrent_threads(self, countries):
+        queries = ["United", "Kingdom", "Brazil", "Germany"] * 25
+        expected = {query: Countries(ISOCodes.i3166_1).search(query) for query in set(queries)}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(countries.search, queries))
+
+        assert all(result == expected[query] for query, result in zip(queries, results))
+        info = countries.cache_info()
+        assert info.hits + info.misses == len(queries)
+        assert info.currsize == 2
+
+
+class TestPersistentCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return PersistentCache(tmp_path / "cache.sqlite3", 100)
+
+    def test_values_are_read_back(self, cache):
+        cache.set_many("kind", "v1", {"a": [[1, 90.0]], "b": []})
+        assert cache.get_many("kind", "v1", ["a", "b", "c"]) == {"a": [[1, 90.0]], "b": []}
+        assert cache.info() == CacheInfo(hits=2, misses=1, evictions=0, maxsize=100, currsize=2)
+
+    def test_values_are_shared_by_caches_of_the_same_file(self, cache):
+        cache.set_many("kind", "v1", {"a": 1})
+        assert PersistentCache(cache.path, 100).get_many("kind", "v1", ["a"]) == {"a": 1}
+
+    def test_values_of_other_versions_are_not_returned(self, cache):
+        cache.set_many("kind", "v1", {"a": 1})
+        cache.set_many("other", "v1", {"a": 2})
+        assert cache.get_many("kind", "v2", ["a"]) == {}
+        cache.discard_stale("kind", "v2")
+        assert len(cache) == 1
+        assert cache.get_many("other", "v1", ["a"]) == {"a": 2}
+
+    def test_least_recently_used_entries_are_evicted(self, cache):
+        for index in range(150):
+            cache.set_many("kind", "v1", {str(index): index})
+
+        assert len(cache) <= 101
+        assert cache.info().evictions >= 49
+        assert cache.get_many("kind", "v1", ["149"]) == {"149": 149}
+        assert cache.get_many("kind", "v1", ["0"]) == {}
+
+    def test_hits_only_refresh_entries_not_used_recently(self, cache, monkeypatch):
+        cache.set_many("kind", "v1", {"a": 1})
+        used_at = cache._connect().execute("SELECT used_at FROM entries").fetchone()[0]
+        cache.get_many("kind", "v1", ["a"])
+        assert cache._connect().execute("SELECT used_at FROM entries").fetchone()[0] == used_at
+        monkeypatch.setattr("pycountrycodes.core.cache.PERSISTENT_CACHE_REFRESH_INTERVAL", -1)
+        cache.get_many("kind", "v1", ["a"])
+        assert cache._connect().execute("SELECT used_at FROM entries").fetchone()[0] > used_at
+
+    def test_unusable_file_is_ignored(self, tmp_path):
+        file = tmp_path / "file"
+        file.write_text("")
+        cache = PersistentCache(file / "cache.sqlite3", 100)
+        cache.set_many("kind", "v1", {"a": 1})
+        assert cache.get_many("kind", "v1", ["a"]) == {}
+        with pytest.raises(OSError):
+            cache.discard_stale("kind", "v1")
+
+    def test_clear_removes_entries_and_statistics(self, cache):
+        cache.set_many("kind", "v1", {"a": 1})
+        cache.get_many("kind", "v1", ["a"])
+        cache.clear()
+        assert cache.info() == CacheInfo(hits=0, misses=0, evictions=0, maxsize=100, currsize=0)
+
+
+class TestDatabasePersistentCache:
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PYCOUNTRYCODES_CACHE_DIR", str(tmp_path))
+        return tmp_path
+
+    def test_persistent_cache_is_disabled_by_default(self, cache_dir):
+        countries = Countries(ISOCodes.i3166_1)
+        countries.search("United")
+        assert countries.persistent_cache is None
+        assert not (cache_dir / "resolutions.sqlite3").exists()
+
+    def test_persistent_cache_is_disabled_when_the_cache_directory_is_unusable(self, cache_dir, monkeypatch):
+        file = cache_dir / "file"
+        file.write_text("")
+        monkeypatch.setenv("PYCOUNTRYCODES_CACHE_DIR", str(file))
+        countries = Countries(ISOCodes.i3166_1, persistent_cache_size=10)
+        assert countries.persistent_cache is None
+        assert countries.search("Brazil")[0].alpha_2 == "BR"
+
+    def test_search_results_are_reused_by_other_databases(self):
+        expected = Countries(ISOCodes.i3166_1).search("Untied States", limit=3)
+        assert Countries(ISOCodes.i3166_1, persistent_cache_size=10).search("Untied States", limit=3) == expected
+        countries = Countries(ISOCodes.i3166_1, persistent_cache_size=10)
+        assert countries.search("Untied States", limit=3) == expected
+        assert countries.persistent_cache.info().hits == 1
+
+    def test_search_many_only_scores_the_queries_not_cached(self, monkeypatch):
+        queries = ["Brazil", "Germny", "Narnia"]
+        expected = Countries(ISOCodes.i3166_1).search_many(queries, match_score_cutoff=80)
+        Countries(ISOCodes.i3166_1, persistent_cache_size=10).search_many(queries[:2], match_score_cutoff=80)
+        countries = Countries(ISOCodes.i3166_1, persistent_cache_size=10)
+        scored = []
+        score_many = countries.search_corpus.score_many
+        monkeypatch.setattr(
+            countries.search_corpus,
+            "score_many",
+            lambda queries, *args: scored.extend(queries) or score_many(queries, *args),
+        )
+        assert countries.search_many(queries, match_score_cutoff=80) == expected
+        assert scored == ["narnia"]
+
+    def test_entries_of_other_datasets_are_discarded(self, monkeypatch):
+        Countries(ISOCodes.i3166_1, persistent_cache_size=10).search("United")
+        monkeypatch.setattr("pycountrycodes.core.snapshot.get_dataset_hash", lambda isocode: "changed")
+        countries = Countries(ISOCodes.i3166_1, persistent_cache_size=10)
+        assert len(countries.persistent_cache) == 0
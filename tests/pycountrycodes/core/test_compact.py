@@ -0,0 +1,79 @@
+import pickle
+
+import pytest
+
+from pycountrycodes.core.compact import (
+    CompactRecord,
+    get_compact_class,
+)
+from pycountrycodes.core.models import ISOCodes
+from pycountrycodes.countries_3166_1.models import Country
+from pycountrycodes.subdivisions_3166_2.models import (
+    Subdivision,
+    Subdivisions,
+)
+
+
+@pytest.fixture(scope="module")
+def subdivisions():
+    return Subdivisions(ISOCodes.i3166_2, compact=True)
+
+
+class TestCompactRecord:
+    def test_compact_class_is_created_only_once(self):
+        assert get_compact_class(Country) is get_compact_class(Country)
+        assert issubclass(get_compact_class(Country), CompactRecord)
+
+    def test_compact_record_has_the_same_fields_and_methods_of_the_dataclass(self):
+        compact_country = get_compact_class(Country)(
+            name="Brazil", alpha_2="BR", alpha_3="BRA", flag="🇧🇷", numeric="076"
+        )
+        assert compact_country.alpha_3 == "BRA"
+        assert compact_country.official_name is None
+        assert compact_country.get_searchable_fields() == Country.get_searchable_fields()
+        assert compact_country == Country(name="Brazil", alpha_2="BR", alpha_3="BRA", flag="🇧🇷", numeric="076")
+        assert repr(compact_country).startswith("Country(name='Brazil', alpha_2='BR'")
+
+    def test_compact_record_and_pydantic_record_compare_equal_both_ways(self):
+        compact_country = get_compact_class(Country)(name="Brazil", alpha_2="BR", alpha_3="BRA", flag="", numeric="076")
+        country = Country(name="Brazil", alpha_2="BR", alpha_3="BRA", flag="", numeric="076")
+        other_country = Country(name="Chile", alpha_2="CL", alpha_3="CHL", flag="", numeric="152")
+        assert compact_country == country
+        assert country == compact_country
+        assert not compact_country != country
+        assert not country != compact_country
+        assert other_country != compact_country
+        assert compact_country != other_country
+        assert country != get_compact_class(Subdivision)(
+            name="Brazil", code="BR", type="", country_code="BR", parent_code=None
+        )
+
+    def test_compact_record_is_slotted_and_immutable(self):
+        compact_country = get_compact_class(Country)(name="Brazil", alpha_2="BR", alpha_3="BRA", flag="", numeric="076")
+        assert not hasattr(compact_country, "__dict__")
+        with pytest.raises(AttributeError):
+            compact_country.name = "Brasil"
+        with pytest.raises(AttributeError):
+            del compact_country.name
+
+    def test_compact_record_is_hashable_and_picklable(self, subdivisions):
+        subdivision = subdivisions.get(code="US-NY")
+        assert {subdivision, subdivisions.get(code="US-NY")} == {subdivision}
+        assert pickle.loads(pickle.dumps(subdivision)) == subdivision
+
+
+class TestCompactDatabase:
+    def test_database_holds_compact_records(self, subdivisions):
+        assert subdivisions.record_class is get_compact_class(Subdivision)
+        assert all(isinstance(subdivision, subdivisions.record_class) for subdivision in subdivisions)
+
+    def test_compact_database_holds_the_same_data(self, subdivisions):
+        assert subdivisions.database == Subdivisions(ISOCodes.i3166_2, compact=False).database
+
+    def test_compact_database_supports_every_method(self, subdivisions):
+        assert subdivisions.get(code="US-NY").name == "New York"
+        assert len(subdivisions.get(country_code="US")) == 57
+        assert subdivisions.lookup("FR-63").parent.code == "FR-ARA"
+        assert [result.record for result in subdivisions.search("New Brunswick", match_score_cutoff=75)] == [
+            Subdivision(name="New Brunswick", code="CA-NB", type="Province", country_code="CA", parent_code=None)
+        ]
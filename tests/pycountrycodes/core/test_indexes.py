@@ -0,0 +1,95 @@
+import pytest
+
+from pycountrycodes.core import indexes
+from pycountrycodes.core.models import ISOCodes
+from pycountrycodes.countries_3166_1.models import (
+    Countries,
+    Country,
+)
+from pycountrycodes.subdivisions_3166_2.models import Subdivisions
+
+
+class TestIndexes:
+    countries = Countries(ISOCodes.i3166_1)
+
+    def test_unique_index_keys_are_case_normalized(self):
+        index = indexes.build_unique_index(self.countries.database, "alpha_2")
+        assert index["gb"].name == "United Kingdom"
+        assert "GB" not in index
+
+    def test_unique_index_skips_empty_values(self):
+        index = indexes.build_unique_index(self.countries.database, "common_name")
+        assert len(index) == len([country for country in self.countries if country.common_name is not None])
+
+    def test_unique_index_keeps_the_first_object_for_repeated_values(self):
+        first = Country(name="A", alpha_2="AA", alpha_3="AAA", flag="", numeric="001")
+        second = Country(name="B", alpha_2="AA", alpha_3="BBB", flag="", numeric="002")
+        index = indexes.build_unique_index([first, second], "alpha_2")
+        assert index == {"aa": first}
+
+    def test_database_builds_an_index_for_every_field(self):
+        assert set(self.countries._indexes) == set(Country.__fields__)
+
+    def test_get_method_is_case_insensitive(self):
+        assert self.countries.get(alpha_3="gbr") is self.countries.get(alpha_3="GBR")
+        assert self.countries.get(numeric="826") is self.countries.get(alpha_2="gb")
+
+    def test_multi_value_index_keeps_all_objects_in_database_order(self):
+        first = Country(name="A", alpha_2="AA", alpha_3="AAA", flag="", numeric="001", common_name="Same ")
+        second = Country(name="B", alpha_2="BB", alpha_3="BBB", flag="", numeric="002", common_name="same")
+        third = Country(name="C", alpha_2="CC", alpha_3="CCC", flag="", numeric="003")
+        index = indexes.build_multi_value_index([first, second, third], "common_name")
+        assert index == {"same": (first, second)}
+
+
+class TestMultiValueIndexes:
+    subdivisions = Subdivisions(ISOCodes.i3166_2)
+
+    def test_database_only_builds_unique_indexes_for_single_result_fields(self):
+        assert set(self.subdivisions._multi_value_indexes) == {"name", "type", "country_code"}
+        assert set(self.subdivisions._indexes) == {"code", "parent_code"}
+
+    def test_get_method_returns_a_new_list_from_the_precomputed_index(self):
+        options = self.subdivisions.get(country_code="US")
+        assert options == [subdivision for subdivision in self.subdivisions if subdivision.country_code == "US"]
+        assert options is not self.subdivisions.get(country_code="US")
+        assert self.subdivisions._multi_value_indexes["country_code"]["us"] == tuple(options)
+
+
+class TestCodeTables:
+    @pytest.mark.parametrize(
+        "value, slot",
+        [
+            (76, 76),
+            ("076", 76),
+            (" 76 ", 76),
+            (b"076", 76),
+            (bytearray(b"840"), 840),
+            (memoryview(b"xx840")[2:], 840),
+            (1000, -1),
+            (-1, -1),
+            ("0760", -1),
+            ("", -1),
+            ("٧٦", -1),
+            (b"+76", -1),
+            (b"7 6", -1),
+            (memoryview(b"7a6"), -1),
+        ],
+    )
+    def test_numeric_slot(self, value, slot):
+        assert indexes.get_numeric_slot(value) == slot
+
+    def test_alpha_key_ignores_case_and_type(self):
+        key = indexes.get_alpha_key("BR")
+        assert indexes.get_alpha_key("br") == indexes.get_alpha_key(b"bR") == indexes.get_alpha_key(memoryview(b"BR"))
+        assert key == int.from_bytes(b"br", "big")
+
+    @pytest.mark.parametrize("value", ["B", "BRAZ", "B1", "Bé", b"\xc2R", b"@[", 76])
+    def test_alpha_key_of_invalid_codes(self, value):
+        assert indexes.get_alpha_key(value) not in indexes.build_alpha_code_table(TestIndexes.countries, "alpha_2")
+
+    def test_numeric_code_table_is_direct_address(self):
+        table = indexes.build_numeric_code_table(TestIndexes.countries, "numeric")
+        assert len(table) == indexes.NUMERIC_TABLE_SIZE
+        assert table[76].alpha_2 == "BR"
+        assert sum(country is not None for country in table) == len(TestIndexes.countries)
@@ -0,0 +1,40 @@
+import sys
+
+from pycountrycodes.core.memory import (
+    MemoryUsage,
+    get_deep_size,
+)
+
+
+class Node:
+    __slots__ = ("value", "next")
+
+    def __init__(self, value, next=None):
+        self.value = value
+        self.next = next
+
+
+class TestGetDeepSize:
+    def test_containers_and_their_items_are_counted(self):
+        value = ["a" * 100, {"key": (1.5,)}]
+        expected = sum(
+            sys.getsizeof(obj) for obj in [value, value[0], value[1], "key", value[1]["key"], value[1]["key"][0]]
+        )
+        assert get_deep_size([value], set()) == expected
+
+    def test_shared_objects_are_counted_once(self):
+        shared = "x" * 1000
+        seen = set()
+        assert get_deep_size([[shared]], seen) > 1000
+        assert get_deep_size([[shared]], seen) < 1000
+
+    def test_slots_are_followed_and_external_objects_skipped(self):
+        external = Node("external")
+        node = Node("y" * 1000, next=external)
+        assert get_deep_size([node], set(), is_external=lambda obj: obj is external) > 1000
+        assert get_deep_size([node], set(), is_external=lambda obj: obj is node) == 0
+
+
+class TestMemoryUsage:
+    def test_total(self):
+        assert MemoryUsage(records=1, indexes=2, search=3, caches=4).total == 10
@@ -0,0 +1,108 @@
+import pytest
+
+from pycountrycodes.core import metrics
+from pycountrycodes.core.metrics import (
+    Histogram,
+    MetricsRegistry,
+)
+from pycountrycodes.core.models import ISOCodes
+from pycountrycodes.countries_3166_1.models import Countries
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def countries(registry):
+    countries = Countries(ISOCodes.i3166_1)
+    countries.enable_metrics(registry)
+    return countries
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative_with_inclusive_bounds(self):
+        histogram = Histogram([1, 5])
+        for value in [0, 1, 3, 10]:
+            histogram.observe(value)
+
+        assert histogram.snapshot() == {"count": 4, "sum": 14, "buckets": {"1.0": 2, "5.0": 3, "+Inf": 4}}
+
+
+class TestInstrumentation:
+    def test_database_is_not_instrumented_by_default(self):
+        countries = Countries(ISOCodes.i3166_1)
+        assert countries.metrics_registry is None
+        assert "lookup" not in vars(countries)
+
+    def test_hits_and_misses_are_counted(self, countries, registry):
+        countries.get(alpha_2="BR")
+        countries.get(alpha_2="XX", default="missing")
+        countries.lookup("Narnia")
+        countries.lookup("Brazil")
+
+        snapshot = registry.snapshot()["countries"]
+        assert {key: snapshot["get"][key] for key in ["calls", "hits", "misses", "errors"]} == {
+            "calls": 2,
+            "hits": 1,
+            "misses": 1,
+            "errors": 0,
+        }
+        assert snapshot["lookup"]["hits"] == 1
+        assert snapshot["lookup"]["misses"] == 1
+        assert snapshot["get"]["latency_seconds"]["count"] == 2
+
+    def test_errors_are_counted_and_raised(self, countries, registry):
+        with pytest.raises(AttributeError):
+            countries.get(continent="Europe")
+
+        assert registry.snapshot()["countries"]["get"]["errors"] == 1
+
+    def test_search_result_sizes_are_recorded(self, countries, registry):
+        countries.search("United", limit=3)
+        countries.search("zzzzzzzz", match_score_cutoff=99)
+
+        search = registry.snapshot()["countries"]["search"]
+        assert (search["hits"], search["misses"]) == (1, 1)
+        assert search["result_size"]["sum"] == 3
+
+    def test_resolve_many_records_its_fuzzy_fallback(self, countries, registry):
+        countries.resolve_many(["Brazil", "Untied States", "BR", "Narnia"])
+
+        snapshot = registry.snapshot()["countries"]
+        assert (snapshot["lookup_many"]["hits"], snapshot["lookup_many"]["misses"]) == (2, 2)
+        assert snapshot["search_many"]["calls"] == 1
+        assert snapshot["search_many"]["result_size"]["sum"] == 2
+        assert (snapshot["resolve_many"]["hits"], snapshot["resolve_many"]["misses"]) == (3, 1)
+
+    def test_disable_metrics_removes_the_instrumentation(self, countries, registry):
+        countries.disable_metrics()
+        countries.lookup("Brazil")
+
+        assert countries.metrics_registry is None
+        assert registry.snapshot()["countries"]["lookup"]["calls"] == 0
+
+    def test_clear_resets_the_metrics(self, countries, registry):
+        countries.lookup("Brazil")
+        registry.clear()
+        countries.lookup("Brazil")
+
+        assert registry.snapshot()["countries"]["lookup"]["calls"] == 1
+
+    def test_metrics_enabled_uses_the_default_registry(self):
+        countries = Countries(ISOCodes.i3166_1, metrics_enabled=True)
+        assert countries.metrics_registry is metrics.registry
+        countries.disable_metrics()
+
+
+class TestPrometheus:
+    def test_metrics_are_exposed_in_text_format(self, countries, registry):
+        countries.lookup("Brazil")
+        text = registry.to_prometheus()
+
+        assert "# TYPE pycountrycodes_calls_total counter" in text
+        assert 'pycountrycodes_calls_total{database="countries",method="lookup"} 1' in text
+        assert 'pycountrycodes_call_duration_seconds_bucket{database="countries",method="lookup",le="+Inf"} 1' in text
+        assert 'pycountrycodes_result_size_count{database="countries",method="lookup"} 1' in text
+        assert text.endswith("\n")
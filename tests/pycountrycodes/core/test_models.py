@@ -1,3 +1,5 @@
+import pytest
+
 from pycountrycodes import (
     countries,
     subdivisions,
@@ -28,3 +30,64 @@ class TestDatabase:
     def test_len_method(self):
         assert len(countries) == 249
         assert len(subdivisions) == 5123
+
+    def test_memory_usage_counts_each_part_once(self):
+        usage = subdivisions.memory_usage()
+        assert usage.records > usage.indexes > 0
+        assert usage.total == usage.records + usage.indexes + usage.search + usage.caches
+        assert subdivisions.memory_usage() == usage
+
+    def test_memory_usage_does_not_count_referenced_records_of_other_databases(self):
+        usage = subdivisions.memory_usage()
+        for subdivision in subdivisions:
+            subdivision.country
+        assert subdivisions.memory_usage() == usage
+
+    def test_get_many_returns_the_same_objects_as_get(self):
+        values = ["BR", "us", " BR ", "XX", "BR"]
+        assert countries.get_many("alpha_2", values) == [countries.get(alpha_2=value) for value in values]
+
+    def test_get_many_returns_the_default_for_values_not_found(self):
+        assert countries.get_many("alpha_2", ["XX"], default="missing") == ["missing"]
+
+    def test_get_many_returns_new_lists_for_multiple_results_fields(self):
+        results = subdivisions.get_many("country_code", ["PT", "pt", "XX"])
+        assert results[0] == subdivisions.get(country_code="PT")
+        assert results[0] == results[1] and results[0] is not results[1]
+        assert results[2] is None
+
+    def test_get_many_validates_the_field_and_values(self):
+        with pytest.raises(AttributeError):
+            countries.get_many("capital", ["Brasília"])
+
+        with pytest.raises(TypeError):
+            countries.get_many("alpha_2", ["BR", 76])
+
+    def test_lookup_many_returns_the_same_objects_as_lookup(self):
+        values = iter(["Brazil", "usa", "GB", "Unknown", "brazil"])
+        expected = [countries.lookup(value) for value in ["Brazil", "usa", "GB", "Unknown", "brazil"]]
+        assert countries.lookup_many(values) == expected
+        assert subdivisions.lookup_many(["US-NY", "XX-00"], default=False) == [subdivisions.lookup("US-NY"), False]
+
+    @pytest.mark.parametrize("value", [76, "076", b"076", bytearray(b"076"), memoryview(b"076")])
+    def test_get_by_numeric(self, value):
+        assert countries.get_by_numeric(value) is countries.get(numeric="076")
+
+    def test_get_by_numeric_returns_the_default_for_codes_not_found(self):
+        assert countries.get_by_numeric(0, default="missing") == "missing"
+        assert countries.get_by_numeric(b"abc") is None
+        with pytest.raises(AttributeError):
+            subdivisions.get_by_numeric(76)
+
+    @pytest.mark.parametrize("value", ["BR", "bra", b"BR", b"bRa", memoryview(b"BRA")])
+    def test_get_by_alpha(self, value):
+        assert countries.get_by_alpha(value) is countries.get(alpha_2="BR")
+
+    def test_get_by_alpha_returns_the_default_for_codes_not_found(self):
+        from pycountrycodes import currencies
+
+        assert countries.get_by_alpha(b"XX", default="missing") == "missing"
+        assert currencies.get_by_alpha(b"US") is None
+        assert currencies.get_by_alpha(b"usd") is currencies.get(alpha_3="USD")
+        with pytest.raises(AttributeError):
+            subdivisions.get_by_alpha("US")
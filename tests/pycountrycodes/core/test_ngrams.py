@@ -0,0 +1,46 @@
+import pytest
+
+from pycountrycodes.core.models import ISOCodes
+from pycountrycodes.core.ngrams import (
+    NGramIndex,
+    get_ngrams,
+)
+from pycountrycodes.subdivisions_3166_2.models import Subdivisions
+
+
+@pytest.fixture(scope="module")
+def subdivisions():
+    return Subdivisions(ISOCodes.i3166_2)
+
+
+class TestNGrams:
+    def test_get_ngrams_pads_the_value(self):
+        assert get_ngrams("york") == {" yo", "yor", "ork", "rk "}
+        assert get_ngrams("ny") == {" ny", "ny "}
+
+    def test_index_maps_ngrams_to_sorted_positions(self):
+        index = NGramIndex([["york", None, "new york"], [None, "oxford", None]])
+        assert index.postings["yor"] == (0, 2)
+        assert index.postings["oxf"] == (1,)
+        assert index.get_candidates("york") == [0, 2]
+        assert index.get_candidates("new") == [2]
+        assert index.get_candidates("paris") == []
+
+    def test_short_queries_have_no_candidates(self):
+        index = NGramIndex([["york"]])
+        assert index.get_candidates("yo") is None
+
+
+class TestPrunedSearch:
+    def test_pruned_search_only_returns_candidates_with_the_same_scores(self, subdivisions):
+        results = subdivisions.search("Bavaria")
+        pruned_results = subdivisions.search("Bavaria", prune_candidates=True)
+        assert 0 < len(pruned_results) < len(results)
+        assert pruned_results[0] == results[0]
+        assert all(result in results for result in pruned_results)
+
+    def test_pruned_search_with_limit(self, subdivisions):
+        assert subdivisions.search("New York", prune_candidates=True, limit=1)[0].code == "US-NY"
+
+    def test_pruned_search_scores_every_object_for_short_queries(self, subdivisions):
+        assert subdivisions.search("ny", prune_candidates=True) == subdivisions.search("ny")
@@ -0,0 +1,161 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pycountrycodes.core.models import ISOCodes
+from pycountrycodes.core.search import (
+    SearchCorpus,
+    SearchResult,
+)
+from pycountrycodes.countries_3166_1.models import (
+    Countries,
+    Country,
+)
+from pycountrycodes.subdivisions_3166_2.models import Subdivisions
+
+
+@pytest.fixture(scope="module")
+def countries():
+    return Countries(ISOCodes.i3166_1)
+
+
+class TestSearchCorpus:
+    def test_corpus_holds_normalized_values_in_database_order(self):
+        array = [
+            Country(name=" Réunion ", alpha_2="RE", alpha_3="REU", flag="", numeric="638"),
+            Country(name="Brazil", alpha_2="BR", alpha_3="BRA", flag="", numeric="076", common_name="Brasil"),
+        ]
+        corpus = SearchCorpus(array, ["name", "common_name"])
+        assert corpus.lowered == {"name": ["réunion", "brazil"], "common_name": [None, "brasil"]}
+        assert corpus.folded == {"name": ["reunion", "brazil"], "common_name": [None, "brasil"]}
+
+    def test_database_builds_the_corpus_once(self, countries):
+        assert countries._search_corpus is None
+        countries.search("Brazil")
+        corpus = countries.search_corpus
+        countries.search("Germany")
+        assert countries.search_corpus is corpus
+        assert corpus.fields == Country.get_searchable_fields()
+
+
+def score_one_pair_at_a_time(corpus: SearchCorpus, query: str, score_cutoff: float):
+    from rapidfuzz import fuzz
+
+    scores = {}
+    for position in range(corpus.size):
+        total_score = 0
+        fields_used = 0
+        for field in corpus.fields:
+            if corpus.folded[field][position] is not None:
+                ratio_score = fuzz.ratio(query, corpus.folded[field][position])
+                partial_score = fuzz.partial_ratio(query, corpus.lowered[field][position])
+                total_score += (ratio_score + partial_score) / 2
+                fields_used += 1
+
+        match_score = total_score / fields_used if fields_used else 0
+        if match_score >= score_cutoff:
+            scores[position] = match_score
+
+    return scores
+
+
+class TestSearchCorpusScore:
+    @pytest.mark.parametrize("query", ["united", "kingdom of", "reunion", "x"])
+    @pytest.mark.parametrize("score_cutoff", [0, 50, 75, 100])
+    def test_batch_scores_are_the_same_as_scoring_one_pair_at_a_time(self, countries, query, score_cutoff):
+        corpus = countries.search_corpus
+        assert corpus.score(query, score_cutoff) == score_one_pair_at_a_time(corpus, query, score_cutoff)
+
+    @pytest.mark.parametrize("score_cutoff", [0, 50, 75])
+    def test_batch_scores_without_numpy(self, countries, mocker, score_cutoff):
+        mocker.patch("pycountrycodes.core.search._import_numpy", return_value=None)
+        corpus = countries.search_corpus
+        assert corpus.score("united", score_cutoff) == score_one_pair_at_a_time(corpus, "united", score_cutoff)
+
+    def test_batch_scores_using_multiple_workers(self, countries):
+        corpus = countries.search_corpus
+        assert corpus.score("united", 50, workers=-1) == score_one_pair_at_a_time(corpus, "united", 50)
+
+
+class TestSearchResult:
+    def test_search_returns_results_without_changing_the_database(self, countries):
+        results = countries.search("United", match_score_cutoff=75)
+        assert results == [SearchResult(countries.get(alpha_2="US"), results[0].match_score)]
+        assert results[0].match_score >= 75
+        assert not hasattr(countries.get(alpha_2="US"), "match_score")
+
+    def test_search_result_exposes_the_record_attributes(self, countries):
+        result = countries.search("Brazil", match_score_cutoff=80)[0]
+        assert result.record is countries.get(alpha_2="BR")
+        assert result.alpha_3 == "BRA"
+        with pytest.raises(AttributeError):
+            result.random_attribute
+
+    def test_search_result_includes_field_scores_when_asked(self, countries):
+        result = countries.search("Brazil", match_score_cutoff=80)[0]
+        assert result.field_scores is None
+
+        result = countries.search("Brazil", match_score_cutoff=80, with_field_scores=True)[0]
+        assert set(result.field_scores) == {"name", "official_name"}
+        assert sum(result.field_scores.values()) / 2 == result.match_score
+
+    def test_concurrent_searches_return_their_own_scores(self, countries):
+        queries = ["United", "Kingdom", "Brazil", "Germany"] * 25
+        expected = {query: countries.search(query) for query in set(queries)}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(countries.search, queries))
+
+        assert all(result == expected[query] for query, result in zip(queries, results))
+
+
+class TestSearchLimit:
+    @pytest.mark.parametrize("query", ["United", "Kingdom", "Reunion", "x"])
+    @pytest.mark.parametrize("limit", [0, 1, 3, 50])
+    def test_search_with_limit_returns_the_best_results(self, countries, query, limit):
+        assert countries.search(query, limit=limit) == countries.search(query)[:limit]
+
+    @pytest.mark.parametrize("limit", [1, 5, 300])
+    def test_search_with_limit_returns_the_best_results_across_chunks(self, limit):
+        subdivisions = Subdivisions(ISOCodes.i3166_2)
+        for query, match_score_cutoff in [("New Brunswick", 50), ("york", 0), ("Bavaria", 75)]:
+            results = subdivisions.search(query, match_score_cutoff=match_score_cutoff)
+            assert subdivisions.search(query, match_score_cutoff=match_score_cutoff, limit=limit) == results[:limit]
+
+    @pytest.mark.parametrize("limit, error", [(-1, ValueError), (1.5, TypeError), ("1", TypeError)])
+    def test_search_and_search_many_reject_invalid_limits(self, countries, limit, error):
+        with pytest.raises(error):
+            countries.search("United", limit=limit)
+        with pytest.raises(error):
+            countries.search_many(["United"], limit=limit)
+
+
+class TestSearchMany:
+    @pytest.mark.parametrize("match_score_cutoff", [0, 50, 75])
+    @pytest.mark.parametrize("limit", [None, 0, 1, 5])
+    def test_search_many_returns_the_same_results_as_search(self, countries, match_score_cutoff, limit):
+        queries = ["United", " brasil", "x", "", "Kingdom of", "Réunion"]
+        results = countries.search_many(queries, match_score_cutoff=match_score_cutoff, limit=limit)
+        assert results == [
+            countries.search(query, match_score_cutoff=match_score_cutoff, limit=limit) for query in queries
+        ]
+
+    def test_search_many_scores_the_queries_in_chunks(self, countries, monkeypatch):
+        monkeypatch.setattr("pycountrycodes.core.search.SCORE_MATRIX_CHUNK_SIZE", 2)
+        queries = ["United", "Brazil", "Germany", "Kingdom", "Reunion"]
+        assert countries.search_many(queries, limit=3) == [countries.search(query, limit=3) for query in queries]
+
+    def test_search_many_without_numpy(self, countries, mocker):
+        mocker.patch("pycountrycodes.core.search._import_numpy", return_value=None)
+        queries = ["United", "Brazil"]
+        assert countries.search_many(queries, limit=3) == [countries.search(query, limit=3) for query in queries]
+
+    def test_search_many_returns_new_lists_for_repeated_queries(self, countries):
+        results = countries.search_many(["Brazil", "BRAZIL ", "brazil"], workers=-1)
+        assert results[0] == results[1] == results[2]
+        assert results[0] is not results[1]
+
+    def test_search_many_for_large_databases(self):
+        subdivisions = Subdivisions(ISOCodes.i3166_2)
+        queries = ["New York", "Bavaria"]
+        results = subdivisions.search_many(queries, match_score_cutoff=60, limit=10)
+        assert results == [subdivisions.search(query, match_score_cutoff=60, limit=10) for query in queries]
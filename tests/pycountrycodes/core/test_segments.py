@@ -0,0 +1,93 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pycountrycodes.core import (
+    compact,
+    segments,
+)
+from pycountrycodes.core.models import ISOCodes
+from pycountrycodes.countries_3166_1.models import (
+    Countries,
+    Country,
+)
+from pycountrycodes.subdivisions_3166_2.models import Subdivisions
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYCOUNTRYCODES_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def subdivisions(cache_dir):
+    Subdivisions(ISOCodes.i3166_2, shared=True)
+    return Subdivisions(ISOCodes.i3166_2, shared=True)
+
+
+def get_country_name(alpha_2: str) -> str:
+    return Countries(ISOCodes.i3166_1, shared=True).get(alpha_2=alpha_2).name
+
+
+class TestSegments:
+    def test_first_shared_database_exports_the_segment_and_the_next_ones_attach(self, cache_dir):
+        countries = Countries(ISOCodes.i3166_1, shared=True)
+        assert isinstance(countries.database, list)
+        assert segments.get_segment_path(ISOCodes.i3166_1).exists()
+
+        attached = Countries(ISOCodes.i3166_1, shared=True)
+        assert isinstance(attached.database, segments.SharedRecords)
+        assert [country.dict() for country in attached] == [country.dict() for country in countries]
+
+    def test_open_segment_returns_none_for_invalid_segments(self, cache_dir):
+        fields = tuple(Country.__fields__)
+        assert segments.open_segment(ISOCodes.i3166_1, fields) is None
+
+        segments.export_segment(Countries(ISOCodes.i3166_1))
+        assert segments.open_segment(ISOCodes.i3166_1, fields[:-1]) is None
+
+        segments.get_segment_path(ISOCodes.i3166_1).write_bytes(b"not a segment")
+        assert segments.open_segment(ISOCodes.i3166_1, fields) is None
+
+    def test_lookups_return_the_same_records(self, subdivisions):
+        loaded = Subdivisions(ISOCodes.i3166_2)
+        for kwargs in [{"code": "us-ny"}, {"name": "Birmingham"}, {"country_code": "PT"}, {"code": "XX-00"}]:
+            result = subdivisions.get(**kwargs)
+            expected = loaded.get(**kwargs)
+            if isinstance(expected, list):
+                assert [record.dict() for record in result] == [record.dict() for record in expected]
+            else:
+                assert (result and result.dict()) == (expected and expected.dict())
+
+        assert subdivisions.lookup("US-NY").name == "New York"
+        assert subdivisions.search("New York", limit=1)[0].record.code == "US-NY"
+
+    def test_records_are_views_created_once(self, subdivisions):
+        subdivision = subdivisions.get(code="US-NY")
+        assert isinstance(subdivision, segments.RecordView)
+        assert subdivision is subdivisions.lookup("us-ny")
+        assert subdivision.parent_code is None
+        with pytest.raises(AttributeError):
+            subdivision.name = "York"
+
+    def test_views_are_pickled_as_compact_records(self, subdivisions):
+        subdivision = pickle.loads(pickle.dumps(subdivisions.get(code="US-NY")))
+        assert type(subdivision) is compact.get_compact_class(subdivisions.dataclass)
+        assert subdivision == subdivisions.get(code="US-NY")
+
+    def test_hierarchy_is_linked_on_first_use(self, subdivisions):
+        department = subdivisions.get(code="FR-63")
+        assert department.parent is subdivisions.get(code="FR-ARA")
+        assert department in department.parent.children
+        assert [subdivision.code for subdivision in department.ancestors()] == ["FR-ARA"]
+        assert [subdivision.code for subdivision in subdivisions.top_level("FR")][:2] == ["FR-20R", "FR-ARA"]
+
+    def test_memory_usage_only_counts_the_views_in_use(self, subdivisions):
+        assert subdivisions.memory_usage().records < Subdivisions(ISOCodes.i3166_2).memory_usage().records / 10
+
+    def test_processes_attach_to_the_same_segment(self, cache_dir):
+        segments.export_segment(Countries(ISOCodes.i3166_1))
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            assert list(executor.map(get_country_name, ["BR", "DE"])) == ["Brazil", "Germany"]
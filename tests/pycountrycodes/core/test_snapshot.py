@@ -0,0 +1,68 @@
+import pytest
+
+from pycountrycodes.core import snapshot
+from pycountrycodes.core.models import ISOCodes
+from pycountrycodes.currencies_4217.models import (
+    Currencies,
+    Currency,
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYCOUNTRYCODES_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture(scope="module")
+def currencies():
+    return Currencies(ISOCodes.i4217, use_snapshot=False)
+
+
+class TestSnapshot:
+    def test_snapshot_path_depends_on_the_dataset_hash(self, cache_dir):
+        path = snapshot.get_snapshot_path(ISOCodes.i4217)
+        assert path.parent == cache_dir
+        assert path.name.startswith("4217-")
+        assert path != snapshot.get_snapshot_path(ISOCodes.i3166_1)
+
+    def test_build_and_verify_snapshot(self, cache_dir, currencies):
+        assert snapshot.verify_snapshot(currencies) is False
+
+        path = snapshot.build_snapshot(currencies)
+        assert path.exists()
+        assert snapshot.verify_snapshot(currencies) is True
+
+    def test_snapshots_of_other_models_code_are_not_read(self, cache_dir, currencies, monkeypatch):
+        snapshot.build_snapshot(currencies)
+        monkeypatch.setattr(snapshot, "_models_hash", "parsed by another release")
+        assert snapshot.read_snapshot(ISOCodes.i4217, tuple(Currency.__fields__)) is None
+        assert snapshot.verify_snapshot(currencies) is False
+
+    def test_read_snapshot_returns_none_for_invalid_snapshots(self, cache_dir, currencies):
+        fields = tuple(Currency.__fields__)
+        assert snapshot.read_snapshot(ISOCodes.i4217, fields) is None
+
+        snapshot.build_snapshot(currencies)
+        assert snapshot.read_snapshot(ISOCodes.i4217, ("alpha_3",)) is None
+
+        snapshot.get_snapshot_path(ISOCodes.i4217).write_bytes(b"corrupted")
+        assert snapshot.read_snapshot(ISOCodes.i4217, fields) is None
+
+    def test_database_writes_and_loads_snapshot(self, cache_dir, currencies):
+        first = Currencies(ISOCodes.i4217)
+        assert snapshot.get_snapshot_path(ISOCodes.i4217).exists()
+
+        second = Currencies(ISOCodes.i4217)
+        assert second.database == first.database == currencies.database
+        assert second.get(alpha_3="USD") == Currency(alpha_3="USD", name="US Dollar", numeric="840")
+
+    def test_database_does_not_use_snapshot_when_disabled(self, cache_dir):
+        Currencies(ISOCodes.i4217, use_snapshot=False)
+        assert not snapshot.get_snapshot_path(ISOCodes.i4217).exists()
+
+    def test_database_loads_even_when_snapshot_cannot_be_written(self, tmp_path, monkeypatch):
+        read_only_file = tmp_path / "file"
+        read_only_file.write_text("")
+        monkeypatch.setenv("PYCOUNTRYCODES_CACHE_DIR", str(read_only_file / "cache"))
+        assert len(Currencies(ISOCodes.i4217)) == 181
@@ -76,7 +76,7 @@ class TestCountriesClass:
     def test_search_method_returns_the_right_list(self):
         results = self.countries.search("United")
         assert isinstance(results, list)
-        assert results == [
+        assert [result.record for result in results] == [
             models.Country(
                 name="United States",
                 alpha_2="US",
@@ -155,7 +155,7 @@ class TestCountriesClass:
         match_score_cutoff = 75
         results = self.countries.search("United", match_score_cutoff=match_score_cutoff)
         assert isinstance(results, list)
-        assert results == [
+        assert [result.record for result in results] == [
             models.Country(
                 name="United States",
                 alpha_2="US",
@@ -233,3 +233,20 @@ class TestCountriesClass:
     def test_lookup_method_should_return_none_for_not_found_country(self):
         result = self.countries.lookup("Brasil")
         assert result is None
+
+
+class TestCountryClass:
+    def test_country_subdivisions(self):
+        from pycountrycodes import (
+            countries,
+            subdivisions,
+        )
+
+        country = countries.get(alpha_2="FR")
+        assert country.subdivisions == subdivisions.get(country_code="FR")
+        assert all(subdivision.country is country for subdivision in country.subdivisions)
+        assert country.subdivisions is not country.subdivisions
+
+    def test_country_without_subdivisions(self):
+        country = Country(name="Nowhere", alpha_2="XX", alpha_3="XXX", flag="", numeric="000")
+        assert country.subdivisions == []
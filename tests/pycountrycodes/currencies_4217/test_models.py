@@ -44,7 +44,7 @@ class TestCurrenciesClass:
     def test_search_method_returns_the_right_list_for_default_match_score(self, currencies):
         results = currencies.search("Real")
         assert isinstance(results, list)
-        assert results == [
+        assert [result.record for result in results] == [
             models.Currency(alpha_3="KHR", name="Riel", numeric="116"),
             models.Currency(alpha_3="BRL", name="Brazilian Real", numeric="986"),
             models.Currency(alpha_3="COU", name="Unidad de Valor Real", numeric="970"),
@@ -73,7 +73,7 @@ class TestCurrenciesClass:
         match_score_cutoff = 75
         results = currencies.search("Real", match_score_cutoff=match_score_cutoff)
         assert isinstance(results, list)
-        assert results == [models.Currency(alpha_3="KHR", name="Riel", numeric="116")]
+        assert [result.record for result in results] == [models.Currency(alpha_3="KHR", name="Riel", numeric="116")]
         assert results[0].match_score >= match_score_cutoff
 
     def test_search_method_raises_when_no_searchable_fields(self, currencies, mocker: pytest_mock.MockerFixture):
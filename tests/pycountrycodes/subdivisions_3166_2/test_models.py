@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 import pytest_mock
 
@@ -56,7 +58,7 @@ class TestSubdivisionsClass:
     def test_search_method_returns_the_right_list_for_default_match_score(self, subdivisions):
         results = subdivisions.search("New Brunswick")
         assert isinstance(results, list)
-        assert results == [
+        assert [result.record for result in results] == [
             models.Subdivision(
                 name="New Brunswick", code="CA-NB", type="Province", country_code="CA", parent_code=None
             ),
@@ -115,7 +117,7 @@ class TestSubdivisionsClass:
         match_score_cutoff = 75
         results = subdivisions.search("New Brunswick", match_score_cutoff=match_score_cutoff)
         assert isinstance(results, list)
-        assert results == [
+        assert [result.record for result in results] == [
             models.Subdivision(name="New Brunswick", code="CA-NB", type="Province", country_code="CA", parent_code=None)
         ]
         assert results[0].match_score >= match_score_cutoff
@@ -141,12 +143,28 @@ class TestSubdivisionsClass:
         result = subdivisions.lookup("US-ZZ")
         assert result is None
 
+    @pytest.mark.parametrize("use_snapshot", [False, True])
+    def test_repeated_field_values_are_shared(self, use_snapshot):
+        subdivisions = models.Subdivisions(ISOCodes.i3166_2, use_snapshot=use_snapshot)
+        assert len({id(subdivision.country_code) for subdivision in subdivisions}) == 200
+        assert len({id(subdivision.type) for subdivision in subdivisions}) == len(
+            {subdivision.type for subdivision in subdivisions}
+        )
+
 
 class TestSubdivisionClass:
     def test_if_model_can_get_country(self, subdivisions):
         subdivision = subdivisions.get(code="GB-BIR")
         assert isinstance(subdivision.country, countries_models.Country)
 
+    def test_country_is_looked_up_only_once(self, subdivisions, mocker: pytest_mock.MockerFixture):
+        from pycountrycodes import countries
+
+        subdivision = subdivisions.get(code="GB-LND")
+        get = mocker.spy(countries, "get")
+        assert subdivision.country is subdivision.country is countries.get(alpha_2="GB")
+        assert get.call_count == 2
+
     def test_if_model_can_get_parent(self, subdivisions):
         subdivision = subdivisions.get(code="FR-63")
         assert isinstance(subdivision.parent, models.Subdivision)
@@ -154,3 +172,66 @@ class TestSubdivisionClass:
             name="Auvergne-Rhône-Alpes", code="FR-ARA", type="Metropolitan region", country_code="FR", parent_code=None
         )
         assert subdivision.parent.parent is None
+
+    def test_parent_is_linked_when_the_database_is_loaded(self, subdivisions):
+        subdivision = subdivisions.get(code="FR-63")
+        assert subdivision.parent is subdivisions.get(code="FR-ARA")
+
+    def test_children(self, subdivisions):
+        region = subdivisions.get(code="FR-ARA")
+        assert [child.code for child in region.children] == [
+            subdivision.code for subdivision in subdivisions if subdivision.parent_code == "FR-ARA"
+        ]
+        assert all(child.parent is region for child in region.children)
+        assert subdivisions.get(code="FR-63").children == []
+
+    def test_ancestors_and_descendants(self, subdivisions):
+        department = subdivisions.get(code="FR-63")
+        assert department.ancestors() == [subdivisions.get(code="FR-ARA")]
+        assert department.parent.ancestors() == []
+        assert department.parent.descendants() == department.parent.children
+        assert department.descendants() == []
+
+    def test_hierarchy_of_subdivisions_not_loaded_by_a_database(self, subdivisions):
+        subdivision = models.Subdivision(
+            name="Puy-de-Dôme", code="FR-63", type="Metropolitan department", country_code="FR", parent_code="FR-ARA"
+        )
+        assert subdivision.parent.code == "FR-ARA"
+        assert subdivision.children == []
+
+    def test_hierarchy_of_subdivisions_not_in_the_database(self, subdivisions):
+        subdivision = models.Subdivision(
+            name="Unknown", code="XX-99", type="Region", country_code="FR", parent_code="FR-ARA"
+        )
+        assert subdivision.parent.code == "FR-ARA"
+        assert subdivision.children == []
+        assert subdivision.ancestors() == [subdivisions.get(code="FR-ARA")]
+        assert subdivision.descendants() == []
+        orphan = models.Subdivision(name="Unknown", code="XX-98", type="Region", country_code="XX", parent_code="XX-1")
+        assert orphan.parent is None
+        assert orphan.ancestors() == []
+        top_level = models.Subdivision(name="Unknown", code="XX-97", type="Region", country_code="XX", parent_code=None)
+        assert top_level.parent is None
+
+    def test_pickled_subdivisions_do_not_carry_the_hierarchy(self, subdivisions):
+        region = subdivisions.get(code="FR-ARA")
+        assert len(pickle.dumps(region)) < 400
+        assert pickle.loads(pickle.dumps(region)).children == region.children
+
+
+class TestSubdivisionsHierarchy:
+    def test_top_level(self, subdivisions):
+        top_level = subdivisions.top_level("fr")
+        assert top_level == [
+            subdivision
+            for subdivision in subdivisions
+            if subdivision.country_code == "FR" and subdivision.parent_code is None
+        ]
+        assert subdivisions.top_level("XX") == []
+
+    def test_hierarchy_of_compact_databases(self):
+        compact_subdivisions = models.Subdivisions(ISOCodes.i3166_2, compact=True)
+        region = compact_subdivisions.get(code="FR-ARA")
+        assert all(child.parent is region for child in region.children)
+        unpickled_region = pickle.loads(pickle.dumps(region))
+        assert [child.code for child in unpickled_region.children] == [child.code for child in region.children]
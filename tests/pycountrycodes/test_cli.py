@@ -0,0 +1,109 @@
+import argparse
+import csv
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from pycountrycodes.cli import (
+    ColumnSpec,
+    main,
+    parse_column_spec,
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text(
+        "id,country,state\n1,Brazil,US-NY\n2,Untied States,\n3,Narnia,Bayern\n4,GBR,br-sp\n", encoding="utf_8"
+    )
+    return path
+
+
+def read_csv(text: str):
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+class TestParseColumnSpec:
+    def test_uses_the_default_field_of_each_kind(self):
+        assert parse_column_spec("country:countries") == ColumnSpec(
+            "country", "countries", "alpha_2", "country_alpha_2"
+        )
+        assert parse_column_spec("money:currencies:name") == ColumnSpec("money", "currencies", "name", "money_name")
+
+    @pytest.mark.parametrize(
+        "value, message",
+        [
+            ("country", "invalid column"),
+            (":countries", "invalid column"),
+            ("country:planets", "invalid column"),
+            ("country:countries:capital", 'invalid field "capital" for countries'),
+        ],
+    )
+    def test_rejects_invalid_specs(self, value, message):
+        with pytest.raises(argparse.ArgumentTypeError, match=message):
+            parse_column_spec(value)
+
+
+class TestNormalizeCommand:
+    def test_adds_the_resolved_columns_to_csv_rows(self, csv_file, capsys):
+        assert main(["normalize", str(csv_file), "-c", "country:countries", "-c", "state:subdivisions:name"]) == 0
+        rows = read_csv(capsys.readouterr().out)
+        assert [(row["country_alpha_2"], row["state_name"]) for row in rows] == [
+            ("BR", "New York"),
+            ("US", ""),
+            ("", "Bayern"),
+            ("GB", "São Paulo"),
+        ]
+        assert rows[0]["id"] == "1"
+
+    def test_only_uses_lookup_without_fuzzy(self, csv_file, capsys):
+        main(["normalize", str(csv_file), "-c", "country:countries", "--no-fuzzy", "--chunk-size", "1"])
+        assert [row["country_alpha_2"] for row in read_csv(capsys.readouterr().out)] == ["BR", "", "", "GB"]
+
+    def test_resolves_chunks_in_multiple_processes(self, csv_file, tmp_path):
+        output = tmp_path / "output.csv"
+        main(["normalize", str(csv_file), "-c", "country:countries", "-p", "2", "--chunk-size", "1", "-o", str(output)])
+        assert [row["country_alpha_2"] for row in read_csv(output.read_text(encoding="utf_8"))] == [
+            "BR",
+            "US",
+            "",
+            "GB",
+        ]
+
+    def test_reads_jsonl_from_stdin(self, monkeypatch, capsys):
+        monkeypatch.setattr("sys.stdin", io.StringIO('{"currency": "usd"}\n\n{"currency": null, "n": 1}\n'))
+        main(["normalize", "-f", "jsonl", "-c", "currency:currencies:name"])
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert rows == [
+            {"currency": "usd", "currency_name": "US Dollar"},
+            {"currency": None, "n": 1, "currency_name": None},
+        ]
+
+    @pytest.mark.parametrize(
+        "line, message",
+        [('{"currency": "usd"', "line 3: invalid JSON"), ('["usd"]', "line 3: expected a JSON object, got list")],
+    )
+    def test_fails_with_the_line_number_of_an_invalid_jsonl_line(self, line, message, monkeypatch, capsys):
+        monkeypatch.setattr("sys.stdin", io.StringIO(f'{{"currency": "usd"}}\n\n{line}\n'))
+        assert main(["normalize", "-f", "jsonl", "-c", "currency:currencies"]) == 1
+        assert f"pycountrycodes normalize: error: {message}" in capsys.readouterr().err
+
+    def test_fails_when_a_column_is_not_in_the_input(self, csv_file, capsys):
+        with pytest.raises(SystemExit) as error:
+            main(["normalize", str(csv_file), "-c", "nation:countries"])
+
+        assert error.value.code == 2
+        assert "columns not found in the input: nation" in capsys.readouterr().err
+
+    def test_runs_as_a_module(self, csv_file):
+        output = subprocess.run(
+            [sys.executable, "-m", "pycountrycodes", "normalize", str(csv_file), "-c", "country:countries:alpha_3"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        assert [row["country_alpha_3"] for row in read_csv(output)] == ["BRA", "USA", "", "GBR"]
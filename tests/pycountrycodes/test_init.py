@@ -0,0 +1,69 @@
+import subprocess
+import sys
+
+import pytest
+
+import pycountrycodes
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.strip()
+
+
+class TestLazyDatabases:
+    def test_importing_the_package_does_not_load_any_database(self):
+        output = run_python(
+            "import sys, pycountrycodes; "
+            "print(sorted(set(vars(pycountrycodes)) & {'countries', 'subdivisions', 'currencies'})); "
+            "print('rapidfuzz' in sys.modules)"
+        )
+        assert output.splitlines() == ["[]", "False"]
+
+    def test_only_the_accessed_database_is_loaded(self):
+        output = run_python(
+            "import pycountrycodes; "
+            "from pycountrycodes import currencies; "
+            "print(len(currencies), sorted(set(vars(pycountrycodes)) & {'countries', 'subdivisions', 'currencies'}))"
+        )
+        assert output == "181 ['currencies']"
+
+    def test_country_and_subdivision_references_load_the_other_database_on_first_access(self):
+        output = run_python(
+            "import pycountrycodes; "
+            "loaded = lambda: sorted(set(vars(pycountrycodes)) & {'countries', 'subdivisions'}); "
+            "subdivision = pycountrycodes.subdivisions.get(code='FR-63'); print(loaded()); "
+            "country = subdivision.country; print(loaded()); "
+            "print(subdivision in country.subdivisions)"
+        )
+        assert output.splitlines() == ["['subdivisions']", "['countries', 'subdivisions']", "True"]
+
+    def test_databases_are_loaded_only_once_across_threads(self):
+        output = run_python(
+            "import threading, pycountrycodes; "
+            "results = []; "
+            "threads = [threading.Thread(target=lambda: results.append(pycountrycodes.countries)) for _ in range(8)]; "
+            "[thread.start() for thread in threads]; [thread.join() for thread in threads]; "
+            "print(len({id(result) for result in results}))"
+        )
+        assert output == "1"
+
+    def test_databases_are_instances_of_their_classes(self):
+        assert isinstance(pycountrycodes.countries, pycountrycodes.Countries)
+        assert isinstance(pycountrycodes.subdivisions, pycountrycodes.Subdivisions)
+        assert isinstance(pycountrycodes.currencies, pycountrycodes.Currencies)
+        assert {"countries", "subdivisions", "currencies"} <= set(dir(pycountrycodes))
+
+    def test_unknown_attributes_raise_attribute_error(self):
+        with pytest.raises(AttributeError):
+            pycountrycodes.languages
+
+
+class TestFreeze:
+    def test_freeze_warms_the_databases_and_freezes_the_garbage_collector(self):
+        output = run_python(
+            "import gc, pycountrycodes; "
+            "pycountrycodes.freeze(); "
+            "print(gc.get_freeze_count() > 0, pycountrycodes.countries._search_corpus is not None, "
+            "pycountrycodes.subdivisions.get(code='US-NY')._country is not None)"
+        )
+        assert output == "True True True"
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import pickle
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from pycountrycodes import (
+    countries,
+    subdivisions,
+)
+from pycountrycodes.server import (
+    HTTPError,
+    LatencyRecorder,
+    LookupServer,
+)
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    loop = asyncio.new_event_loop()
+    lookup_server = LookupServer(workers=2)
+    server = loop.run_until_complete(lookup_server.start("127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    server.close()
+    lookup_server.close()
+
+
+def request(url: str, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data)) as response:
+            return response.status, json.loads(response.read()), response.headers
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read()), error.headers
+
+
+class TestLookupServer:
+    def test_get(self, base_url):
+        status, payload, headers = request(f"{base_url}/countries/get?alpha_2=BR")
+        assert status == 200
+        assert payload == countries.get(alpha_2="BR").dict()
+        assert headers["Server-Timing"].startswith("app;dur=")
+
+    def test_get_returns_lists_for_multiple_results_fields(self, base_url):
+        status, payload, _ = request(f"{base_url}/subdivisions/get?country_code=PT")
+        assert payload == [subdivision.dict() for subdivision in subdivisions.get(country_code="PT")]
+
+    def test_lookup(self, base_url):
+        assert request(f"{base_url}/countries/lookup?value=Brazil")[1]["alpha_2"] == "BR"
+        assert request(f"{base_url}/countries/lookup?value=Narnia")[1] is None
+
+    def test_search(self, base_url):
+        status, payload, _ = request(f"{base_url}/countries/search?query=United%20Kingdom&limit=2")
+        expected = countries.search("United Kingdom", limit=2)
+        assert payload == [{"record": result.record.dict(), "match_score": result.match_score} for result in expected]
+
+    def test_batch(self, base_url):
+        url = f"{base_url}/countries/batch"
+        status, payload, _ = request(url, {"operation": "lookup", "values": ["Brazil", "DEU", "Narnia"]})
+        assert [result and result["alpha_2"] for result in payload["results"]] == ["BR", "DE", None]
+
+        status, payload, _ = request(url, {"operation": "get", "field": "alpha_2", "values": ["BR"]})
+        assert payload["results"] == [countries.get(alpha_2="BR").dict()]
+
+        status, payload, _ = request(url, {"operation": "search", "values": ["Brasil", "Germany"], "limit": 1})
+        assert [results[0]["record"]["alpha_2"] for results in payload["results"]] == ["BR", "DE"]
+
+    @pytest.mark.parametrize(
+        "path, body, expected_status",
+        [
+            ("/planets/get?name=Mars", None, 404),
+            ("/countries/get?capital=Brasilia", None, 400),
+            ("/countries/get", None, 400),
+            ("/countries/get?alpha_2=BR&default=Narnia", None, 400),
+            ("/countries/get?alpha_2=BR&alpha_3=BRA", None, 400),
+            ("/countries/lookup", None, 400),
+            ("/countries/search?query=Brazil&limit=many", None, 400),
+            ("/countries/search?query=Brazil&limit=-1", None, 400),
+            ("/countries/lookup?value=Brazil", {}, 405),
+            ("/countries/batch", {"operation": "delete", "values": []}, 400),
+            ("/countries/batch", {"operation": "lookup"}, 400),
+            ("/countries/batch", {"operation": "lookup", "values": ["Brazil", None]}, 400),
+            ("/countries/batch", {"operation": "get", "field": "capital", "values": ["BR"]}, 400),
+            ("/countries/batch", {"operation": "get", "field": ["alpha_2"], "values": ["BR"]}, 400),
+        ],
+    )
+    def test_errors(self, base_url, path, body, expected_status):
+        status, payload, _ = request(f"{base_url}{path}", body)
+        assert status == expected_status
+        assert "error" in payload
+
+    def test_unexpected_errors_return_500(self, base_url, monkeypatch):
+        def lookup(value):
+            raise RuntimeError("broken")
+
+        def search(query, **options):
+            raise TypeError("a bug in search()")
+
+        monkeypatch.setattr(countries, "lookup", lookup)
+        monkeypatch.setattr(countries, "search", search)
+        status, payload, _ = request(f"{base_url}/countries/lookup?value=Brazil")
+        assert status == 500
+        assert payload == {"error": "internal server error"}
+        assert request(f"{base_url}/countries/search?query=Brazil")[0] == 500
+        monkeypatch.undo()
+        assert request(f"{base_url}/countries/lookup?value=Brazil")[1]["alpha_2"] == "BR"
+
+    def test_batches_do_not_block_other_requests(self, base_url, monkeypatch):
+        started, released, finished = threading.Event(), threading.Event(), threading.Event()
+        lookup_many = countries.lookup_many
+
+        def blocking_lookup_many(values):
+            started.set()
+            released.wait(5)
+            finished.set()
+            return lookup_many(values)
+
+        monkeypatch.setattr(countries, "lookup_many", blocking_lookup_many)
+        batch = threading.Thread(
+            target=request, args=(f"{base_url}/countries/batch", {"operation": "lookup", "values": ["Brazil"]})
+        )
+        batch.start()
+        try:
+            assert started.wait(5)
+            assert request(f"{base_url}/countries/lookup?value=Brazil")[1]["alpha_2"] == "BR"
+            assert not finished.is_set()
+        finally:
+            released.set()
+            batch.join()
+
+    def test_stats(self, base_url):
+        request(f"{base_url}/countries/lookup?value=Brazil")
+        status, payload, _ = request(f"{base_url}/stats")
+        assert payload["countries/lookup"]["count"] >= 1
+        assert set(payload["countries/lookup"]) == {"count", "mean_ms", "p50_ms", "p99_ms", "max_ms"}
+
+
+class TestHTTPError:
+    def test_http_errors_can_be_pickled(self):
+        error = pickle.loads(pickle.dumps(HTTPError(404, "unknown endpoint /planets")))
+        assert (error.status, str(error)) == (404, "unknown endpoint /planets")
+
+
+class TestLatencyRecorder:
+    def test_snapshot_keeps_the_most_recent_latencies(self):
+        recorder = LatencyRecorder(window_size=100)
+        for milliseconds in range(1, 201):
+            recorder.record("lookup", milliseconds / 1000)
+
+        stats = recorder.snapshot()["lookup"]
+        assert stats["count"] == 200
+        assert stats["p50_ms"] == pytest.approx(150)
+        assert stats["p99_ms"] == pytest.approx(199)
+        assert stats["max_ms"] == pytest.approx(200)
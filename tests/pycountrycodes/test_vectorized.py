@@ -0,0 +1,73 @@
+import pytest
+
+from pycountrycodes import (
+    countries,
+    currencies,
+    subdivisions,
+)
+from pycountrycodes.vectorized import (
+    normalize_countries,
+    normalize_currencies,
+    normalize_subdivisions,
+)
+
+numpy = pytest.importorskip("numpy")
+
+
+class TestNormalizeCountries:
+    def test_returns_a_numpy_array_with_none_for_misses(self):
+        values = numpy.array(["Brazil", "usa", None, "Narnia", float("nan"), "Brazil"], dtype=object)
+        normalized = normalize_countries(values)
+        assert isinstance(normalized, numpy.ndarray)
+        assert normalized.tolist() == ["BR", "US", None, None, None, "BR"]
+
+    def test_uses_search_as_fallback_only_when_fuzzy(self):
+        assert normalize_countries(["Untied States"]).tolist() == ["US"]
+        assert normalize_countries(["Untied States"], fuzzy=False).tolist() == [None]
+        assert normalize_countries(["Untied States"], match_score_cutoff=90).tolist() == [None]
+
+    def test_resolves_each_distinct_value_once(self, mocker):
+        lookup_many = mocker.spy(countries, "lookup_many")
+        search_many = mocker.spy(countries, "search_many")
+        normalize_countries(["Brazil", "Untied States"] * 100, to="alpha_3")
+        lookup_many.assert_called_once_with(["Brazil", "Untied States"])
+        assert search_many.call_args[0] == (["Untied States"],)
+
+    def test_returns_a_series_with_the_same_index_and_name(self):
+        pandas = pytest.importorskip("pandas")
+        values = pandas.Series(["Brazil", None, "Germany"], index=[10, 20, 30], name="country")
+        normalized = normalize_countries(values, to="name")
+        assert isinstance(normalized, pandas.Series)
+        assert normalized.to_dict() == {10: "Brazil", 20: None, 30: "Germany"}
+        assert normalized.name == "country"
+
+    def test_factorizes_string_arrays_and_series_with_other_values(self):
+        pandas = pytest.importorskip("pandas")
+        assert normalize_countries(numpy.array(["Brazil", "usa", "Brazil"])).tolist() == ["BR", "US", "BR"]
+        values = pandas.Series(["usa", 76, None, float("nan"), b"BR", "usa", "Brazil"])
+        assert normalize_countries(values).tolist() == ["US", None, None, None, None, "US", "BR"]
+        values = pandas.Series(["usa", None, "Brazil"], dtype="string")
+        assert normalize_countries(values).tolist() == ["US", None, "BR"]
+        assert normalize_countries([]).tolist() == []
+
+    def test_factorizes_without_pandas(self, mocker):
+        mocker.patch("pycountrycodes.vectorized._import_pandas", return_value=None)
+        values = numpy.array(["usa", None, float("nan"), b"BR", "usa", "Brazil"], dtype=object)
+        assert normalize_countries(values).tolist() == ["US", None, None, None, "US", "BR"]
+        assert normalize_countries(numpy.array(["Brazil", "usa", "Brazil"])).tolist() == ["BR", "US", "BR"]
+        assert normalize_countries([]).tolist() == []
+
+    def test_raises_for_unknown_fields(self):
+        with pytest.raises(AttributeError):
+            normalize_countries(["Brazil"], to="capital")
+
+
+class TestNormalizeSubdivisionsAndCurrencies:
+    def test_normalize_subdivisions(self):
+        assert normalize_subdivisions(["us-ny", "XX-00"], to="name").tolist() == [
+            subdivisions.get(code="US-NY").name,
+            None,
+        ]
+
+    def test_normalize_currencies(self):
+        assert normalize_currencies(["usd", "Euro"]).tolist() == ["USD", currencies.search("Euro")[0].alpha_3]